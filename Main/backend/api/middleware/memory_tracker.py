@@ -1,17 +1,25 @@
 """Memory tracking middleware for identifying resource leaks."""
 
 import logging
+import os
+import sys
+import threading
 import time
 from django.http import HttpRequest, HttpResponse
-from typing import Callable
+from typing import Callable, Optional
 
 from api.utils.request_context import generate_request_id, set_request_id, clear_request_context
-from api.utils.resource_monitor import ResourceSnapshot, get_mcp_connection_count
+from api.utils.resource_monitor import ResourceSnapshot, get_mcp_connection_count, rss_mb
 from api.utils.leak_detector import get_worker_detector
 
 logger = logging.getLogger(__name__)
 
 MEMORY_SPIKE_THRESHOLD_MB = 10.0
+HIGH_MEMORY_THRESHOLD_MB = 5.0
+
+# Change in sys.getallocatedblocks() over one request that makes it take a
+# ResourceSnapshot even though its RSS stayed below HIGH_MEMORY_THRESHOLD_MB.
+ALLOCATED_BLOCKS_THRESHOLD = 50_000
 
 
 class MemoryTrackerMiddleware:
@@ -22,13 +30,31 @@ class MemoryTrackerMiddleware:
     - Request ID for correlation
     - Worker PID
     - Memory usage before/after request
-    - Resource deltas (file descriptors, asyncio tasks, browser processes)
+    - Resource deltas (file descriptors, asyncio tasks, browser processes,
+      USS) since the previous snapshot
     - Warnings for per-request spikes (SPIKE_DETECTED)
     - Warnings for sustained leak trends (LEAK_TREND_DETECTED) via LeakDetector
+
+    Every request compares RSS before and after itself, which is one
+    /proc/self/statm read each way, so spikes from numpy or C-extension
+    buffers are caught however few Python blocks they take. A full
+    ResourceSnapshot costs psutil calls and a pgrep subprocess, so it is only
+    taken when RSS grew past HIGH_MEMORY_THRESHOLD_MB or the request's
+    allocated block count moved by more than ALLOCATED_BLOCKS_THRESHOLD.
     """
 
     def __init__(self, get_response: Callable):
         self.get_response = get_response
+        self._last_snapshot: Optional[ResourceSnapshot] = None
+        self._lock = threading.Lock()
+
+    def _snapshot(self) -> tuple[ResourceSnapshot, ResourceSnapshot]:
+        """Take a snapshot, returning (previous, current)."""
+        after = ResourceSnapshot()
+        with self._lock:
+            before = self._last_snapshot or after
+            self._last_snapshot = after
+        return before, after
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
         # Generate and store request ID
@@ -36,32 +62,61 @@ class MemoryTrackerMiddleware:
         set_request_id(request_id)
         request.request_id = request_id
 
-        # Snapshot resources before request
-        before = ResourceSnapshot()
+        # Cheap readings before request
+        blocks_before = sys.getallocatedblocks()
+        memory_before = rss_mb()
         start_time = time.time()
 
         try:
             response = self.get_response(request)
             return response
         finally:
-            # Snapshot resources after request
-            after = ResourceSnapshot()
             duration_ms = (time.time() - start_time) * 1000
-            delta = after.delta(before)
+            self._log_request(request, request_id, duration_ms, blocks_before, memory_before)
+
+            # Clear request context
+            clear_request_context()
+
+    def _log_request(
+        self,
+        request: HttpRequest,
+        request_id: str,
+        duration_ms: float,
+        blocks_before: int,
+        memory_before: float,
+    ) -> None:
+        """Log the request, with a resource snapshot if it grew or allocated heavily."""
+        method = request.method
+        path = request.path
+        pid = os.getpid()
+
+        blocks_delta = sys.getallocatedblocks() - blocks_before
+        memory_after = rss_mb()
+        memory_delta_mb = round(memory_after - memory_before, 2)
+
+        if (memory_delta_mb <= HIGH_MEMORY_THRESHOLD_MB
+                and abs(blocks_delta) <= ALLOCATED_BLOCKS_THRESHOLD):
+            logger.debug(
+                f"[{request_id}] [pid-{pid}] {method} {path} | "
+                f"duration={duration_ms:.0f}ms | delta={memory_delta_mb:+.1f}MB | "
+                f"blocks_delta={blocks_delta:+d}"
+            )
+        else:
+            previous, after = self._snapshot()
+            delta = after.delta(previous)
 
             # Get additional context
             mcp_conns = get_mcp_connection_count()
-            method = request.method
-            path = request.path
 
             # Build log message
             log_parts = [
                 f"[{request_id}]",
-                f"[pid-{before.pid}]",
+                f"[pid-{pid}]",
                 f"{method} {path}",
                 f"duration={duration_ms:.0f}ms",
-                f"memory={before.memory_mb:.0f}MB->{after.memory_mb:.0f}MB",
-                f"delta={delta['memory_delta_mb']:+.1f}MB",
+                f"memory={memory_before:.0f}MB->{memory_after:.0f}MB",
+                f"delta={memory_delta_mb:+.1f}MB",
+                f"blocks_delta={blocks_delta:+d}",
             ]
 
             # Add USS delta if significant
@@ -87,27 +142,24 @@ class MemoryTrackerMiddleware:
             log_message = " | ".join(log_parts)
 
             # Log with appropriate level
-            if delta['memory_delta_mb'] > MEMORY_SPIKE_THRESHOLD_MB:
+            if memory_delta_mb > MEMORY_SPIKE_THRESHOLD_MB:
                 logger.warning(f"{log_message} | SPIKE_DETECTED")
-            elif delta['memory_delta_mb'] > 5.0:
+            elif memory_delta_mb > HIGH_MEMORY_THRESHOLD_MB:
                 logger.info(f"{log_message} | HIGH_MEMORY_USAGE")
             else:
                 logger.debug(log_message)
 
-            # Note: LeakDetector is fed by gunicorn post_request hook
-            # (more reliable — fires even on middleware errors).
-            # Middleware only reads detector state for logging.
-            try:
-                detector = get_worker_detector()
-                state = detector.get_state()
-                if state['slope'] is not None and state['slope'] > detector.slope_threshold:
-                    logger.warning(
-                        f"[{request_id}] [pid-{before.pid}] "
-                        f"LEAK_TREND: slope={state['slope']:.4f} MB/req "
-                        f"over {state['window_size']} requests"
-                    )
-            except Exception:
-                pass
-
-            # Clear request context
-            clear_request_context()
+        # Note: LeakDetector is fed by gunicorn post_request hook
+        # (more reliable — fires even on middleware errors).
+        # Middleware only reads detector state for logging.
+        try:
+            detector = get_worker_detector()
+            state = detector.get_state()
+            if state['slope'] is not None and state['slope'] > detector.slope_threshold:
+                logger.warning(
+                    f"[{request_id}] [pid-{pid}] "
+                    f"LEAK_TREND: slope={state['slope']:.4f} MB/req "
+                    f"over {state['window_size']} requests"
+                )
+        except Exception:
+            pass
@@ -4,9 +4,10 @@ import os
 import signal
 import logging
 import time
-from collections import deque
 from typing import Optional, Dict, Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # Module-level singleton
@@ -34,12 +35,24 @@ class LeakDetector:
         self.slope_threshold = slope_threshold
         self.soft_limit_mb = soft_limit_mb
 
-        self._samples: deque = deque(maxlen=window_size)
+        # Fixed ring buffer of RSS values, allocated once. Samples are one per
+        # request, so sample x lives in slot (x - 1) % window_size and the x of
+        # each entry is implied by _request_count.
+        self._samples = np.empty(window_size, dtype=np.float64)
+        self._sample_count: int = 0
         self._request_count: int = 0
         self._high_water_mark: float = 0.0
         self._soft_limit_fired: bool = False
         self._last_slope: Optional[float] = None
 
+        # Running least-squares sums over the window, so compute_slope is O(1).
+        # x values are request counts (ints), keeping Σx and Σx² exact.
+        self._sum_x: int = 0
+        self._sum_x2: int = 0
+        self._sum_y: float = 0.0
+        self._sum_xy: float = 0.0
+        self._evictions: int = 0
+
     @property
     def high_water_mark(self) -> float:
         return self._high_water_mark
@@ -52,7 +65,7 @@ class LeakDetector:
         Possible statuses: 'LEAK_TREND_DETECTED', 'SOFT_LIMIT_EXCEEDED'
         """
         self._request_count += 1
-        self._samples.append((self._request_count, rss_mb))
+        self._push_sample(rss_mb)
         self._high_water_mark = max(self._high_water_mark, rss_mb)
 
         # Check soft limit (proactive self-kill)
@@ -65,24 +78,30 @@ class LeakDetector:
                 'soft_limit_mb': self.soft_limit_mb,
             }
 
-        # Check for leak trend at intervals
-        if (self._request_count % self.check_interval == 0
-                and len(self._samples) >= self.check_interval):
-            slope = self.compute_slope()
-            self._last_slope = slope
-            if slope is not None and slope > self.slope_threshold:
-                logger.warning(
-                    f"LEAK_TREND_DETECTED: slope={slope:.4f} MB/req "
-                    f"over {len(self._samples)} samples, "
-                    f"high_water={self._high_water_mark:.1f}MB"
-                )
-                return {
-                    'status': 'LEAK_TREND_DETECTED',
-                    'slope': slope,
-                    'window_size': len(self._samples),
-                    'high_water_mark': self._high_water_mark,
-                }
+        # Trend analysis only runs every check_interval requests; everything
+        # else returns here without touching the slope math.
+        if (self._request_count % self.check_interval
+                or self._sample_count < self.check_interval):
+            return None
 
+        return self._analyze()
+
+    def _analyze(self) -> Optional[Dict[str, Any]]:
+        """Compute the window slope and report a leak trend if it is above threshold."""
+        slope = self.compute_slope()
+        self._last_slope = slope
+        if slope is not None and slope > self.slope_threshold:
+            logger.warning(
+                f"LEAK_TREND_DETECTED: slope={slope:.4f} MB/req "
+                f"over {self._sample_count} samples, "
+                f"high_water={self._high_water_mark:.1f}MB"
+            )
+            return {
+                'status': 'LEAK_TREND_DETECTED',
+                'slope': slope,
+                'window_size': self._sample_count,
+                'high_water_mark': self._high_water_mark,
+            }
         return None
 
     def compute_slope(self) -> Optional[float]:
@@ -90,28 +109,50 @@ class LeakDetector:
         Compute linear regression slope (MB per request) over the sliding window.
 
         Uses least squares: slope = (n*Σxy - Σx*Σy) / (n*Σx² - (Σx)²)
+        The sums are kept up to date by _push_sample, so this is O(1) and
+        allocates nothing regardless of window_size.
         Returns None if insufficient data (< check_interval samples).
         """
-        n = len(self._samples)
+        n = self._sample_count
         if n < self.check_interval:
             return None
 
-        sum_x = 0.0
-        sum_y = 0.0
-        sum_xy = 0.0
-        sum_x2 = 0.0
-
-        for x, y in self._samples:
-            sum_x += x
-            sum_y += y
-            sum_xy += x * y
-            sum_x2 += x * x
-
-        denominator = n * sum_x2 - sum_x * sum_x
+        denominator = n * self._sum_x2 - self._sum_x * self._sum_x
         if denominator == 0:
             return 0.0
 
-        return (n * sum_xy - sum_x * sum_y) / denominator
+        return (n * self._sum_xy - self._sum_x * self._sum_y) / denominator
+
+    def _push_sample(self, y: float):
+        """Write a sample into the ring, updating the running sums for the one it evicts."""
+        x = self._request_count
+        slot = (x - 1) % self.window_size
+        if self._sample_count == self.window_size:
+            old_x, old_y = x - self.window_size, float(self._samples[slot])
+            self._sum_x -= old_x
+            self._sum_x2 -= old_x * old_x
+            self._sum_y -= old_y
+            self._sum_xy -= old_x * old_y
+            self._evictions += 1
+        else:
+            self._sample_count += 1
+
+        self._samples[slot] = y
+        self._sum_x += x
+        self._sum_x2 += x * x
+        self._sum_y += y
+        self._sum_xy += x * y
+
+        # Float add/subtract drifts over a long-lived worker; re-sum once per
+        # full window turnover, which keeps the amortized cost O(1).
+        if self._evictions >= self.window_size:
+            self._evictions = 0
+            # The window is full here and slot holds the newest sample, so
+            # oldest-to-newest order starts just after it.
+            ordered = np.concatenate((self._samples[slot + 1:], self._samples[:slot + 1]))
+            xs = np.arange(x - self.window_size + 1, x + 1, dtype=np.float64)
+            self._sum_y = float(ordered.sum())
+            self._sum_xy = float(xs @ ordered)
 
     def get_state(self) -> Dict[str, Any]:
         """Return current detector state for diagnostics."""
@@ -119,7 +160,7 @@ class LeakDetector:
             'slope': self._last_slope,
             'high_water_mark': self._high_water_mark,
             'request_count': self._request_count,
-            'window_size': len(self._samples),
+            'window_size': self._sample_count,
             'window_capacity': self.window_size,
             'soft_limit_mb': self.soft_limit_mb,
             'soft_limit_fired': self._soft_limit_fired,
@@ -129,6 +170,10 @@ class LeakDetector:
     def _request_graceful_restart(self, rss_mb: float):
         """Send SIGHUP to gunicorn master to gracefully restart this worker."""
         try:
+            # Resolved at call time on purpose: this runs at most once per
+            # worker, and a pid cached at startup could be stale by then.
+            # signal.raise_signal is no substitute - it would hit this worker,
+            # not the master.
             parent_pid = os.getppid()
             logger.warning(
                 f"SOFT_LIMIT_EXCEEDED: RSS={rss_mb:.1f}MB > limit={self.soft_limit_mb}MB. "
@@ -11,36 +11,69 @@ from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+# (pid, Process) for the current process. Keyed by pid so a gunicorn worker
+# forked after import doesn't keep reporting on the master.
+_process_cache: Optional[tuple] = None
+
+
+def _current_process() -> psutil.Process:
+    """Return a psutil.Process for this process, built once per pid."""
+    global _process_cache
+    pid = os.getpid()
+    if _process_cache is None or _process_cache[0] != pid:
+        _process_cache = (pid, psutil.Process(pid))
+    return _process_cache[1]
+
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 0
+
+
+def rss_mb() -> float:
+    """
+    Resident set size of this process in MB.
+
+    On Linux this is one read of /proc/self/statm (second field, in pages);
+    elsewhere it falls back to psutil.
+    """
+    if _PAGE_SIZE:
+        try:
+            with open('/proc/self/statm', 'rb') as f:
+                return int(f.read().split()[1]) * _PAGE_SIZE / 1024 / 1024
+        except OSError:
+            pass
+    return _current_process().memory_info().rss / 1024 / 1024
+
 
 class ResourceSnapshot:
     """Snapshot of current resource usage."""
 
     def __init__(self):
         self.pid = os.getpid()
-        self.memory_mb = self._get_memory_mb()
+        self._process = _current_process()
+        self.memory_mb, self.uss_mb = self._get_memory_and_uss_mb()
         self.open_fds = self._get_open_fds()
         self.asyncio_tasks = self._get_asyncio_task_count()
         self.browser_processes = self._get_browser_process_count()
-        self.uss_mb = self._get_uss_mb()
         self.gc_counts = gc.get_count()
         self.gc_uncollectable = self._get_gc_uncollectable()
 
-    def _get_memory_mb(self) -> float:
-        """Get current process memory usage in MB."""
-        try:
-            process = psutil.Process(self.pid)
-            return process.memory_info().rss / 1024 / 1024
-        except Exception as e:
-            logger.warning(f"Failed to get memory usage: {e}")
-            return 0.0
+    def _get_memory_and_uss_mb(self) -> tuple[float, float]:
+        """
+        Get RSS and unique set size in MB (USS = memory freed if process killed).
 
-    def _get_uss_mb(self) -> float:
-        """Get unique set size in MB (memory that would be freed if process killed)."""
+        memory_full_info() carries RSS as well, so one call covers both.
+        """
         try:
-            process = psutil.Process(self.pid)
-            return process.memory_full_info().uss / 1024 / 1024
+            info = self._process.memory_full_info()
+            return info.rss / 1024 / 1024, info.uss / 1024 / 1024
         except Exception:
-            return self.memory_mb  # Fall back to RSS
+            pass
+        try:
+            rss = rss_mb()
+            return rss, rss  # Fall back to RSS for USS
+        except Exception as e:
+            logger.warning(f"Failed to get memory usage: {e}")
+            return 0.0, 0.0
 
     def _get_gc_uncollectable(self) -> int:
         """Get count of uncollectable objects across all GC generations."""
@@ -52,8 +85,7 @@ class ResourceSnapshot:
     def _get_open_fds(self) -> int:
         """Get count of open file descriptors."""
         try:
-            process = psutil.Process(self.pid)
-            return process.num_fds()
+            return self._process.num_fds()
         except Exception:
             return 0
 
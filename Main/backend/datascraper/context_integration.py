@@ -148,23 +148,25 @@ class ContextIntegration:
         search_results: List[Dict[str, Any]]
     ) -> None:
         """Add web search results to context"""
+        items = []
         for result in search_results:
             content = f"Title: {result.get('title', 'N/A')}\n"
             content += f"Snippet: {result.get('snippet', 'N/A')}\n"
             if result.get('body'):
                 content += f"Content: {result['body'][:500]}..."
 
-            self.context_manager.add_fetched_context(
-                session_id=session_id,
-                source_type="web_search",
-                content=content,
-                url=result.get('url'),
-                extracted_data={
+            items.append({
+                'source_type': "web_search",
+                'content': content,
+                'url': result.get('url'),
+                'extracted_data': {
                     'title': result.get('title'),
                     'site_name': result.get('site_name'),
                     'published_date': result.get('published_date')
                 }
-            )
+            })
+
+        self.context_manager.add_fetched_context_bulk(session_id, items)
 
     def clear_messages(
         self,
@@ -188,6 +190,14 @@ class ContextIntegration:
         """Get list of URLs that have already been scraped"""
         return self.context_manager.get_scraped_urls(session_id)
 
+    def get_context_stats(self, session_id: str) -> Dict[str, Any]:
+        """Get statistics about the context"""
+        return self.context_manager.get_session_stats(session_id)
+
+    def get_fetched_count(self, session_id: str, source_type: str) -> int:
+        """Number of fetched context items of one source type, without loading the session"""
+        return self.context_manager.get_fetched_count(session_id, source_type)
+
 
 _integration = None
 
@@ -122,7 +122,7 @@ class EnhancedContextIntegration:
 
             messages = []
             for msg in context:
-                messages.append({"content": msg["content"]})
+                messages.append({"role": msg["role"], "content": msg["content"]})
 
         return messages, session_id
 
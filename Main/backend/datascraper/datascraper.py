@@ -181,12 +181,32 @@ def _is_numerical_financial_query(query: str) -> bool:
     return False
 
 
-def _strip_any_prefix(content: str, prefixes: tuple[str, ...]) -> tuple[bool, str]:
-    """Return (matched, stripped_content) when removing the first matching prefix."""
-    for prefix in prefixes:
-        if content.startswith(prefix):
-            return True, content[len(prefix):]
-    return False, content
+_ROLE_BY_PREFIX = {
+    SYSTEM_PREFIX: "system",
+    **dict.fromkeys(USER_PREFIXES, "user"),
+    **dict.fromkeys(ASSISTANT_PREFIXES, "assistant"),
+}
+_ROLE_PREFIX_RE = _re.compile("|".join(_re.escape(p) for p in _ROLE_BY_PREFIX))
+
+
+def _split_role_prefix(content: str) -> tuple[Optional[str], str]:
+    """Return (role, content without its header), or (None, content) when unlabelled."""
+    match = _ROLE_PREFIX_RE.match(content)
+    if match is None:
+        return None, content
+    return _ROLE_BY_PREFIX[match.group()], content[match.end():]
+
+
+def _message_role(msg: dict) -> tuple[Optional[str], str]:
+    """Return (role, content) for a history message.
+
+    The context manager sends {"role", "content"} pairs; messages without a
+    role fall back to their [... MESSAGE]: header.
+    """
+    role = msg.get("role")
+    if role is None:
+        return _split_role_prefix(msg.get("content", ""))
+    return role, msg.get("content", "")
 
 
 
@@ -237,27 +257,18 @@ def _prepare_messages(message_list: list[dict], user_input: str, model: str = No
     system_message = None
 
     for msg in message_list:
-        content = msg.get("content", "")
+        role, actual_content = _message_role(msg)
 
-        if content.startswith(SYSTEM_PREFIX):
-            actual_content = content.replace(SYSTEM_PREFIX, "", 1)
+        if role == "system":
             if not system_message:
                 system_message = actual_content
             else:
                 system_message = f"{system_message} {actual_content}"
-            continue
-
-        matched, actual_content = _strip_any_prefix(content, USER_PREFIXES)
-        if matched:
-            msgs.append({"role": "user", "content": actual_content})
-            continue
-
-        matched, actual_content = _strip_any_prefix(content, ASSISTANT_PREFIXES)
-        if matched:
+        elif role == "assistant":
             msgs.append({"role": "assistant", "content": actual_content})
-            continue
-
-        msgs.append({"role": "user", "content": content})
+        else:
+            # Unlabelled messages are treated as the user's
+            msgs.append({"role": "user", "content": actual_content})
 
     instruction = INSTRUCTION
     if model:
@@ -273,7 +284,9 @@ def _prepare_messages(message_list: list[dict], user_input: str, model: str = No
 
     msgs.insert(0, {"role": "user", "content": f"{SYSTEM_PREFIX}{instruction_payload}"})
 
-    msgs.append({"role": "user", "content": user_input})
+    # The context manager has usually recorded the question already
+    if msgs[-1] != {"role": "user", "content": user_input}:
+        msgs.append({"role": "user", "content": user_input})
 
     return msgs, system_message
 
@@ -1037,23 +1050,16 @@ async def _create_agent_response_async(
     extracted_system_prompt = None
 
     for msg in message_list:
-        content = msg.get("content", "")
-        if content.startswith(SYSTEM_PREFIX):
-            actual_content = content.replace(SYSTEM_PREFIX, "", 1)
+        role, actual_content = _message_role(msg)
+        if role == "system":
             if extracted_system_prompt:
                 extracted_system_prompt += "\n\n" + actual_content
             else:
                 extracted_system_prompt = actual_content
-            continue
-        matched, actual_content = _strip_any_prefix(content, USER_PREFIXES)
-        if matched:
-            context += f"User: {actual_content}\n"
-            continue
-        matched, actual_content = _strip_any_prefix(content, ASSISTANT_PREFIXES)
-        if matched:
+        elif role == "assistant":
             context += f"Assistant: {actual_content}\n"
-            continue
-        context += f"User: {content}\n"
+        else:
+            context += f"User: {actual_content}\n"
 
     full_prompt = context.rstrip()
 
@@ -1222,26 +1228,16 @@ def create_agent_response_stream(
         extracted_system_prompt = None
 
         for msg in message_list:
-            content = msg.get("content", "")
-            if content.startswith(SYSTEM_PREFIX):
-                actual_content = content.replace(SYSTEM_PREFIX, "", 1)
+            role, actual_content = _message_role(msg)
+            if role == "system":
                 if extracted_system_prompt:
                     extracted_system_prompt += "\n\n" + actual_content
                 else:
                     extracted_system_prompt = actual_content
-                continue
-
-            matched, actual_content = _strip_any_prefix(content, USER_PREFIXES)
-            if matched:
-                context += f"User: {actual_content}\n"
-                continue
-
-            matched, actual_content = _strip_any_prefix(content, ASSISTANT_PREFIXES)
-            if matched:
+            elif role == "assistant":
                 context += f"Assistant: {actual_content}\n"
-                continue
-
-            context += f"User: {content}\n"
+            else:
+                context += f"User: {actual_content}\n"
 
         # Use context directly - current user message is already in message_list
         # (views.py calls add_user_message before calling this function)
@@ -1249,7 +1245,7 @@ def create_agent_response_stream(
 
         # --- Planner: select skill and constrain agent ---
         from planner.planner import Planner
-        from planner.plan import ExecutionPlan
+        from planner.plan import get_plan
 
         try:
             _planner = Planner()
@@ -1265,7 +1261,7 @@ def create_agent_response_stream(
             )
         except Exception as planner_err:
             logging.warning(f"[Planner] Failed ({planner_err}), falling back to default plan")
-            execution_plan = ExecutionPlan(skill_name="fallback", tools_allowed=None, max_turns=10)
+            execution_plan = get_plan("fallback", None, 10)
 
         logging.info(
             f"[AGENT STREAM] Plan: skill={execution_plan.skill_name} "
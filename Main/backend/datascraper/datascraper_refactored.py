@@ -15,6 +15,7 @@ from .unified_context_manager import (
     get_context_manager
 )
 from .models_config import MODEL_CONFIGS, get_model_config
+from .datascraper import _message_role
 
 logger = logging.getLogger(__name__)
 
@@ -420,6 +421,31 @@ class UnifiedDataScraper:
             loop.close()
 
 
+def _replay_history(
+    context_mgr: UnifiedContextManager,
+    session_id: str,
+    message_list: List[Dict[str, str]],
+    user_input: str,
+    model: str
+) -> None:
+    """
+    Load message_list and the current question into a temporary session.
+    The question is only added if message_list does not already end with it.
+    """
+    last_user_message = None
+    for msg in message_list:
+        role, content = _message_role(msg)
+        if role == "user":
+            context_mgr.add_user_message(session_id, content)
+            last_user_message = content
+        elif role == "assistant":
+            context_mgr.add_assistant_message(session_id, content, model=model)
+            last_user_message = None
+
+    if last_user_message != user_input:
+        context_mgr.add_user_message(session_id, user_input)
+
+
 _scraper = None
 
 def get_unified_scraper() -> UnifiedDataScraper:
@@ -447,16 +473,7 @@ def create_response(
 
     session_id = f"temp_{uuid.uuid4()}"
 
-    for msg in message_list:
-        content = msg.get('content', '')
-        if '[USER MESSAGE]:' in content or '[USER QUESTION]:' in content:
-            clean_content = content.replace('[USER MESSAGE]:', '').replace('[USER QUESTION]:', '').strip()
-            context_mgr.add_user_message(session_id, clean_content)
-        elif '[ASSISTANT MESSAGE]:' in content or '[ASSISTANT RESPONSE]:' in content:
-            clean_content = content.replace('[ASSISTANT MESSAGE]:', '').replace('[ASSISTANT RESPONSE]:', '').strip()
-            context_mgr.add_assistant_message(session_id, clean_content, model=model)
-
-    context_mgr.add_user_message(session_id, user_input)
+    _replay_history(context_mgr, session_id, message_list, user_input, model)
 
     response = scraper.create_response(session_id, model, stream)
 
@@ -482,16 +499,7 @@ def create_agent_response(
 
     session_id = f"temp_{uuid.uuid4()}"
 
-    for msg in message_list:
-        content = msg.get('content', '')
-        if '[USER MESSAGE]:' in content or '[USER QUESTION]:' in content:
-            clean_content = content.replace('[USER MESSAGE]:', '').replace('[USER QUESTION]:', '').strip()
-            context_mgr.add_user_message(session_id, clean_content)
-        elif '[ASSISTANT MESSAGE]:' in content or '[ASSISTANT RESPONSE]:' in content:
-            clean_content = content.replace('[ASSISTANT MESSAGE]:', '').replace('[ASSISTANT RESPONSE]:', '').strip()
-            context_mgr.add_assistant_message(session_id, clean_content, model=model)
-
-    context_mgr.add_user_message(session_id, user_input)
+    _replay_history(context_mgr, session_id, message_list, user_input, model)
 
     from .unified_context_manager import ContextMode
     context_mgr.update_metadata(
@@ -527,16 +535,7 @@ def create_advanced_response(
 
     session_id = f"temp_{uuid.uuid4()}"
 
-    for msg in message_list:
-        content = msg.get('content', '')
-        if '[USER MESSAGE]:' in content or '[USER QUESTION]:' in content:
-            clean_content = content.replace('[USER MESSAGE]:', '').replace('[USER QUESTION]:', '').strip()
-            context_mgr.add_user_message(session_id, clean_content)
-        elif '[ASSISTANT MESSAGE]:' in content or '[ASSISTANT RESPONSE]:' in content:
-            clean_content = content.replace('[ASSISTANT MESSAGE]:', '').replace('[ASSISTANT RESPONSE]:', '').strip()
-            context_mgr.add_assistant_message(session_id, clean_content, model=model)
-
-    context_mgr.add_user_message(session_id, user_input)
+    _replay_history(context_mgr, session_id, message_list, user_input, model)
 
     from .unified_context_manager import ContextMode
     context_mgr.update_metadata(
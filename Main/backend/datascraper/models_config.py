@@ -110,6 +110,9 @@ RESEARCH_CONFIG = {
     "max_iterations": 3,
     "max_sub_questions": 5,
     "parallel_searches": True,
+    # Gap-check after each finished sub-question and cancel the stragglers
+    # once the evidence is complete. Costs one planner call per check.
+    "early_gap_check": False,
 }
 
 
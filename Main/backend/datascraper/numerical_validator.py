@@ -9,9 +9,17 @@ and orphan numbers not traceable to any source.
 import re
 import json
 import logging
+import math
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from typing import Set
 
+try:
+    import orjson
+    _json_loads = orjson.loads  # raises orjson.JSONDecodeError, a json.JSONDecodeError subclass
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 # Pattern to match financial numbers (integers, decimals, percentages)
@@ -43,14 +51,43 @@ def _extract_numbers(text: str) -> Set[str]:
     numbers = set()
     for match in _NUMBER_PATTERN.finditer(text):
         num_str = match.group(1).replace(',', '')
-        # Skip very short numbers (likely not financial data)
-        try:
-            val = float(num_str)
-            # Only track numbers that look like financial data (> 0.001 and not just 0, 1, 2...)
-            if val > 0.01 and len(num_str) > 1:
+        # Skip single digits before paying for float(); the pattern only
+        # captures digits and one optional decimal point, so float() can't fail.
+        # Only track numbers that look like financial data (> 0.01 and not just 0, 1, 2...)
+        if len(num_str) > 1 and num_str not in numbers and float(num_str) > 0.01:
+            numbers.add(num_str)
+    return numbers
+
+
+def _extract_json_numbers(obj) -> Set[str]:
+    """
+    Extract numbers from a parsed JSON payload.
+
+    Numeric leaves are taken as-is (formatted like json.dumps would), so only
+    string keys and values go through the regex, in a single joined scan.
+    """
+    numbers = set()
+    texts = []
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            texts.extend(key for key in node if isinstance(key, str))
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, str):
+            texts.append(node)
+        elif isinstance(node, (int, float)) and not isinstance(node, bool):
+            val = abs(node)  # the text pattern never captures the sign either
+            num_str = repr(val)
+            if len(num_str) > 1 and math.isfinite(val) and val > 0.01:
                 numbers.add(num_str)
-        except ValueError:
-            continue
+        elif node is not None:
+            texts.append(str(node))
+
+    if texts:
+        numbers.update(_extract_numbers('\n'.join(texts)))
     return numbers
 
 
@@ -68,10 +105,11 @@ def _extract_tool_output_numbers(run_result) -> Set[str]:
                 if output:
                     # Try parsing as JSON first (structured tool output)
                     try:
-                        parsed = json.loads(output) if isinstance(output, str) else output
-                        tool_numbers.update(_extract_numbers(json.dumps(parsed)))
+                        parsed = _json_loads(output) if isinstance(output, str) else output
                     except (json.JSONDecodeError, TypeError):
                         tool_numbers.update(_extract_numbers(str(output)))
+                    else:
+                        tool_numbers.update(_extract_json_numbers(parsed))
     except Exception as e:
         logger.debug(f"[NUM VALIDATOR] Error extracting tool numbers: {e}")
 
@@ -105,31 +143,35 @@ def validate_numerical_accuracy(run_result, final_output: str) -> ValidationResu
             logger.debug("[NUM VALIDATOR] No tool output numbers found, skipping validation")
             return result
 
+        # Sort tool values once; only the neighbours either side of a response
+        # value can be its closest match, so each lookup is a bisect, not a scan.
+        # (_extract_numbers only keeps values > 0.01, so no zero denominators.)
+        tool_pairs = sorted((float(n), n) for n in tool_numbers)
+        tool_vals = [val for val, _ in tool_pairs]
+
         for resp_num in response_numbers:
+            # Both sides are normalized the same way, so an identical string is
+            # an exact match without any float work.
+            if resp_num in tool_numbers:
+                result.exact_matches += 1
+                continue
+
             resp_val = float(resp_num)
+            i = bisect_left(tool_vals, resp_val)
+            relative_diff, tool_val, tool_num = min(
+                (abs(resp_val - val) / val, val, num)
+                for val, num in tool_pairs[max(i - 1, 0):i + 1]
+            )
 
-            found_exact = False
-            found_close = False
-            for tool_num in tool_numbers:
-                tool_val = float(tool_num)
-                if tool_val == 0:
-                    continue
-                relative_diff = abs(resp_val - tool_val) / abs(tool_val)
-
-                # Exact match or very close (within 0.01%)
-                if relative_diff < 0.0001:
-                    result.exact_matches += 1
-                    found_exact = True
-                    break
-                # Close-but-wrong (within 1% but not exact)
-                if relative_diff < 0.01:
-                    diff = abs(resp_val - tool_val)
-                    result.close_matches.append((resp_num, tool_num, diff))
-                    result.suspicious.append((resp_num, tool_num, diff))
-                    found_close = True
-                    break
-
-            if not found_exact and not found_close:
+            # Exact match or very close (within 0.01%)
+            if relative_diff < 0.0001:
+                result.exact_matches += 1
+            # Close-but-wrong (within 1% but not exact)
+            elif relative_diff < 0.01:
+                diff = abs(resp_val - tool_val)
+                result.close_matches.append((resp_num, tool_num, diff))
+                result.suspicious.append((resp_num, tool_num, diff))
+            else:
                 result.orphan_numbers.append(resp_num)
 
         # Log warnings for suspicious values
@@ -470,17 +470,19 @@ async def create_responses_api_search_async(
             system_msg = None
             conversation_parts = []
 
+            # datascraper imports this module at load time
+            from .datascraper import _message_role
+
             for msg in message_history:
-                content = msg.get('content', '')
-
-                if content.startswith("[SYSTEM MESSAGE]:"):
-                    system_msg = content.replace("[SYSTEM MESSAGE]:", "").strip()
-                elif content.startswith("[USER MESSAGE]:"):
-                    user_content = content.replace("[USER MESSAGE]:", "").strip()
-                    conversation_parts.append(f"User: {user_content}")
-                elif content.startswith("[ASSISTANT MESSAGE]:"):
-                    assistant_content = content.replace("[ASSISTANT MESSAGE]:", "").strip()
-                    conversation_parts.append(f"Assistant: {assistant_content}")
+                role, content = _message_role(msg)
+                content = content.strip()
+
+                if role == "system":
+                    system_msg = content
+                elif role == "user":
+                    conversation_parts.append(f"User: {content}")
+                elif role == "assistant":
+                    conversation_parts.append(f"Assistant: {content}")
 
             if system_msg:
                 system_instructions = system_msg + "\n\n" + system_instructions
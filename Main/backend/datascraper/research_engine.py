@@ -7,18 +7,33 @@ and response synthesis for complex financial queries.
 Design doc: Docs/plans/2026-02-15-multi-step-research-design.md
 """
 
+import copy
+import importlib.util
 import json
 import logging
 import asyncio
-from collections.abc import AsyncIterator
+import re
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any, Optional
 
+import httpx
+from cachetools import TTLCache
 from openai import AsyncOpenAI
+from pydantic_core import from_json
 from dotenv import load_dotenv
 from pathlib import Path
 
+from planner.skills.registry import SkillRegistry
+
 from .models_config import get_research_config
 
+try:
+    import orjson
+    _json_loads = orjson.loads  # raises orjson.JSONDecodeError, a json.JSONDecodeError subclass
+except ImportError:
+    _json_loads = json.loads
+
 backend_dir = Path(__file__).resolve().parent.parent
 load_dotenv(backend_dir / ".env")
 
@@ -29,7 +44,17 @@ logger = logging.getLogger(__name__)
 import os
 
 _OPENAI_KEY = os.getenv("OPENAI_API_KEY")
-_planner_client: Optional[AsyncOpenAI] = AsyncOpenAI(api_key=_OPENAI_KEY) if _OPENAI_KEY else None
+
+# One pooled HTTP client for every planner/synthesis call, so repeated calls
+# reuse warm connections. HTTP/2 only when the optional h2 package is present.
+_planner_http = httpx.AsyncClient(
+    http2=importlib.util.find_spec("h2") is not None,
+    timeout=httpx.Timeout(600.0, connect=10.0),
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+) if _OPENAI_KEY else None
+_planner_client: Optional[AsyncOpenAI] = (
+    AsyncOpenAI(api_key=_OPENAI_KEY, http_client=_planner_http) if _OPENAI_KEY else None
+)
 
 
 async def _call_planner(messages: list[dict], model: str | None = None):
@@ -57,6 +82,88 @@ async def _call_planner(messages: list[dict], model: str | None = None):
         raise
 
 
+async def _call_planner_streaming(messages: list[dict], model: str | None = None):
+    """Call the planner model with streaming enabled. Returns an async iterator of chunks."""
+    if _planner_client is None:
+        raise RuntimeError("OPENAI_API_KEY not set; research engine unavailable.")
+    cfg = get_research_config()
+    resolved_model = model or cfg["planner_model"]
+    try:
+        return await _planner_client.chat.completions.create(
+            model=resolved_model,
+            messages=messages,
+            temperature=0.0,
+            response_format={"type": "json_object"},
+            stream=True,
+        )
+    except Exception as exc:
+        if "temperature" in str(exc).lower():
+            logger.info(f"[RESEARCH] Model '{resolved_model}' rejected temperature=0.0, retrying with default")
+            return await _planner_client.chat.completions.create(
+                model=resolved_model,
+                messages=messages,
+                response_format={"type": "json_object"},
+                stream=True,
+            )
+        raise
+
+
+# ── 0. Analyzer pre-filter ───────────────────────────────────────────
+
+# Words that join several subjects into one query, or a comma-separated list
+_COMPARISON_RE = re.compile(
+    r"\b(and|vs|versus|compare[ds]?|comparison|between|against|relative to)\b|[&,]",
+    re.IGNORECASE,
+)
+# Phrases asking for one figure across several periods
+_MULTI_PERIOD_RE = re.compile(
+    r"\b(each|every|per|by) (day|week|month|quarter|year)\b"
+    r"|\b(daily|weekly|monthly|quarterly|yearly|annually)\b"
+    r"|\b(last|past|previous) \d+ (days|weeks|months|quarters|years)\b"
+    r"|\b(over time|trend|history|historical)\b"
+    r"|\b(19|20)\d{2}\s*(-|to|through)\s*(19|20)\d{2}\b",
+    re.IGNORECASE,
+)
+_TICKER_RE = re.compile(r"\b[A-Z]{1,5}\b")
+# All-caps words that are financial jargon rather than tickers
+_NON_TICKERS = frozenset({
+    "A", "I", "AI", "CEO", "CFO", "CPI", "EPS", "ETF", "EV", "FED", "FOMC",
+    "FY", "GDP", "IPO", "IV", "MACD", "NYSE", "OI", "P", "PE", "RSI", "ROE",
+    "ROI", "SEC", "TTM", "US", "USA", "USD", "YTD",
+})
+_SHORT_QUERY_WORDS = 12
+# Specialised skills; the registry's last skill is the catch-all fallback
+_DATA_SKILLS = SkillRegistry().skills[:-1]
+# Score a keyword skill gives a query it matches
+_CONFIDENT_SKILL_SCORE = 0.8
+
+
+def _needs_llm_analyzer(query: str) -> bool:
+    """
+    Whether a query could plausibly need decomposing.
+
+    Short queries about at most one ticker and one period, with nothing
+    joining several subjects and at most one skill confidently matching,
+    are answered by single search, so they skip the analyzer call.
+    """
+    if len(query.split()) >= _SHORT_QUERY_WORDS or _COMPARISON_RE.search(query):
+        return True
+    if _MULTI_PERIOD_RE.search(query):
+        return True
+    tickers = {t for t in _TICKER_RE.findall(query) if t not in _NON_TICKERS}
+    if len(tickers) > 1:
+        return True
+    scores = [
+        skill.matches(query, has_prescraped=False, domain=None)
+        for skill in _DATA_SKILLS
+    ]
+    matched = [score for score in scores if score > 0.0]
+    # No specialised skill means the fallback's single web search answers it
+    if not matched:
+        return False
+    return not (len(matched) == 1 and matched[0] >= _CONFIDENT_SKILL_SCORE)
+
+
 # ── 1. Query Analyzer ────────────────────────────────────────────────
 
 _ANALYZER_SYSTEM = """\
@@ -67,12 +174,35 @@ Rules:
 - If the query compares multiple tickers, asks for data across time periods, or requires combining multiple data types, set needs_decomposition=true and list sub-questions.
 - Each sub-question must have a "type": one of "numerical" (prices, ratios, revenue, volumes — answerable by Yahoo Finance API), "qualitative" (news, sentiment, analysis, forecasts — needs web search), or "analytical" (comparison, calculation — no search needed, derived from other answers).
 - If the query asks for a SINGLE aggregate metric from a SINGLE source (e.g., "total options volume today", "total revenue last quarter"), treat it as ONE numerical sub-question, NOT as a decomposition target. Only decompose when the user explicitly asks to compare multiple items or break down by category.
+- For a "numerical" sub-question whose data Yahoo Finance does not carry (e.g., macroeconomic statistics, private-company figures, industry-wide totals), add "preferred_source": "web" so it skips the Yahoo Finance lookup. Otherwise omit preferred_source.
 - Maximum {max_sub} sub-questions. Prioritize the most important ones.
 
 Respond ONLY with JSON:
-{{"needs_decomposition": bool, "sub_questions": [{{"question": "...", "type": "numerical|qualitative|analytical"}}]}}
+{{"needs_decomposition": bool, "sub_questions": [{{"question": "...", "type": "numerical|qualitative|analytical", "preferred_source": "web (optional)"}}]}}
 """
 
+_SUB_QUESTION_TYPES = {"numerical", "qualitative", "analytical"}
+
+# Routing hints the analyzer may attach to a sub-question
+_PREFERRED_SOURCES = {"mcp", "web"}
+
+# Successful analyzer plans keyed by planner model, sub-question cap and query.
+# time_context is left out of the key: it carries a per-second clock, and
+# within the TTL it resolves relative dates the same way. Requests may run
+# on different threads, and TTLCache is not thread-safe on its own.
+_plan_cache = TTLCache(maxsize=256, ttl=120)
+_plan_cache_lock = threading.Lock()
+
+
+def _cached_plan(cache_key: str) -> Optional[dict[str, Any]]:
+    with _plan_cache_lock:
+        return _plan_cache.get(cache_key)
+
+
+def _cache_plan(cache_key: str, plan: dict[str, Any]) -> None:
+    with _plan_cache_lock:
+        _plan_cache[cache_key] = copy.deepcopy(plan)
+
 
 class QueryAnalyzer:
     """Decompose complex financial queries into typed sub-questions."""
@@ -80,38 +210,60 @@ class QueryAnalyzer:
     def __init__(self, max_sub_questions: int | None = None):
         cfg = get_research_config()
         self.max_sub = max_sub_questions or cfg["max_sub_questions"]
+        self.planner_model = cfg["planner_model"]
 
-    async def analyze(self, query: str, time_context: str = "") -> dict[str, Any]:
-        """Return a research plan for the given query."""
+    def _cache_key(self, query: str) -> str:
+        return f"{self.planner_model}|{self.max_sub}|{query}"
+
+    def _messages(self, query: str, time_context: str) -> list[dict]:
         system = _ANALYZER_SYSTEM.format(max_sub=self.max_sub)
         user_msg = query
         if time_context:
             user_msg = f"{time_context}\n\nQuery: {query}"
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user_msg},
+        ]
+
+    @staticmethod
+    def _validate_sub_question(sq: Any) -> Optional[dict]:
+        """Normalized sub-question, or None if it lacks a question."""
+        if not isinstance(sq, dict) or "question" not in sq:
+            return None
+        sq_type = sq.get("type", "qualitative")
+        if sq_type not in _SUB_QUESTION_TYPES:
+            sq_type = "qualitative"
+        entry = {"question": sq["question"], "type": sq_type}
+        if sq.get("preferred_source") in _PREFERRED_SOURCES:
+            entry["preferred_source"] = sq["preferred_source"]
+        return entry
+
+    def _validate_plan(self, plan: Any) -> dict[str, Any]:
+        """Validate a parsed planner reply and cap its sub-questions."""
+        if not isinstance(plan, dict):
+            raise TypeError(f"expected a JSON object, got {type(plan).__name__}")
+        if not isinstance(plan.get("needs_decomposition"), bool):
+            plan["needs_decomposition"] = False
+        subs = plan.get("sub_questions", [])
+        if not isinstance(subs, list):
+            subs = []
+        validated = [self._validate_sub_question(sq) for sq in subs[: self.max_sub]]
+        plan["sub_questions"] = [sq for sq in validated if sq is not None]
+        return plan
+
+    async def analyze(self, query: str, time_context: str = "") -> dict[str, Any]:
+        """Return a research plan for the given query."""
+        cache_key = self._cache_key(query)
+        cached = _cached_plan(cache_key)
+        if cached is not None:
+            logger.info("[RESEARCH] Query analyzer cache hit")
+            return copy.deepcopy(cached)
 
         try:
-            response = await _call_planner([
-                {"role": "system", "content": system},
-                {"role": "user", "content": user_msg},
-            ])
+            response = await _call_planner(self._messages(query, time_context))
             raw = response.choices[0].message.content
-            plan = json.loads(raw)
-
-            # Validate & cap
-            if not isinstance(plan.get("needs_decomposition"), bool):
-                plan["needs_decomposition"] = False
-            subs = plan.get("sub_questions", [])
-            if not isinstance(subs, list):
-                subs = []
-            # Validate each sub-question has required fields
-            valid_types = {"numerical", "qualitative", "analytical"}
-            validated = []
-            for sq in subs[: self.max_sub]:
-                if isinstance(sq, dict) and "question" in sq:
-                    sq_type = sq.get("type", "qualitative")
-                    if sq_type not in valid_types:
-                        sq_type = "qualitative"
-                    validated.append({"question": sq["question"], "type": sq_type})
-            plan["sub_questions"] = validated
+            plan = self._validate_plan(_json_loads(raw))
+            _cache_plan(cache_key, plan)
             return plan
 
         except (json.JSONDecodeError, KeyError, TypeError) as exc:
@@ -121,6 +273,72 @@ class QueryAnalyzer:
             logger.error(f"[RESEARCH] Query analyzer failed: {exc}")
             return {"needs_decomposition": False, "sub_questions": []}
 
+    async def analyze_streaming(
+        self, query: str, time_context: str = ""
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Yield the plan's sub-questions as soon as the planner finishes each one.
+
+        Yields nothing when the query needs no decomposition. If the reply
+        breaks off or turns out malformed, the sub-questions already yielded
+        stand and the plan is not cached.
+        """
+        cache_key = self._cache_key(query)
+        cached = _cached_plan(cache_key)
+        if cached is not None:
+            logger.info("[RESEARCH] Query analyzer cache hit")
+            if cached["needs_decomposition"]:
+                for sq in copy.deepcopy(cached["sub_questions"]):
+                    yield sq
+            return
+
+        chunks: list[str] = []
+        seen = 0  # raw sub-questions already handled
+        yielded = 0
+        try:
+            stream = await _call_planner_streaming(self._messages(query, time_context))
+            try:
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    chunks.append(delta)
+                    # A sub-question is known complete once the next one opens
+                    if "{" not in delta:
+                        continue
+                    try:
+                        partial = from_json("".join(chunks), allow_partial=True)
+                    except ValueError:
+                        continue
+                    if not isinstance(partial, dict) or partial.get("needs_decomposition") is not True:
+                        continue
+                    subs = partial.get("sub_questions")
+                    if not isinstance(subs, list):
+                        continue
+                    # Every item but the last is followed by another, so it is complete
+                    for sq in subs[seen: min(len(subs) - 1, self.max_sub)]:
+                        seen += 1
+                        entry = self._validate_sub_question(sq)
+                        if entry is not None:
+                            yielded += 1
+                            yield entry
+            finally:
+                await stream.close()
+
+            plan = self._validate_plan(_json_loads("".join(chunks)))
+        except (json.JSONDecodeError, KeyError, TypeError) as exc:
+            logger.warning(f"[RESEARCH] Query analyzer returned invalid JSON: {exc}")
+            return
+        except Exception as exc:
+            logger.error(f"[RESEARCH] Query analyzer failed: {exc}")
+            return
+
+        _cache_plan(cache_key, plan)
+        if plan["needs_decomposition"]:
+            # Validation is per item, so what was yielded is a prefix of the plan
+            for sq in plan["sub_questions"][yielded:]:
+                yield sq
+
 
 # ── Helper wrappers for MCP and web search ────────────────────────────
 
@@ -196,6 +414,23 @@ class ResearchExecutor:
         self.user_timezone = user_timezone
         self.user_time = user_time
         self.parallel = parallel
+        # MCP calls by normalized question, shared by repeats within this request
+        self._mcp_calls: dict[str, asyncio.Future] = {}
+
+    async def _mcp_answer(self, question: str) -> Optional[str]:
+        """MCP answer for a question; repeats of it reuse the first call."""
+        key = " ".join(question.lower().split())
+        call = self._mcp_calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(_try_mcp_search(
+                question=question,
+                message_list=self.message_list,
+                model=self.model,
+                user_timezone=self.user_timezone,
+                user_time=self.user_time,
+            ))
+            self._mcp_calls[key] = call
+        return await asyncio.shield(call)
 
     async def _execute_one(self, sq: dict) -> dict[str, Any]:
         """Execute a single sub-question and return a result dict."""
@@ -211,15 +446,9 @@ class ResearchExecutor:
                 "source": "deferred",
             }
 
-        # Numerical: try MCP first
-        if sq_type == "numerical":
-            mcp_result = await _try_mcp_search(
-                question=question,
-                message_list=self.message_list,
-                model=self.model,
-                user_timezone=self.user_timezone,
-                user_time=self.user_time,
-            )
+        # Numerical: try MCP first, unless the analyzer already knows it's web-only
+        if sq_type == "numerical" and sq.get("preferred_source") != "web":
+            mcp_result = await self._mcp_answer(question)
             if mcp_result is not None:
                 return {
                     "question": question,
@@ -246,17 +475,112 @@ class ResearchExecutor:
             "source": "web",
         }
 
-    async def execute(self, plan: dict) -> list[dict[str, Any]]:
-        """Execute all sub-questions. Returns list of result dicts."""
+    @staticmethod
+    def _failed_result(sq: dict, exc: BaseException) -> dict[str, Any]:
+        """Result record standing in for a sub-question whose search raised."""
+        return {
+            "question": sq["question"],
+            "type": sq.get("type", "qualitative"),
+            "answer": f"(research failed: {exc})",
+            "sources": [],
+            "source": "error",
+        }
+
+    async def execute(
+        self,
+        plan: dict,
+        until: Optional[Callable[[list[dict]], Awaitable[bool]]] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Execute all sub-questions. Returns list of result dicts in plan order.
+
+        A sub-question that raises becomes an error record instead of
+        discarding the answers its siblings already gathered.
+
+        In parallel mode, ``until`` is awaited with the results so far each
+        time a sub-question finishes while others are still running. Once it
+        returns True the rest are cancelled and left out of the results.
+        """
         subs = plan.get("sub_questions", [])
         if not subs:
             return []
 
-        if self.parallel:
-            tasks = [self._execute_one(sq) for sq in subs]
-            return list(await asyncio.gather(*tasks, return_exceptions=False))
-        else:
-            return [await self._execute_one(sq) for sq in subs]
+        try:
+            if self.parallel:
+                tasks = [asyncio.create_task(self._execute_one(sq)) for sq in subs]
+                if until is None:
+                    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+                else:
+                    await self._wait_until(subs, tasks, until)
+                    outcomes = [self._task_outcome(t) for t in tasks]
+            else:
+                outcomes = []
+                for sq in subs:
+                    try:
+                        outcomes.append(await self._execute_one(sq))
+                    except Exception as exc:
+                        outcomes.append(exc)
+        finally:
+            await self._settle_mcp_calls()
+
+        return self._collect(subs, outcomes)
+
+    async def _settle_mcp_calls(self) -> None:
+        """Cancel MCP calls left running by cancelled sub-questions."""
+        # Every sub-question has finished or been cancelled, so a call still
+        # running is only kept alive by shield() and nobody will await it
+        running = [call for call in self._mcp_calls.values() if not call.done()]
+        for call in running:
+            call.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        # A later follow-up asking the same question starts a fresh call
+        self._mcp_calls = {
+            key: call for key, call in self._mcp_calls.items() if not call.cancelled()
+        }
+
+    def _collect(self, subs: list[dict], outcomes: list) -> list[dict[str, Any]]:
+        """Map outcomes onto result records in plan order; None means cancelled."""
+        results = []
+        for sq, outcome in zip(subs, outcomes):
+            if outcome is None:
+                continue
+            if isinstance(outcome, Exception):
+                logger.warning(f"[RESEARCH] Sub-question failed: {outcome}")
+                outcome = self._failed_result(sq, outcome)
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            results.append(outcome)
+        return results
+
+    @staticmethod
+    def _task_outcome(task: asyncio.Task) -> Any:
+        """A finished task's result or exception, or None if it never finished."""
+        if not task.done() or task.cancelled():
+            return None
+        return task.exception() or task.result()
+
+    async def _wait_until(
+        self,
+        subs: list[dict],
+        tasks: list[asyncio.Task],
+        until: Callable[[list[dict]], Awaitable[bool]],
+    ) -> None:
+        pending = set(tasks)
+        try:
+            while pending:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if not pending:
+                    break
+                partial = self._collect(subs, [self._task_outcome(t) for t in tasks])
+                if await until(partial):
+                    logger.info(f"[RESEARCH] Enough evidence, cancelling {len(pending)} sub-question(s)")
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
 
 
 # ── 3. Gap Detector ───────────────────────────────────────────────────
@@ -314,7 +638,9 @@ class GapDetector:
                 {"role": "user", "content": "Evaluate completeness."},
             ])
             raw = response.choices[0].message.content
-            result = json.loads(raw)
+            result = _json_loads(raw)
+            if not isinstance(result, dict):
+                raise TypeError(f"expected a JSON object, got {type(result).__name__}")
 
             # Validate
             if not isinstance(result.get("complete"), bool):
@@ -412,26 +738,44 @@ class Synthesizer:
         results: list[dict],
         time_context: str = "",
     ) -> list[dict]:
-        """Build the messages list for synthesis calls."""
-        findings = []
+        """
+        Build the messages list for synthesis calls.
+
+        The static system prompt and the original question lead, and the
+        per-run parts (time context, findings) trail in their own message, so
+        repeated syntheses of one question share a cacheable prompt prefix.
+        """
+        # An answer repeated across sub-questions or gap-loop iterations is
+        # sent once, under every question it answered, with its URLs merged.
+        merged: dict[str, dict] = {}
         for r in results:
             if r.get("source") == "deferred":
                 continue
-            entry = f"### Sub-question: {r['question']}\n{r.get('answer', '(no data)')}"
-            if r.get("sources"):
-                urls = ", ".join(s.get("url", "") for s in r["sources"] if s.get("url"))
-                if urls:
-                    entry += f"\nSources: {urls}"
+            answer = r.get("answer", "(no data)")
+            group = merged.setdefault(
+                " ".join(str(answer).split()),
+                {"questions": [], "answer": answer, "urls": {}},
+            )
+            if r["question"] not in group["questions"]:
+                group["questions"].append(r["question"])
+            for src in r.get("sources") or []:
+                if src.get("url"):
+                    group["urls"][src["url"]] = None
+
+        findings = []
+        for group in merged.values():
+            entry = f"### Sub-question: {' / '.join(group['questions'])}\n{group['answer']}"
+            if group["urls"]:
+                entry += f"\nSources: {', '.join(group['urls'])}"
             findings.append(entry)
 
-        user_msg = f"Original question: {original_query}\n\n"
-        if time_context:
-            user_msg += f"{time_context}\n\n"
-        user_msg += "Research findings:\n\n" + "\n\n".join(findings)
+        findings_msg = f"{time_context}\n\n" if time_context else ""
+        findings_msg += "Research findings:\n\n" + "\n\n".join(findings)
 
         return [
             {"role": "system", "content": _SYNTHESIS_SYSTEM},
-            {"role": "user", "content": user_msg},
+            {"role": "user", "content": f"Original question: {original_query}"},
+            {"role": "user", "content": findings_msg},
         ]
 
     async def synthesize(
@@ -487,6 +831,10 @@ async def run_iterative_research(
         None if the query is simple (caller should use existing single-search path).
         Otherwise: (synthesized_text, all_sources, metadata_dict)
     """
+    if not _needs_llm_analyzer(user_input):
+        logger.info("[RESEARCH] Simple query — bypassing research engine")
+        return None
+
     cfg = get_research_config()
 
     # Step 1: Analyze query
@@ -519,8 +867,25 @@ async def run_iterative_research(
         iterations_used = iteration
         logger.info(f"[RESEARCH] Iteration {iteration}/{cfg['max_iterations']}")
 
-        # Execute sub-questions
-        results = await executor.execute(current_plan)
+        detector = GapDetector()
+        gap_result: Optional[dict] = None
+
+        async def enough_evidence(partial: list[dict]) -> bool:
+            # Gap-check what is in so far; stragglers are cancelled if complete
+            nonlocal gap_result
+            gap_result = await detector.detect(
+                original_query=user_input,
+                plan=plan,
+                results=all_results + partial,
+            )
+            return gap_result["complete"]
+
+        # Execute sub-questions. Early gap checks only run on iterations that
+        # gap-check anyway, and cost one planner call per finished sub-question.
+        early_check = cfg["early_gap_check"] and iteration < cfg["max_iterations"]
+        results = await executor.execute(
+            current_plan, until=enough_evidence if early_check else None
+        )
         all_results.extend(results)
 
         # Collect sources
@@ -529,12 +894,12 @@ async def run_iterative_research(
 
         # Gap detection (skip on last iteration — we synthesize regardless)
         if iteration < cfg["max_iterations"]:
-            detector = GapDetector()
-            gap_result = await detector.detect(
-                original_query=user_input,
-                plan=plan,  # original plan for context
-                results=all_results,
-            )
+            if gap_result is None or not gap_result["complete"]:
+                gap_result = await detector.detect(
+                    original_query=user_input,
+                    plan=plan,  # original plan for context
+                    results=all_results,
+                )
 
             if gap_result["complete"]:
                 logger.info(f"[RESEARCH] Research complete after {iteration} iteration(s)")
@@ -608,15 +973,34 @@ async def run_iterative_research_streaming(
     Yields nothing (returns immediately) if the query is simple,
     signalling the caller to fall through to single-search.
     """
+    if not _needs_llm_analyzer(user_input):
+        logger.info("[RESEARCH STREAM] Simple query — bypassing research engine")
+        return  # no yields = caller falls through
+
     cfg = get_research_config()
 
     # ── Phase 1: Analyze query ──────────────────────────────────────
     yield _status("Analyzing query")
 
-    analyzer = QueryAnalyzer()
-    plan = await analyzer.analyze(user_input, time_context=time_context)
+    executor = ResearchExecutor(
+        model=model,
+        message_list=message_list,
+        preferred_urls=preferred_urls,
+        user_timezone=user_timezone,
+        user_time=user_time,
+    )
 
-    if not plan["needs_decomposition"]:
+    # Each sub-question starts researching as soon as the planner has written
+    # it, overlapping execution with the rest of the plan's generation.
+    analyzer = QueryAnalyzer()
+    plan: dict[str, Any] = {"needs_decomposition": True, "sub_questions": []}
+    pending: dict[asyncio.Task, dict] = {}
+    async for sq in analyzer.analyze_streaming(user_input, time_context=time_context):
+        plan["sub_questions"].append(sq)
+        pending[asyncio.create_task(executor._execute_one(sq))] = sq
+        yield _status("Researching", sq["question"][:40])
+
+    if not pending:
         logger.info("[RESEARCH STREAM] Simple query — bypassing research engine")
         return  # no yields = caller falls through
 
@@ -625,14 +1009,6 @@ async def run_iterative_research_streaming(
     logger.info(f"[RESEARCH STREAM] Decomposed into {num_subs} sub-questions")
 
     # ── Phase 2-3: Execute + gap detection loop ─────────────────────
-    executor = ResearchExecutor(
-        model=model,
-        message_list=message_list,
-        preferred_urls=preferred_urls,
-        user_timezone=user_timezone,
-        user_time=user_time,
-    )
-
     all_results: list[dict] = []
     all_sources: list[dict] = []
     current_plan = plan
@@ -640,43 +1016,38 @@ async def run_iterative_research_streaming(
     for iteration in range(1, cfg["max_iterations"] + 1):
         logger.info(f"[RESEARCH STREAM] Iteration {iteration}/{cfg['max_iterations']}")
 
-        subs = current_plan.get("sub_questions", [])
-        if subs:
-            # Launch all sub-questions in parallel
-            pending: dict[asyncio.Task, dict] = {}
+        label = "Researching"
+        if iteration > 1:
+            # Launch all follow-ups in parallel
+            subs = current_plan.get("sub_questions", [])
             for sq in subs:
                 task = asyncio.create_task(executor._execute_one(sq))
                 pending[task] = sq
 
-            label = "Researching" if iteration == 1 else "Follow-up research"
-            preview = "; ".join(sq["question"][:40] for sq in subs[:3])
-            if len(subs) > 3:
-                preview += f" (+{len(subs) - 3} more)"
-            yield _status(label, preview)
-
-            # Yield status as each completes
-            while pending:
-                done, _ = await asyncio.wait(
-                    pending.keys(), return_when=asyncio.FIRST_COMPLETED
-                )
-                for task in done:
-                    sq = pending.pop(task)
-                    question = sq["question"]
-                    truncated = question[:80] + "..." if len(question) > 80 else question
-                    try:
-                        result = task.result()
-                        all_results.append(result)
-                        all_sources.extend(result.get("sources", []))
-                        yield _status(label, f"Done: {truncated}")
-                    except Exception as exc:
-                        logger.warning(f"[RESEARCH STREAM] Sub-question failed: {exc}")
-                        all_results.append({
-                            "question": question,
-                            "type": sq.get("type", "qualitative"),
-                            "answer": f"(research failed: {exc})",
-                            "sources": [],
-                            "source": "error",
-                        })
+            label = "Follow-up research"
+            if subs:
+                preview = "; ".join(sq["question"][:40] for sq in subs[:3])
+                if len(subs) > 3:
+                    preview += f" (+{len(subs) - 3} more)"
+                yield _status(label, preview)
+
+        # Yield status as each completes
+        while pending:
+            done, _ = await asyncio.wait(
+                pending.keys(), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                sq = pending.pop(task)
+                question = sq["question"]
+                truncated = question[:80] + "..." if len(question) > 80 else question
+                try:
+                    result = task.result()
+                    all_results.append(result)
+                    all_sources.extend(result.get("sources", []))
+                    yield _status(label, f"Done: {truncated}")
+                except Exception as exc:
+                    logger.warning(f"[RESEARCH STREAM] Sub-question failed: {exc}")
+                    all_results.append(executor._failed_result(sq, exc))
 
         # Gap detection (skip on last iteration)
         if iteration < cfg["max_iterations"]:
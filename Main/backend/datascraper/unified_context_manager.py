@@ -7,7 +7,8 @@ NO compression, NO legacy support - pure session-based context tracking.
 
 import logging
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Literal
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Literal
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 
@@ -153,6 +154,19 @@ class UnifiedContextManager:
         """Write session back to cache."""
         cache.set(self._cache_key(session_id), session, self.session_ttl)
 
+    def _count_key(self, session_id: str, source_type: str) -> str:
+        return f"{CACHE_KEY_PREFIX}{session_id}:fetched_count:{source_type}"
+
+    def _save_fetched_counts(self, session_id: str, session: Dict[str, Any], source_types) -> None:
+        """Store the item count of each source type beside the session."""
+        cache.set_many(
+            {
+                self._count_key(session_id, source_type): len(session["fetched_context"][source_type])
+                for source_type in source_types
+            },
+            self.session_ttl,
+        )
+
     def _get_default_system_prompt(self) -> str:
         # Identity and rules live in prompts/core.md (loaded by PromptBuilder).
         # UCM only stores session-level overrides set via set_system_prompt().
@@ -263,9 +277,42 @@ class UnifiedContextManager:
         session["fetched_context"][source_type].append(context_item)
         session["metadata"].token_count += self._estimate_tokens(content)
         self._save_session(session_id, session)
+        self._save_fetched_counts(session_id, session, (source_type,))
 
         logger.debug(f"Added {source_type} context to session {session_id}")
 
+    def add_fetched_context_bulk(
+        self,
+        session_id: str,
+        items: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Add several fetched context items with a single cache load/save.
+        Each item takes the same keys as add_fetched_context()
+        (source_type, content, url, extracted_data).
+        """
+        if not items:
+            return
+
+        session = self._load_session(session_id)
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        for item in items:
+            context_item = FetchedContextItem(
+                source_type=item["source_type"],
+                content=item["content"],
+                url=item.get("url"),
+                timestamp=timestamp,
+                extracted_data=item.get("extracted_data")
+            )
+            session["fetched_context"][context_item.source_type].append(context_item)
+            session["metadata"].token_count += self._estimate_tokens(context_item.content)
+
+        self._save_session(session_id, session)
+        self._save_fetched_counts(session_id, session, {item["source_type"] for item in items})
+
+        logger.debug(f"Added {len(items)} fetched context items to session {session_id}")
+
     def get_full_context(self, session_id: str) -> Dict[str, Any]:
         """Get the full context in elegant JSON structure."""
         session = self._load_session(session_id)
@@ -283,6 +330,24 @@ class UnifiedContextManager:
             ]
         }
 
+    def get_fetched_count(self, session_id: str, source_type: str) -> int:
+        """
+        Number of fetched context items of one source type.
+        Reads the counter kept beside the session instead of loading it.
+        """
+        count = cache.get(self._count_key(session_id, source_type))
+        if count is None:
+            # Counter expired before the session, or the session predates it
+            count = len(self._load_session(session_id)["fetched_context"].get(source_type, []))
+        return count
+
+    def get_context_view(self, session_id: str) -> Mapping[str, Any]:
+        """
+        Read-only view of the raw session (dataclass objects, no to_dict()).
+        Cheaper than get_full_context() when only a few fields are needed.
+        """
+        return MappingProxyType(self._load_session(session_id))
+
     def get_formatted_messages_for_api(self, session_id: str) -> List[Dict[str, str]]:
         """
         Get messages formatted for datascraper.py compatibility.
@@ -320,16 +385,11 @@ class UnifiedContextManager:
 
         system_content = "\n\n".join(parts)
         if system_content:
-            messages.append({"content": f"[SYSTEM MESSAGE]: {system_content}"})
+            messages.append({"role": "system", "content": system_content})
 
         for msg in context["conversation_history"]:
-            role = msg["role"]
-            content = msg["content"]
-
-            if role == "user":
-                messages.append({"content": f"[USER MESSAGE]: {content}"})
-            elif role == "assistant":
-                messages.append({"content": f"[ASSISTANT MESSAGE]: {content}"})
+            if msg["role"] in ("user", "assistant"):
+                messages.append({"role": msg["role"], "content": msg["content"]})
 
         return messages
 
@@ -362,6 +422,10 @@ class UnifiedContextManager:
                 session["fetched_context"][key] = []
 
         self._save_session(session_id, session)
+        self._save_fetched_counts(
+            session_id, session,
+            [source_type] if source_type in session["fetched_context"] else session["fetched_context"],
+        )
 
     def clear_conversation_history(self, session_id: str) -> None:
         """Clear conversation history for a session"""
@@ -408,7 +472,11 @@ class UnifiedContextManager:
 
     def clear_session(self, session_id: str) -> None:
         """Delete a session entirely from cache"""
-        cache.delete(self._cache_key(session_id))
+        cache.delete_many([
+            self._cache_key(session_id),
+            self._count_key(session_id, "web_search"),
+            self._count_key(session_id, "js_scraping"),
+        ])
         logger.debug(f"Deleted session: {session_id}")
 
 
@@ -41,8 +41,8 @@ def post_request(worker, req, environ, resp):
     middleware because it fires even on middleware errors.
     """
     try:
-        import psutil
-        rss_mb = psutil.Process().memory_info().rss / 1024 / 1024
+        from api.utils.resource_monitor import rss_mb as current_rss_mb
+        rss_mb = current_rss_mb()
         from api.utils.leak_detector import get_worker_detector
         detector = get_worker_detector()
         result = detector.record(rss_mb=rss_mb)
@@ -1,7 +1,7 @@
 
 import os
 import json as _json
-from typing import Optional, List
+from typing import Optional, List, Sequence
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel
@@ -64,7 +64,7 @@ async def create_fin_agent(model: str = "gpt-4o-mini",
                           user_input: Optional[str] = None,
                           user_timezone: Optional[str] = None,
                           user_time: Optional[str] = None,
-                          allowed_tools: Optional[List[str]] = None,
+                          allowed_tools: Optional[Sequence[str]] = None,
                           instructions_override: Optional[str] = None):
     """
     Create a financial agent with tools (URL scraping, SEC-EDGAR, filesystem).
@@ -77,7 +77,7 @@ async def create_fin_agent(model: str = "gpt-4o-mini",
         user_timezone: User's IANA timezone (e.g., "America/New_York")
         user_time: User's current time in ISO format
         allowed_tools: If provided, only these tool names are included.
-                       None means all tools; [] means no tools.
+                       None means all tools; an empty sequence means no tools.
         instructions_override: If provided, skip PromptBuilder and use this
                                string as the agent's system instructions.
 
@@ -1,17 +1,70 @@
 """TTL cache for Yahoo Finance data."""
 
 import threading
-from datetime import datetime, timedelta
+import time
+from itertools import islice
+from datetime import timedelta
 from typing import Any, Optional
 
+from cachetools import TTLCache
+
+# Below this size eviction is plain LRU
+_SCORED_EVICTION_MIN_ENTRIES = 10
+
+
+class _HitWeightedTTLCache(TTLCache):
+    """TTLCache whose overflow eviction also weighs how often keys were read.
+
+    Once the cache holds more than _SCORED_EVICTION_MIN_ENTRIES, the victim
+    is the least-read key among the oldest tenth (by last write), so a
+    burst of one-off symbols does not push out a ticker that keeps being
+    asked for. Ties go to the oldest key.
+    """
+
+    def __init__(self, maxsize, ttl, timer=time.monotonic):
+        super().__init__(maxsize, ttl, timer=timer)
+        self._hits: dict[Any, int] = {}
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self._hits[key] = self._hits.get(key, 0) + 1
+        return value
+
+    def __delitem__(self, key):
+        self._hits.pop(key, None)
+        super().__delitem__(key)
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for key, _ in expired:
+            self._hits.pop(key, None)
+        return expired
+
+    def popitem(self):
+        self.expire()
+        if len(self) <= _SCORED_EVICTION_MIN_ENTRIES:
+            return super().popitem()
+        window = islice(self, max(1, len(self) // 10))
+        key = min(window, key=lambda k: self._hits.get(k, 0))
+        return key, self.pop(key)
+
+    def clear(self):
+        super().clear()
+        self._hits.clear()
+
 
 class TimedCache:
     """Thread-safe TTL cache with max-size eviction for yfinance Ticker objects.
 
     Eviction strategy:
-    1. Expired entries are removed on every get() and set().
-    2. If the cache exceeds max_entries after inserting, the oldest
-       entries (by insertion time) are evicted until within bounds.
+    1. Expired entries are never returned by get() and are removed on
+       every set().
+    2. If the cache exceeds max_entries after inserting, entries are
+       evicted until within bounds: least recently used for small caches,
+       least read among the oldest tenth for larger ones.
+
+    The bookkeeping is cachetools.TTLCache on the time.monotonic() clock;
+    this class adds the lock and the get()/set() interface the handlers use.
     """
 
     def __init__(self, ttl_seconds: int = 300, max_entries: int = 50):
@@ -23,27 +76,9 @@ class TimedCache:
         """
         self.ttl = timedelta(seconds=ttl_seconds)
         self.max_entries = max_entries
-        self._cache: dict[str, tuple[Any, datetime]] = {}
+        self._cache = _HitWeightedTTLCache(max_entries, ttl_seconds, timer=time.monotonic)
         self._lock = threading.Lock()
 
-    def _evict_expired(self, now: datetime) -> int:
-        """Remove expired entries. Returns count evicted. Caller must hold lock."""
-        expired = [k for k, (_, ts) in self._cache.items() if now - ts >= self.ttl]
-        for k in expired:
-            del self._cache[k]
-        return len(expired)
-
-    def _evict_oldest(self) -> int:
-        """Remove oldest entries until at max_entries. Caller must hold lock."""
-        if len(self._cache) <= self.max_entries:
-            return 0
-        # Sort by timestamp (oldest first) and remove excess
-        sorted_keys = sorted(self._cache, key=lambda k: self._cache[k][1])
-        to_remove = len(self._cache) - self.max_entries
-        for k in sorted_keys[:to_remove]:
-            del self._cache[k]
-        return to_remove
-
     def get(self, key: str) -> Optional[Any]:
         """Get cached value if not expired.
 
@@ -54,29 +89,20 @@ class TimedCache:
             Cached value if exists and not expired, None otherwise
         """
         with self._lock:
-            if key in self._cache:
-                value, timestamp = self._cache[key]
-                if datetime.now() - timestamp < self.ttl:
-                    return value
-                # Expired, remove it
-                del self._cache[key]
-        return None
+            return self._cache.get(key)
 
     def set(self, key: str, value: Any) -> None:
-        """Cache value with current timestamp.
+        """Cache value until ttl_seconds from now.
 
         Evicts expired entries first, then enforces max_entries via
-        oldest-first eviction if the cache is still over capacity.
+        least-recently-used eviction if the cache is still over capacity.
 
         Args:
             key: Cache key
             value: Value to cache
         """
-        now = datetime.now()
         with self._lock:
-            self._evict_expired(now)
-            self._cache[key] = (value, now)
-            self._evict_oldest()
+            self._cache[key] = value
 
     def clear(self) -> None:
         """Clear all cached values."""
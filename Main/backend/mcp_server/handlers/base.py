@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from typing import Any, List
 
 import mcp.types as types
+import numpy as np
+import pandas as pd
 
 
 @dataclass
@@ -40,3 +42,31 @@ class ToolHandler(ABC):
             List of TextContent responses
         """
         pass
+
+
+def frame_to_json_dict(df: pd.DataFrame) -> dict:
+    """Column-oriented dict of an already-labelled frame, missing values as None.
+
+    Floats keep full float64 precision (to_json caps at 15 significant
+    digits); other values are left as to_dict() returns them for
+    json.dumps(default=str). Duplicate labels keep to_dict()'s last-wins
+    behaviour.
+    """
+    index = df.index.tolist()
+    # yfinance statements are all-float64 in practice: pull the block out as
+    # one array and map NaN -> None in a single vectorized pass.
+    if (df.dtypes == np.float64).all():
+        values = df.to_numpy()
+        cells = np.where(np.isnan(values), None, values).T.tolist()
+        return {col: dict(zip(index, cell_col)) for col, cell_col in zip(df.columns.tolist(), cells)}
+
+    result = {}
+    for position, label in enumerate(df.columns):
+        column = df.iloc[:, position]
+        if column.dtype.kind == "f":
+            values = column.to_numpy()
+            cells = np.where(np.isnan(values), None, values).tolist()
+        else:
+            cells = column.astype(object).where(column.notna(), None).tolist()
+        result[label] = dict(zip(index, cells))
+    return result
@@ -8,7 +8,7 @@ from typing import List
 import mcp.types as types
 import pandas as pd
 
-from mcp_server.handlers.base import ToolHandler, ToolContext
+from mcp_server.handlers.base import ToolHandler, ToolContext, frame_to_json_dict
 from mcp_server.handlers.stock_info import get_ticker
 from mcp_server.executor import run_in_executor
 
@@ -16,18 +16,29 @@ from mcp_server.executor import run_in_executor
 logger = logging.getLogger(__name__)
 
 
+def _labels_to_str(labels: pd.Index) -> list:
+    """Stringify index/column labels in one vectorized pass.
+
+    Date-only DatetimeIndexes go through strftime; anything carrying a time
+    of day (e.g. earnings_dates) keeps astype(str) so the time and tz survive.
+    """
+    if isinstance(labels, pd.DatetimeIndex) and labels.equals(labels.normalize()):
+        return labels.strftime("%Y-%m-%d").tolist()
+    return labels.astype(str).tolist()
+
+
 def _safe_df_to_dict(df) -> dict:
     """Convert a DataFrame to dict, handling None, empty, and Timestamp key cases."""
-    if df is None or (isinstance(df, pd.DataFrame) and df.empty):
+    # Cheap cases first: yfinance returns plain dicts (calendar) or nothing
+    # for a lot of tickers, and neither needs any pandas work.
+    if df is None:
         return {}
-    if isinstance(df, pd.DataFrame):
-        df = df.copy()
-        df.index = df.index.astype(str)
-        df.columns = df.columns.astype(str)
-        return df.to_dict()
     if isinstance(df, dict):
         return df
-    return {}
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return {}
+    labelled = df.set_axis(_labels_to_str(df.index), axis=0).set_axis(_labels_to_str(df.columns), axis=1)
+    return frame_to_json_dict(labelled)
 
 
 class GetEarningsInfoHandler(ToolHandler):
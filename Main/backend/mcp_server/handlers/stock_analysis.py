@@ -1,38 +1,105 @@
 """Handler for get_stock_analysis tool."""
 
 import asyncio
+import datetime
 import json
 import logging
 from typing import List
 
 import mcp.types as types
+import numpy as np
 
 from mcp_server.handlers.base import ToolHandler, ToolContext
 from mcp_server.handlers.stock_info import get_ticker
 from mcp_server.executor import run_in_executor
+from mcp_server.cache import TimedCache
 
 
+def _default(obj):
+    """Render numpy scalars and arrays as JSON numbers, anything else as text."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
+
+def _json_key(key):
+    """A dict key as orjson's OPT_NON_STR_KEYS would write it."""
+    if key is None or isinstance(key, (str, int, float)):
+        return key
+    if isinstance(key, (datetime.date, datetime.time)):
+        return key.isoformat()
+    return str(key)
+
+
+def _with_json_keys(data):
+    """Copy dicts nested in data with every key made serializable."""
+    if isinstance(data, dict):
+        return {_json_key(k): _with_json_keys(v) for k, v in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_with_json_keys(v) for v in data]
+    return data
+
+
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = (
+        orjson.OPT_INDENT_2
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_NON_STR_KEYS
+    )
+
+    def _dumps(data) -> str:
+        # Datetime values are handed to _default, matching the json fallback's text
+        try:
+            return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS).decode()
+        except orjson.JSONEncodeError:
+            # Keys OPT_NON_STR_KEYS rejects, such as pandas Timestamps
+            return orjson.dumps(_with_json_keys(data), default=_default, option=_ORJSON_OPTIONS).decode()
+except ImportError:
+    def _dumps(data) -> str:
+        return json.dumps(_with_json_keys(data), indent=2, default=_default)
+
 logger = logging.getLogger(__name__)
 
 
 class GetStockAnalysisHandler(ToolHandler):
     """Handler for get_stock_analysis tool."""
 
+    def __init__(self, cache_ttl_seconds: int = 60):
+        """Initialize handler with cache.
+
+        Args:
+            cache_ttl_seconds: Cache TTL in seconds (default: 1 minute)
+        """
+        # Serialized analysis per ticker; analyst data rarely changes within a minute
+        self._cache = TimedCache(ttl_seconds=cache_ttl_seconds, max_entries=32)
+
     @staticmethod
     def _safe_dict(df):
         """Convert DataFrame/dict to a JSON-safe dict.
 
         Stringifies index and column labels so pd.Timestamp keys
         don't crash json.dumps (which only applies default= to values, not keys).
+        Datetime and timedelta columns are stringified too, so a frame's dict
+        holds only str keys and JSON scalar values.
         """
         if df is None:
             return {}
         if hasattr(df, 'empty') and df.empty:
             return {}
         if hasattr(df, 'to_dict'):
-            df = df.copy()
+            # Relabelling a shallow copy leaves the caller's frame alone without
+            # duplicating its data
+            df = df.copy(deep=False)
             df.index = df.index.astype(str)
             df.columns = df.columns.astype(str)
+            # str() per value, as default=str would render them
+            for col in df.select_dtypes(include=["datetime", "datetimetz", "timedelta"]).columns:
+                df[col] = df[col].map(str)
             return df.to_dict()
         if isinstance(df, dict):
             return df
@@ -47,6 +114,11 @@ class GetStockAnalysisHandler(ToolHandler):
         Returns:
             List containing analyst recommendations and estimates as JSON
         """
+        cached = self._cache.get(ctx.ticker)
+        if cached:
+            logger.debug(f"Cache hit for get_stock_analysis:{ctx.ticker}")
+            return [types.TextContent(type="text", text=cached)]
+
         stock = await get_ticker(ctx.ticker)
 
         # Get all analysis data in parallel
@@ -64,7 +136,10 @@ class GetStockAnalysisHandler(ToolHandler):
             "analyst_price_targets": self._safe_dict(price_targets),
         }
 
+        result_json = _dumps(analysis)
+        self._cache.set(ctx.ticker, result_json)
+
         return [types.TextContent(
             type="text",
-            text=json.dumps(analysis, indent=2, default=str)
+            text=result_json
         )]
@@ -6,8 +6,9 @@ import logging
 from typing import List
 
 import mcp.types as types
+import pandas as pd
 
-from mcp_server.handlers.base import ToolHandler, ToolContext
+from mcp_server.handlers.base import ToolHandler, ToolContext, frame_to_json_dict
 from mcp_server.handlers.stock_info import get_ticker
 from mcp_server.executor import run_in_executor
 
@@ -17,12 +18,16 @@ logger = logging.getLogger(__name__)
 
 def _safe_financials_to_dict(df) -> dict:
     """Convert financial DataFrame to dict, stringifying Timestamp index/columns."""
-    if df is None or df.empty:
+    if not isinstance(df, pd.DataFrame) or df.empty:
         return {}
-    df = df.copy()
-    df.index = df.index.astype(str)
-    df.columns = df.columns.astype(str)
-    return df.to_dict()
+    # Statement columns are fiscal period-end dates; format them in one
+    # strftime call instead of copying the frame and re-labelling it.
+    if isinstance(df.columns, pd.DatetimeIndex) and df.columns.equals(df.columns.normalize()):
+        columns = df.columns.strftime("%Y-%m-%d")
+    else:
+        columns = df.columns.astype(str)
+    index = df.index.astype(str)
+    return frame_to_json_dict(df.set_axis(index, axis=0).set_axis(columns, axis=1))
 
 
 class GetStockFinancialsHandler(ToolHandler):
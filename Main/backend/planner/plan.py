@@ -1,11 +1,32 @@
-from dataclasses import dataclass, field
-from typing import Optional, List
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class ExecutionPlan:
     """Structured execution plan output by the Planner."""
     skill_name: str
-    tools_allowed: Optional[List[str]] = None      # None = all tools (fallback)
+    tools_allowed: Optional[Tuple[str, ...]] = None  # None = all tools (fallback)
     max_turns: int = 10
     instructions: Optional[str] = None             # If set, replaces PromptBuilder output
+
+
+@lru_cache(maxsize=64)
+def get_plan(
+    skill_name: str,
+    tools_allowed: Optional[Tuple[str, ...]] = None,
+    max_turns: int = 10,
+) -> ExecutionPlan:
+    """
+    Shared plan for a skill with no per-request instructions.
+
+    Plans are read-only, so every request routed to the same skill can use
+    one instance. Plans with instructions embed page content and are built
+    directly instead.
+    """
+    return ExecutionPlan(
+        skill_name=skill_name,
+        tools_allowed=tools_allowed,
+        max_turns=max_turns,
+    )
@@ -1,6 +1,6 @@
 import logging
 from typing import Optional
-from .plan import ExecutionPlan
+from .plan import ExecutionPlan, get_plan
 from .skills.registry import SkillRegistry
 
 logger = logging.getLogger(__name__)
@@ -34,13 +34,17 @@ class Planner:
         )
 
         instructions = skill.build_instructions(pre_scraped_content=pre_scraped_content)
+        tools = tuple(skill.tools_allowed) if skill.tools_allowed is not None else None
 
-        plan = ExecutionPlan(
-            skill_name=skill.name,
-            tools_allowed=skill.tools_allowed,
-            max_turns=skill.max_turns,
-            instructions=instructions,
-        )
+        if instructions is None:
+            plan = get_plan(skill.name, tools, skill.max_turns)
+        else:
+            plan = ExecutionPlan(
+                skill_name=skill.name,
+                tools_allowed=tools,
+                max_turns=skill.max_turns,
+                instructions=instructions,
+            )
 
         logger.info(
             f"[Planner] plan={plan.skill_name} tools={len(plan.tools_allowed) if plan.tools_allowed is not None else 'ALL'} "
@@ -1,5 +1,76 @@
+import logging
+import re
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Iterable, Optional, List
+
+logger = logging.getLogger(__name__)
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Returning True from the match handler stops the scan; newer bindings raise on that.
+_HS_SCAN_TERMINATED = getattr(hyperscan, "ScanTerminated", ()) if HYPERSCAN_AVAILABLE else ()
+
+
+def compile_any(patterns: Iterable[str]) -> re.Pattern:
+    """
+    Fold keyword patterns into one case-insensitive alternation.
+
+    search() on the result matches exactly when any single pattern would,
+    but scans the query once instead of once per pattern.
+    """
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+def _build_hyperscan_db(patterns: list[str]):
+    """Compile patterns into a single block-mode Hyperscan database, or None."""
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    try:
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
+            expressions=[p.encode() for p in patterns],
+            ids=list(range(len(patterns))),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns),
+        )
+        return db
+    except Exception as e:
+        # Hyperscan rejects lookarounds and backreferences
+        logger.info(f"Hyperscan compile failed, falling back to re: {e}")
+        return None
+
+
+def _on_match(pattern_id, start, end, flags, context):
+    context.append(pattern_id)
+    return True
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive test for whether any of a skill's keyword patterns occurs.
+
+    Scans with one Hyperscan database when hyperscan is installed and can
+    compile the patterns, otherwise with the compile_any() alternation.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        patterns = list(patterns)
+        self._regex = compile_any(patterns)
+        self._db = _build_hyperscan_db(patterns)
+
+    def search(self, query: str) -> bool:
+        if self._db is not None:
+            hits: list[int] = []
+            try:
+                self._db.scan(query.encode("utf-8"), match_event_handler=_on_match, context=hits)
+            except _HS_SCAN_TERMINATED:
+                pass
+            return bool(hits)
+
+        return self._regex.search(query) is not None
 
 
 class BaseSkill(ABC):
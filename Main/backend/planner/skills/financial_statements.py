@@ -1,6 +1,5 @@
-import re
 from typing import Optional, List
-from .base import BaseSkill
+from .base import BaseSkill, KeywordMatcher
 
 _PATTERNS = [
     r"\brevenue\b",
@@ -19,7 +18,7 @@ _PATTERNS = [
     r"\b(next|upcoming|when).{0,15}earnings\b",
     r"\bgrowth (rate|estimate|projection)\b",
 ]
-_COMPILED = [re.compile(p, re.IGNORECASE) for p in _PATTERNS]
+_MATCHER = KeywordMatcher(_PATTERNS)
 
 
 class FinancialStatementsSkill(BaseSkill):
@@ -36,7 +35,6 @@ class FinancialStatementsSkill(BaseSkill):
         return 5
 
     def matches(self, query: str, *, has_prescraped: bool, domain: str | None) -> float:
-        for p in _COMPILED:
-            if p.search(query):
-                return 0.8
+        if _MATCHER.search(query):
+            return 0.8
         return 0.0
@@ -1,6 +1,5 @@
-import re
 from typing import Optional, List
-from .base import BaseSkill
+from .base import BaseSkill, KeywordMatcher
 
 _PATTERNS = [
     r"\boptions?\b.*(volume|chain|flow|data|activity|summary)",
@@ -12,7 +11,7 @@ _PATTERNS = [
     r"\boptions? (for|on|of)\b",
     r"\b(total|aggregate) (options?|puts?|calls?) (volume|oi)\b",
 ]
-_COMPILED = [re.compile(p, re.IGNORECASE) for p in _PATTERNS]
+_MATCHER = KeywordMatcher(_PATTERNS)
 
 
 class OptionsAnalysisSkill(BaseSkill):
@@ -29,7 +28,6 @@ class OptionsAnalysisSkill(BaseSkill):
         return 5
 
     def matches(self, query: str, *, has_prescraped: bool, domain: str | None) -> float:
-        for p in _COMPILED:
-            if p.search(query):
-                return 0.8
+        if _MATCHER.search(query):
+            return 0.8
         return 0.0
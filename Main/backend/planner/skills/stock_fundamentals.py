@@ -1,6 +1,5 @@
-import re
 from typing import Optional, List
-from .base import BaseSkill
+from .base import BaseSkill, KeywordMatcher
 
 _PATTERNS = [
     r"\b(stock|share) price\b",
@@ -22,7 +21,7 @@ _PATTERNS = [
     r"\bpre[- ]?market\b",
     r"\bafter[- ]?hours?\b",
 ]
-_COMPILED = [re.compile(p, re.IGNORECASE) for p in _PATTERNS]
+_MATCHER = KeywordMatcher(_PATTERNS)
 
 
 class StockFundamentalsSkill(BaseSkill):
@@ -39,7 +38,6 @@ class StockFundamentalsSkill(BaseSkill):
         return 5
 
     def matches(self, query: str, *, has_prescraped: bool, domain: str | None) -> float:
-        for p in _COMPILED:
-            if p.search(query):
-                return 0.8
+        if _MATCHER.search(query):
+            return 0.8
         return 0.0
@@ -1,6 +1,5 @@
-import re
 from typing import Optional, List
-from .base import BaseSkill
+from .base import BaseSkill, KeywordMatcher
 
 _SUMMARIZE_PATTERNS = [
     r"\bsummar",
@@ -27,8 +26,8 @@ _DATA_PATTERNS = [
     r"\btechnical (analysis|indicators?)\b",
 ]
 
-_COMPILED_SUMMARIZE = [re.compile(p, re.IGNORECASE) for p in _SUMMARIZE_PATTERNS]
-_COMPILED_DATA = [re.compile(p, re.IGNORECASE) for p in _DATA_PATTERNS]
+_SUMMARIZE_MATCHER = KeywordMatcher(_SUMMARIZE_PATTERNS)
+_DATA_MATCHER = KeywordMatcher(_DATA_PATTERNS)
 
 
 class SummarizePageSkill(BaseSkill):
@@ -50,13 +49,11 @@ class SummarizePageSkill(BaseSkill):
         if not has_prescraped:
             return 0.0
 
-        for pattern in _COMPILED_DATA:
-            if pattern.search(query):
-                return 0.0
+        if _DATA_MATCHER.search(query):
+            return 0.0
 
-        for pattern in _COMPILED_SUMMARIZE:
-            if pattern.search(query):
-                return 0.9
+        if _SUMMARIZE_MATCHER.search(query):
+            return 0.9
 
         words = query.split()
         if len(words) <= 6 and has_prescraped:
@@ -1,6 +1,5 @@
-import re
 from typing import Optional, List
-from .base import BaseSkill
+from .base import BaseSkill, KeywordMatcher
 
 _PATTERNS = [
     r"\bRSI\b",
@@ -18,7 +17,7 @@ _PATTERNS = [
     r"\bcandle pattern\b",
     r"\b(top |biggest )?(gainers?|losers?)\b",
 ]
-_COMPILED = [re.compile(p, re.IGNORECASE) for p in _PATTERNS]
+_MATCHER = KeywordMatcher(_PATTERNS)
 
 
 class TechnicalAnalysisSkill(BaseSkill):
@@ -44,7 +43,6 @@ class TechnicalAnalysisSkill(BaseSkill):
         return 5
 
     def matches(self, query: str, *, has_prescraped: bool, domain: str | None) -> float:
-        for p in _COMPILED:
-            if p.search(query):
-                return 0.8
+        if _MATCHER.search(query):
+            return 0.8
         return 0.0
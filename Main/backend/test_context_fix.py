@@ -2,6 +2,20 @@
 Test script to verify the context duplication fix
 """
 
+def _build_prompt(messages):
+    """Render role/content messages the way datascraper builds the agent prompt"""
+    context = ""
+    for msg in messages:
+        role, content = msg["role"], msg["content"]
+        if role == "system":
+            continue
+        elif role == "assistant":
+            context += f"Assistant: {content}\n"
+        else:
+            context += f"User: {content}\n"
+    return context.rstrip()
+
+
 def test_single_turn():
     """Test single-turn conversation"""
     print("=" * 80)
@@ -9,23 +23,11 @@ def test_single_turn():
     print("=" * 80)
 
     messages = [
-        {"content": "[SYSTEM MESSAGE]: You are FinGPT..."},
-        {"content": "[USER MESSAGE]: analyze btc on all indicators"}
+        {"role": "system", "content": "You are FinGPT..."},
+        {"role": "user", "content": "analyze btc on all indicators"}
     ]
 
-    context = ""
-    for msg in messages:
-        content = msg.get("content", "")
-        if content.startswith("[SYSTEM MESSAGE]:"):
-            continue
-        elif content.startswith("[USER MESSAGE]:"):
-            actual_content = content.replace("[USER MESSAGE]: ", "", 1)
-            context += f"User: {actual_content}\n"
-        elif content.startswith("[ASSISTANT MESSAGE]:"):
-            actual_content = content.replace("[ASSISTANT MESSAGE]: ", "", 1)
-            context += f"Assistant: {actual_content}\n"
-
-    full_prompt = context.rstrip()
+    full_prompt = _build_prompt(messages)
     print("Prompt sent to agent:")
     print(repr(full_prompt))
     print()
@@ -44,25 +46,13 @@ def test_multi_turn():
     print("=" * 80)
 
     messages = [
-        {"content": "[SYSTEM MESSAGE]: You are FinGPT..."},
-        {"content": "[USER MESSAGE]: analyze btc on all indicators"},
-        {"content": "[ASSISTANT MESSAGE]: Sure, which exchange and timeframe?"},
-        {"content": "[USER MESSAGE]: binance 1 day"}
+        {"role": "system", "content": "You are FinGPT..."},
+        {"role": "user", "content": "analyze btc on all indicators"},
+        {"role": "assistant", "content": "Sure, which exchange and timeframe?"},
+        {"role": "user", "content": "binance 1 day"}
     ]
 
-    context = ""
-    for msg in messages:
-        content = msg.get("content", "")
-        if content.startswith("[SYSTEM MESSAGE]:"):
-            continue
-        elif content.startswith("[USER MESSAGE]:"):
-            actual_content = content.replace("[USER MESSAGE]: ", "", 1)
-            context += f"User: {actual_content}\n"
-        elif content.startswith("[ASSISTANT MESSAGE]:"):
-            actual_content = content.replace("[ASSISTANT MESSAGE]: ", "", 1)
-            context += f"Assistant: {actual_content}\n"
-
-    full_prompt = context.rstrip()
+    full_prompt = _build_prompt(messages)
     print("Prompt sent to agent:")
     print(full_prompt)
     print()
@@ -96,25 +86,13 @@ def test_user_only_messages():
 
     # This was the failing scenario: user sends "binance 1 day" after "analyze btc"
     messages = [
-        {"content": "[SYSTEM MESSAGE]: You are FinGPT..."},
-        {"content": "[USER MESSAGE]: analyze btc on all indicators"},
-        {"content": "[ASSISTANT MESSAGE]: Sure, which exchange and timeframe?"},
-        {"content": "[USER MESSAGE]: binance 1 day"}  # Just parameters
+        {"role": "system", "content": "You are FinGPT..."},
+        {"role": "user", "content": "analyze btc on all indicators"},
+        {"role": "assistant", "content": "Sure, which exchange and timeframe?"},
+        {"role": "user", "content": "binance 1 day"}  # Just parameters
     ]
 
-    context = ""
-    for msg in messages:
-        content = msg.get("content", "")
-        if content.startswith("[SYSTEM MESSAGE]:"):
-            continue
-        elif content.startswith("[USER MESSAGE]:"):
-            actual_content = content.replace("[USER MESSAGE]: ", "", 1)
-            context += f"User: {actual_content}\n"
-        elif content.startswith("[ASSISTANT MESSAGE]:"):
-            actual_content = content.replace("[ASSISTANT MESSAGE]: ", "", 1)
-            context += f"Assistant: {actual_content}\n"
-
-    full_prompt = context.rstrip()
+    full_prompt = _build_prompt(messages)
     print("Full conversation sent to agent:")
     print(full_prompt)
     print()
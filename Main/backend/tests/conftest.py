@@ -0,0 +1,171 @@
+"""Shared pytest setup for the backend test suite."""
+import importlib.util
+import os
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Test modules import Django views at module level, so settings must be
+# resolvable before collection starts. django.setup() is deliberately not
+# called: mcp_client's AppConfig.ready() would spawn a thread that connects
+# to every configured MCP server.
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_config.settings")
+
+# Heavy third-party packages some handler modules import at module level.
+# Stub them only when they're genuinely missing: a stub installed over a real
+# package would leak into every other test module in the session.
+_OPTIONAL_STUBS = ("yfinance", "mcp", "mcp.types", "mcp.server")
+
+
+def _is_missing(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is None
+    except (ImportError, ValueError):
+        return True
+
+
+def pytest_configure(config):
+    for name in _OPTIONAL_STUBS:
+        if name not in sys.modules and _is_missing(name):
+            sys.modules[name] = MagicMock()
+
+
+def pytest_collection_modifyitems(config, items):
+    # importlib import mode happily collects two test modules with the same
+    # basename, so a copied file would silently run its tests twice.
+    seen = {}
+    for path in {item.path for item in items}:
+        if path.name in seen and seen[path.name] != path:
+            raise pytest.UsageError(
+                f"duplicate test module name: {seen[path.name]} and {path}"
+            )
+        seen[path.name] = path
+
+
+@pytest.fixture(scope="session")
+def core_prompt() -> str:
+    """Contents of prompts/core.md, read once per session."""
+    return (BACKEND_DIR / "prompts" / "core.md").read_text(encoding="utf-8")
+
+
+class _FakeStream:
+    """Async iterator over streamed chat chunks, closable like openai's AsyncStream."""
+
+    def __init__(self, tokens):
+        self._chunks = iter(
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=t))])
+            for t in tokens
+        )
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+    async def close(self):
+        self.closed = True
+
+
+def _make_completion(content):
+    """Chat Completions response carrying ``content``; dicts are JSON-encoded."""
+    if not isinstance(content, str):
+        content = json.dumps(content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeLLM:
+    """
+    Scripted replacements for the research engine's model and search calls.
+
+    Keys map onto the patched entry points: ``planner``, ``synthesis``,
+    ``synthesis_stream``, ``mcp`` and ``web``; the streamed planner replays
+    the ``planner`` script. Calling a key that was never scripted fails the
+    test instead of reaching the network.
+    """
+
+    _TARGETS = {
+        "planner": "_call_planner",
+        "synthesis": "_call_synthesis",
+        "planner_stream": "_call_planner_streaming",
+        "synthesis_stream": "_call_synthesis_streaming",
+        "mcp": "_try_mcp_search",
+        "web": "_web_search",
+    }
+    # Responses for these keys are given as content and wrapped on the way out
+    _COMPLETION_KEYS = {"planner", "synthesis"}
+    # The streamed planner shares the planner's script, replayed in small chunks
+    _STREAMED_FROM = {"planner_stream": "planner"}
+    _CHUNK_SIZE = 7
+
+    def __init__(self):
+        self._scripts = {}
+        self.calls = defaultdict(list)
+
+    def set(self, key, response):
+        """Return ``response`` for every call to ``key``."""
+        self._scripts[key] = (False, self._prepare(key, response))
+
+    def set_sequence(self, key, responses):
+        """Return ``responses`` one per call to ``key``, in order."""
+        self._scripts[key] = (True, [self._prepare(key, r) for r in responses])
+
+    def _prepare(self, key, response):
+        # Completions are read-only to the engine, so encode them once when
+        # scripted rather than on every call.
+        if key in self._COMPLETION_KEYS:
+            return _make_completion(response)
+        return response
+
+    def _respond(self, key, kwargs):
+        streamed = key in self._STREAMED_FROM
+        key = self._STREAMED_FROM.get(key, key)
+        self.calls[key].append(kwargs)
+        if key not in self._scripts:
+            raise AssertionError(f"unexpected research engine call: {key}")
+        is_sequence, response = self._scripts[key]
+        if is_sequence:
+            if not response:
+                raise AssertionError(f"{key} called more times than scripted")
+            response = response.pop(0)
+        if streamed:
+            content = response.choices[0].message.content
+            return _FakeStream(
+                content[i: i + self._CHUNK_SIZE]
+                for i in range(0, len(content), self._CHUNK_SIZE)
+            )
+        if key == "synthesis_stream":
+            # Streams are consumed, so each call gets a fresh one
+            return _FakeStream(response)
+        return response
+
+    def install(self, monkeypatch, module):
+        for key, attr in self._TARGETS.items():
+            async def fake(*args, _key=key, **kwargs):
+                return self._respond(_key, kwargs)
+            monkeypatch.setattr(module, attr, fake)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """A FakeLLM patched over datascraper.research_engine for one test."""
+    import datascraper.research_engine as research_engine
+
+    # Scripted replies must not be shadowed by plans cached in another test
+    research_engine._plan_cache.clear()
+    # Anything that slips past the fakes fails fast instead of hitting the network
+    monkeypatch.setattr(research_engine, "_planner_client", None)
+    fake = FakeLLM()
+    fake.install(monkeypatch, research_engine)
+    return fake
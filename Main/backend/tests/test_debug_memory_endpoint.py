@@ -1,46 +1,43 @@
 """Tests for the /debug/memory/ diagnostic endpoint."""
 import pytest
 import json
-import os
+import tracemalloc
+
+from django.test import RequestFactory
+
+from api.views_debug import debug_memory
+
+
+@pytest.fixture(scope="module")
+def factory():
+    return RequestFactory()
 
 
 # ── Token auth tests ──────────────────────────────────────────────
 
-def test_missing_token_returns_403(monkeypatch):
+def test_missing_token_returns_403(monkeypatch, factory):
     monkeypatch.setenv('DEBUG_MEMORY_TOKEN', 'secret123')
-    from api.views_debug import debug_memory
-    from django.test import RequestFactory
-    factory = RequestFactory()
     request = factory.get('/debug/memory/')
     response = debug_memory(request)
     assert response.status_code == 403
 
 
-def test_wrong_token_returns_403(monkeypatch):
+def test_wrong_token_returns_403(monkeypatch, factory):
     monkeypatch.setenv('DEBUG_MEMORY_TOKEN', 'secret123')
-    from api.views_debug import debug_memory
-    from django.test import RequestFactory
-    factory = RequestFactory()
     request = factory.get('/debug/memory/?token=wrong')
     response = debug_memory(request)
     assert response.status_code == 403
 
 
-def test_correct_token_returns_200(monkeypatch):
+def test_correct_token_returns_200(monkeypatch, factory):
     monkeypatch.setenv('DEBUG_MEMORY_TOKEN', 'secret123')
-    from api.views_debug import debug_memory
-    from django.test import RequestFactory
-    factory = RequestFactory()
     request = factory.get('/debug/memory/?token=secret123&action=status')
     response = debug_memory(request)
     assert response.status_code == 200
 
 
-def test_empty_token_config_disables_endpoint(monkeypatch):
+def test_empty_token_config_disables_endpoint(monkeypatch, factory):
     monkeypatch.setenv('DEBUG_MEMORY_TOKEN', '')
-    from api.views_debug import debug_memory
-    from django.test import RequestFactory
-    factory = RequestFactory()
     request = factory.get('/debug/memory/?token=anything&action=status')
     response = debug_memory(request)
     assert response.status_code == 403
@@ -48,12 +45,8 @@ def test_empty_token_config_disables_endpoint(monkeypatch):
 
 # ── Action: status ────────────────────────────────────────────────
 
-def test_status_action_returns_snapshot(monkeypatch):
+def test_status_action_returns_snapshot(monkeypatch, factory):
     monkeypatch.setenv('DEBUG_MEMORY_TOKEN', 'secret123')
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_config.settings')
-    from api.views_debug import debug_memory
-    from django.test import RequestFactory
-    factory = RequestFactory()
     request = factory.get('/debug/memory/?token=secret123&action=status')
     response = debug_memory(request)
     data = json.loads(response.content)
@@ -66,14 +59,10 @@ def test_status_action_returns_snapshot(monkeypatch):
 
 # ── Action: snapshot (tracemalloc) ────────────────────────────────
 
-def test_snapshot_action_starts_tracemalloc(monkeypatch):
+def test_snapshot_action_starts_tracemalloc(monkeypatch, factory):
     monkeypatch.setenv('DEBUG_MEMORY_TOKEN', 'secret123')
-    import tracemalloc
     if tracemalloc.is_tracing():
         tracemalloc.stop()
-    from api.views_debug import debug_memory
-    from django.test import RequestFactory
-    factory = RequestFactory()
     request = factory.get('/debug/memory/?token=secret123&action=snapshot')
     response = debug_memory(request)
     data = json.loads(response.content)
@@ -84,13 +73,9 @@ def test_snapshot_action_starts_tracemalloc(monkeypatch):
 
 # ── Action: stop ──────────────────────────────────────────────────
 
-def test_stop_action_stops_tracemalloc(monkeypatch):
+def test_stop_action_stops_tracemalloc(monkeypatch, factory):
     monkeypatch.setenv('DEBUG_MEMORY_TOKEN', 'secret123')
-    import tracemalloc
     tracemalloc.start()
-    from api.views_debug import debug_memory
-    from django.test import RequestFactory
-    factory = RequestFactory()
     request = factory.get('/debug/memory/?token=secret123&action=stop')
     response = debug_memory(request)
     assert response.status_code == 200
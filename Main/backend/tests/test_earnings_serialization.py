@@ -1,16 +1,5 @@
 """Tests for earnings_info Timestamp key serialization fix."""
 
-import sys
-from pathlib import Path
-from unittest.mock import MagicMock
-
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
-# Stub out heavy third-party dependencies that earnings_info imports transitively
-# so the test suite stays lightweight and fast.
-for _mod in ("yfinance", "mcp", "mcp.types", "mcp.server"):
-    sys.modules.setdefault(_mod, MagicMock())
-
 import json
 import pandas as pd
 from mcp_server.handlers.earnings_info import _safe_df_to_dict
@@ -43,3 +32,34 @@ def test_safe_df_to_dict_empty():
 def test_safe_df_to_dict_plain_dict():
     d = {"next_earnings": "2026-04-30"}
     assert _safe_df_to_dict(d) == d
+
+
+def test_safe_df_to_dict_keeps_intraday_timestamps():
+    """earnings_dates carry a time of day and tz; those must not be truncated to dates."""
+    index = pd.DatetimeIndex(["2026-01-30 16:00", "2026-04-30 16:00"]).tz_localize("America/New_York")
+    df = pd.DataFrame({"EPS Estimate": [3.25, 3.50]}, index=index)
+    result = _safe_df_to_dict(df)
+    assert list(result["EPS Estimate"]) == [str(ts) for ts in index]
+
+
+def test_safe_df_to_dict_nan_becomes_none():
+    """Missing values must serialize as JSON null, not the invalid NaN literal."""
+    df = pd.DataFrame(
+        {"Reported EPS": [3.30, float("nan")]},
+        index=pd.to_datetime(["2026-01-30", "2026-04-30"]),
+    )
+    result = _safe_df_to_dict(df)
+    assert result == {"Reported EPS": {"2026-01-30": 3.30, "2026-04-30": None}}
+    assert "NaN" not in json.dumps(result)
+
+
+def test_safe_df_to_dict_keeps_full_float_precision():
+    """Values survive at full float64 precision, even next to non-float columns."""
+    df = pd.DataFrame(
+        {"growth": [0.1 + 0.2, 1 / 3], "period": ["0q", "+1q"]},
+        index=["0q", "+1q"],
+    )
+    result = _safe_df_to_dict(df)
+    assert result["growth"] == {"0q": 0.1 + 0.2, "+1q": 1 / 3}
+    assert json.loads(json.dumps(result))["growth"]["0q"] == 0.30000000000000004
+
@@ -1,10 +1,5 @@
 """Tests for stock_financials Timestamp column key serialization."""
 
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
 import json
 import pandas as pd
 from mcp_server.handlers.stock_financials import _safe_financials_to_dict
@@ -31,3 +26,41 @@ def test_financials_empty_dataframe():
 
 def test_financials_none():
     assert _safe_financials_to_dict(None) == {}
+
+
+def test_financials_date_columns_formatted_as_iso_dates():
+    df = pd.DataFrame(
+        [[1, 2]],
+        index=["Revenue"],
+        columns=pd.to_datetime(["2025-09-30", "2025-12-31"]),
+    )
+    assert _safe_financials_to_dict(df) == {
+        "2025-09-30": {"Revenue": 1},
+        "2025-12-31": {"Revenue": 2},
+    }
+
+
+def test_financials_float_frame_missing_values_become_none():
+    df = pd.DataFrame(
+        [[1.5e9, float("nan")], [2.5e8, 3.0e8]],
+        index=["Revenue", "NetIncome"],
+        columns=pd.to_datetime(["2025-09-30", "2025-12-31"]),
+    )
+    assert _safe_financials_to_dict(df) == {
+        "2025-09-30": {"Revenue": 1.5e9, "NetIncome": 2.5e8},
+        "2025-12-31": {"Revenue": None, "NetIncome": 3.0e8},
+    }
+
+
+def test_financials_mixed_frame_matches_float_fast_path_precision():
+    """A frame with a non-float column keeps the same full precision as the float path."""
+    columns = pd.to_datetime(["2025-09-30", "2025-12-31"])
+    floats = pd.DataFrame([[1 / 3, 0.1 + 0.2]], index=["Margin"], columns=columns)
+    mixed = floats.astype({columns[1]: object})
+    mixed.iloc[0, 1] = "n/a"
+    assert _safe_financials_to_dict(floats)["2025-09-30"]["Margin"] == 1 / 3
+    assert _safe_financials_to_dict(floats)["2025-12-31"]["Margin"] == 0.1 + 0.2
+    assert _safe_financials_to_dict(mixed) == {
+        "2025-09-30": {"Margin": 1 / 3},
+        "2025-12-31": {"Margin": "n/a"},
+    }
@@ -4,11 +4,7 @@ Tests the two reported scenarios (EPS surprise, options volume) and
 verifies that prompt changes are in place.
 """
 import json
-from unittest.mock import MagicMock
-from pathlib import Path
-
-
-BACKEND_DIR = Path(__file__).resolve().parent.parent
+from types import SimpleNamespace
 
 
 # ── Calculator: EPS surprise scenario ───────────────────────────────
@@ -27,11 +23,8 @@ def test_validator_catches_options_volume_orphan():
     from datascraper.numerical_validator import validate_numerical_accuracy
 
     tool_data = json.dumps({"call_volume": 10899, "put_volume": 9976})
-    item = MagicMock()
-    item.type = "tool_call_output_item"
-    item.output = tool_data
-    run_result = MagicMock()
-    run_result.new_items = [item]
+    item = SimpleNamespace(type="tool_call_output_item", output=tool_data)
+    run_result = SimpleNamespace(new_items=[item])
 
     result = validate_numerical_accuracy(
         run_result,
@@ -49,9 +42,7 @@ def test_synthesis_prompt_contains_anti_aggregation():
     assert "partial data" in _SYNTHESIS_SYSTEM
 
 
-def test_core_prompt_contains_calculation_rules():
+def test_core_prompt_contains_calculation_rules(core_prompt):
     """Verify core.md has CALCULATION RULES and references calculate()."""
-    core_path = BACKEND_DIR / "prompts" / "core.md"
-    content = core_path.read_text()
-    assert "CALCULATION RULES" in content
-    assert "calculate()" in content
+    assert "CALCULATION RULES" in core_prompt
+    assert "calculate()" in core_prompt
@@ -1,45 +1,37 @@
 """Tests for the sliding window leak detector."""
 import pytest
+from api.utils.leak_detector import LeakDetector, get_worker_detector
 
 
 # ── Linear regression math ────────────────────────────────────────
 
-def test_compute_slope_positive():
-    """Steadily increasing data should produce positive slope."""
-    from api.utils.leak_detector import LeakDetector
+@pytest.mark.parametrize("rss_at, expected_slope", [
+    pytest.param(lambda i: 100.0 + i * 1.0, 1.0, id="positive"),  # +1MB per request
+    pytest.param(lambda i: 100.0, 0.0, id="flat"),
+    pytest.param(lambda i: 200.0 - i * 2.0, -2.0, id="negative"),
+])
+def test_compute_slope(rss_at, expected_slope):
+    """Slope should equal the per-request RSS change of a linear series."""
     detector = LeakDetector(window_size=10, check_interval=5, slope_threshold=0.1)
     for i in range(10):
-        detector.record(rss_mb=100.0 + i * 1.0)  # +1MB per request
+        detector.record(rss_mb=rss_at(i))
     slope = detector.compute_slope()
     assert slope is not None
-    assert abs(slope - 1.0) < 0.01
+    assert slope == pytest.approx(expected_slope, abs=0.01)
 
 
-def test_compute_slope_flat():
-    """Flat data should produce near-zero slope."""
-    from api.utils.leak_detector import LeakDetector
+def test_compute_slope_tracks_sliding_window():
+    """Running sums must forget evicted samples: only the last window counts."""
     detector = LeakDetector(window_size=10, check_interval=5, slope_threshold=0.1)
-    for i in range(10):
-        detector.record(rss_mb=100.0)
-    slope = detector.compute_slope()
-    assert slope is not None
-    assert abs(slope) < 0.01
-
-
-def test_compute_slope_negative():
-    """Decreasing data should produce negative slope."""
-    from api.utils.leak_detector import LeakDetector
-    detector = LeakDetector(window_size=10, check_interval=5, slope_threshold=0.1)
-    for i in range(10):
-        detector.record(rss_mb=200.0 - i * 2.0)
-    slope = detector.compute_slope()
-    assert slope is not None
-    assert slope < -1.0
+    for i in range(25):
+        detector.record(rss_mb=100.0 + i * 3.0)  # steep ramp, evicted below
+    for i in range(37):
+        detector.record(rss_mb=200.0)
+    assert abs(detector.compute_slope()) < 1e-9
 
 
 def test_compute_slope_insufficient_data():
     """Too few samples should return None."""
-    from api.utils.leak_detector import LeakDetector
     detector = LeakDetector(window_size=100, check_interval=5, slope_threshold=0.1)
     detector.record(rss_mb=100.0)
     assert detector.compute_slope() is None
@@ -49,7 +41,6 @@ def test_compute_slope_insufficient_data():
 
 def test_detects_steady_leak():
     """A steady 0.5 MB/request leak should be detected."""
-    from api.utils.leak_detector import LeakDetector
     detector = LeakDetector(window_size=100, check_interval=50, slope_threshold=0.1)
     result = None
     for i in range(100):
@@ -59,9 +50,18 @@ def test_detects_steady_leak():
     assert result['slope'] > 0.4
 
 
+def test_slope_only_computed_on_check_interval(monkeypatch):
+    """Non-check requests must return before any slope math runs."""
+    detector = LeakDetector(window_size=100, check_interval=50, slope_threshold=0.1)
+    calls = []
+    monkeypatch.setattr(detector, 'compute_slope', lambda: calls.append(1) or 0.0)
+    for i in range(100):
+        detector.record(rss_mb=100.0)
+    assert len(calls) == 2
+
+
 def test_no_false_alarm_on_flat():
     """Stable memory should not trigger leak detection."""
-    from api.utils.leak_detector import LeakDetector
     detector = LeakDetector(window_size=100, check_interval=50, slope_threshold=0.1)
     result = None
     for i in range(100):
@@ -71,7 +71,6 @@ def test_no_false_alarm_on_flat():
 
 def test_no_false_alarm_on_spike_then_stable():
     """A transient spike that returns to baseline should not trigger."""
-    from api.utils.leak_detector import LeakDetector
     detector = LeakDetector(window_size=100, check_interval=50, slope_threshold=0.1)
     # Spike: first 5 requests grow fast
     for i in range(5):
@@ -86,7 +85,6 @@ def test_no_false_alarm_on_spike_then_stable():
 # ── High water mark ───────────────────────────────────────────────
 
 def test_high_water_mark():
-    from api.utils.leak_detector import LeakDetector
     detector = LeakDetector(window_size=10, check_interval=5, slope_threshold=0.1)
     detector.record(rss_mb=100.0)
     detector.record(rss_mb=250.0)
@@ -95,7 +93,6 @@ def test_high_water_mark():
 
 
 def test_high_water_mark_starts_zero():
-    from api.utils.leak_detector import LeakDetector
     detector = LeakDetector(window_size=10, check_interval=5, slope_threshold=0.1)
     assert detector.high_water_mark == 0.0
 
@@ -109,7 +106,6 @@ def test_soft_limit_triggers_signal(monkeypatch):
     monkeypatch.setattr('os.kill', lambda pid, sig: signals_sent.append((pid, sig)))
     monkeypatch.setattr('os.getppid', lambda: 12345)
 
-    from api.utils.leak_detector import LeakDetector
     detector = LeakDetector(
         window_size=10, check_interval=5, slope_threshold=0.1,
         soft_limit_mb=200.0
@@ -126,7 +122,6 @@ def test_below_soft_limit_no_signal(monkeypatch):
     monkeypatch.setattr('os.kill', lambda pid, sig: signals_sent.append((pid, sig)))
     monkeypatch.setattr('os.getppid', lambda: 12345)
 
-    from api.utils.leak_detector import LeakDetector
     detector = LeakDetector(
         window_size=10, check_interval=5, slope_threshold=0.1,
         soft_limit_mb=500.0
@@ -141,7 +136,6 @@ def test_soft_limit_only_fires_once(monkeypatch):
     monkeypatch.setattr('os.kill', lambda pid, sig: signals_sent.append((pid, sig)))
     monkeypatch.setattr('os.getppid', lambda: 12345)
 
-    from api.utils.leak_detector import LeakDetector
     detector = LeakDetector(
         window_size=10, check_interval=5, slope_threshold=0.1,
         soft_limit_mb=200.0
@@ -155,7 +149,6 @@ def test_soft_limit_only_fires_once(monkeypatch):
 # ── get_state ─────────────────────────────────────────────────────
 
 def test_get_state_returns_dict():
-    from api.utils.leak_detector import LeakDetector
     detector = LeakDetector(window_size=10, check_interval=5, slope_threshold=0.1)
     for i in range(10):
         detector.record(rss_mb=100.0 + i)
@@ -169,7 +162,6 @@ def test_get_state_returns_dict():
 # ── Singleton access ──────────────────────────────────────────────
 
 def test_get_worker_detector_returns_same_instance():
-    from api.utils.leak_detector import get_worker_detector
     d1 = get_worker_detector()
     d2 = get_worker_detector()
     assert d1 is d2
@@ -0,0 +1,121 @@
+"""Tests for MemoryTrackerMiddleware's per-request sampling."""
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from api.middleware import memory_tracker
+from api.middleware.memory_tracker import (
+    ALLOCATED_BLOCKS_THRESHOLD,
+    MEMORY_SPIKE_THRESHOLD_MB,
+    MemoryTrackerMiddleware,
+)
+
+
+class _FakeSnapshot:
+    taken = 0
+    open_fds = 10
+
+    def __init__(self):
+        type(self).taken += 1
+        self.open_fds = type(self).open_fds
+        self.uss_mb = 100.0
+        self.asyncio_tasks = self.browser_processes = self.gc_uncollectable = 0
+
+    def delta(self, previous):
+        return {
+            'memory_delta_mb': 0.0, 'fd_delta': self.open_fds - previous.open_fds,
+            'task_delta': 0, 'browser_delta': 0, 'uss_delta_mb': 0.0,
+            'gc_uncollectable_delta': 0,
+        }
+
+
+@pytest.fixture
+def process(monkeypatch):
+    """Stand in for the allocated-block counter and RSS, and count snapshots."""
+    state = SimpleNamespace(blocks=1_000_000, memory_mb=100.0)
+    monkeypatch.setattr(memory_tracker, "sys", SimpleNamespace(getallocatedblocks=lambda: state.blocks))
+    monkeypatch.setattr(memory_tracker, "rss_mb", lambda: state.memory_mb)
+    monkeypatch.setattr(memory_tracker, "ResourceSnapshot", _FakeSnapshot)
+    monkeypatch.setattr(memory_tracker, "get_mcp_connection_count", lambda: 0)
+    _FakeSnapshot.taken = 0
+    _FakeSnapshot.open_fds = 10
+    return state
+
+
+def _request():
+    return SimpleNamespace(method="GET", path="/health")
+
+
+def _view(state, blocks=0, memory_mb=0.0, fds=0):
+    """A view that allocates blocks, grows RSS and opens fds while it runs."""
+    def view(request):
+        state.blocks += blocks
+        state.memory_mb += memory_mb
+        _FakeSnapshot.open_fds += fds
+        return "ok"
+    return view
+
+
+def _spikes(caplog):
+    return [r.getMessage() for r in caplog.records if "SPIKE_DETECTED" in r.getMessage()]
+
+
+def test_snapshot_only_when_the_request_itself_allocates(process):
+    assert MemoryTrackerMiddleware(_view(process, blocks=ALLOCATED_BLOCKS_THRESHOLD // 2))(_request()) == "ok"
+    assert _FakeSnapshot.taken == 0
+
+    MemoryTrackerMiddleware(_view(process, blocks=ALLOCATED_BLOCKS_THRESHOLD + 1))(_request())
+    assert _FakeSnapshot.taken == 1
+
+    # The counter now sits far from where it started, but this request
+    # allocated nothing, so it is not charged for its predecessors
+    MemoryTrackerMiddleware(_view(process))(_request())
+    assert _FakeSnapshot.taken == 1
+
+
+def test_shrinking_allocations_also_sample(process):
+    MemoryTrackerMiddleware(_view(process, blocks=-(ALLOCATED_BLOCKS_THRESHOLD + 1)))(_request())
+    assert _FakeSnapshot.taken == 1
+
+
+def test_spike_is_attributed_to_the_request_that_caused_it(process, caplog):
+    spike_mb = MEMORY_SPIKE_THRESHOLD_MB + 5
+    middleware = MemoryTrackerMiddleware(lambda request: "ok")
+    heavy = _view(process, blocks=ALLOCATED_BLOCKS_THRESHOLD * 2, memory_mb=spike_mb)
+    light = _view(process)
+
+    with caplog.at_level(logging.DEBUG, logger=memory_tracker.__name__):
+        middleware.get_response = heavy
+        middleware(_request())
+        middleware.get_response = light
+        middleware(_request())
+
+    spikes = _spikes(caplog)
+    assert len(spikes) == 1
+    assert f"delta=+{spike_mb:.1f}MB" in spikes[0]
+
+
+def test_rss_spike_without_python_allocations_is_reported(process, caplog):
+    """A large C buffer moves RSS but barely touches the block count."""
+    middleware = MemoryTrackerMiddleware(_view(process, memory_mb=MEMORY_SPIKE_THRESHOLD_MB + 40))
+    with caplog.at_level(logging.WARNING, logger=memory_tracker.__name__):
+        middleware(_request())
+
+    spikes = _spikes(caplog)
+    assert len(spikes) == 1
+    assert "blocks_delta=+0" in spikes[0]
+    assert f"delta=+{MEMORY_SPIKE_THRESHOLD_MB + 40:.1f}MB" in spikes[0]
+    assert _FakeSnapshot.taken == 1
+
+
+def test_spike_log_carries_resource_deltas_since_the_last_snapshot(process, caplog):
+    middleware = MemoryTrackerMiddleware(_view(process, blocks=ALLOCATED_BLOCKS_THRESHOLD + 1))
+    middleware(_request())
+
+    middleware.get_response = _view(process, memory_mb=MEMORY_SPIKE_THRESHOLD_MB + 1, fds=3)
+    with caplog.at_level(logging.WARNING, logger=memory_tracker.__name__):
+        middleware(_request())
+
+    assert "fd_delta=+3" in _spikes(caplog)[0]
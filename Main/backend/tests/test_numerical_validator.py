@@ -1,26 +1,19 @@
 """Tests for the upgraded numerical validator with structured ValidationResult."""
 import pytest
 import json
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+from datascraper.numerical_validator import ValidationResult, validate_numerical_accuracy
 
 
 def _make_run_result(tool_outputs: list[str]):
-    """Create a mock run_result with tool_call_output_items."""
-    items = []
-    for output in tool_outputs:
-        item = MagicMock()
-        item.type = "tool_call_output_item"
-        item.output = output
-        items.append(item)
-    result = MagicMock()
-    result.new_items = items
-    return result
+    """Create a stand-in run_result with tool_call_output_items."""
+    items = [SimpleNamespace(type="tool_call_output_item", output=output) for output in tool_outputs]
+    return SimpleNamespace(new_items=items)
 
 
 # ── ValidationResult structure ──────────────────────────────────────
 
 def test_validation_result_dataclass():
-    from datascraper.numerical_validator import ValidationResult
     vr = ValidationResult(exact_matches=2, close_matches=[], orphan_numbers=[], suspicious=[])
     assert vr.exact_matches == 2
     assert vr.close_matches == []
@@ -29,7 +22,6 @@ def test_validation_result_dataclass():
 
 
 def test_validate_returns_validation_result():
-    from datascraper.numerical_validator import validate_numerical_accuracy, ValidationResult
     tool_data = json.dumps({"price": 150.25, "volume": 1000000})
     run_result = _make_run_result([tool_data])
     result = validate_numerical_accuracy(run_result, "The price is $150.25 with volume 1,000,000.")
@@ -39,7 +31,6 @@ def test_validate_returns_validation_result():
 # ── Exact match detection ───────────────────────────────────────────
 
 def test_exact_matches_counted():
-    from datascraper.numerical_validator import validate_numerical_accuracy
     tool_data = json.dumps({"price": 190.68, "change": 2.35})
     run_result = _make_run_result([tool_data])
     result = validate_numerical_accuracy(run_result, "The stock price is $190.68, up $2.35.")
@@ -50,7 +41,6 @@ def test_exact_matches_counted():
 # ── Close-but-wrong detection ──────────────────────────────────────
 
 def test_suspicious_close_match():
-    from datascraper.numerical_validator import validate_numerical_accuracy
     tool_data = json.dumps({"price": 190.68})
     run_result = _make_run_result([tool_data])
     # 190.66 is close but wrong (within 1% but not exact)
@@ -58,11 +48,19 @@ def test_suspicious_close_match():
     assert len(result.suspicious) > 0
 
 
+def test_exact_match_preferred_over_nearby_value():
+    """A near-duplicate tool value must not shadow the exact one."""
+    tool_data = json.dumps({"open": 190.60, "close": 190.66})
+    run_result = _make_run_result([tool_data])
+    result = validate_numerical_accuracy(run_result, "It closed at $190.66.")
+    assert result.exact_matches == 1
+    assert result.suspicious == []
+
+
 # ── Orphan number detection ────────────────────────────────────────
 
 def test_orphan_number_detected():
     """The options volume case: 97271 is not in any tool output."""
-    from datascraper.numerical_validator import validate_numerical_accuracy
     tool_data = json.dumps({"call_volume": 10899, "put_volume": 9976})
     run_result = _make_run_result([tool_data])
     result = validate_numerical_accuracy(
@@ -75,7 +73,6 @@ def test_orphan_number_detected():
 # ── Empty/no-data cases ────────────────────────────────────────────
 
 def test_empty_response():
-    from datascraper.numerical_validator import validate_numerical_accuracy, ValidationResult
     run_result = _make_run_result([])
     result = validate_numerical_accuracy(run_result, "")
     assert isinstance(result, ValidationResult)
@@ -83,7 +80,6 @@ def test_empty_response():
 
 
 def test_no_tool_numbers():
-    from datascraper.numerical_validator import validate_numerical_accuracy, ValidationResult
     run_result = _make_run_result([])
     result = validate_numerical_accuracy(run_result, "The price is $150.25.")
     assert isinstance(result, ValidationResult)
@@ -92,9 +88,24 @@ def test_no_tool_numbers():
 # ── No false positives on exact matches ─────────────────────────────
 
 def test_no_orphans_when_all_match():
-    from datascraper.numerical_validator import validate_numerical_accuracy
     tool_data = json.dumps({"eps_reported": 0.50, "eps_estimated": 0.45})
     run_result = _make_run_result([tool_data])
     result = validate_numerical_accuracy(run_result, "EPS was $0.50 vs estimated $0.45.")
     assert len(result.orphan_numbers) == 0
     assert len(result.suspicious) == 0
+
+
+def test_nested_tool_payload_numbers_are_traced():
+    """Numbers in nested values, string fields and date keys all count as sourced."""
+    tool_data = json.dumps({
+        "income_statement": {"2025-09-30": {"Total Revenue": 102466000000.0}},
+        "summary": "Gross margin was 46.9% last quarter",
+        "history": [{"close": 254.63}, {"close": -12.5}],
+    })
+    run_result = _make_run_result([tool_data])
+    result = validate_numerical_accuracy(
+        run_result,
+        "For 2025 revenue was 102466000000.0, margin 46.9%, close 254.63, change 12.5.",
+    )
+    assert result.orphan_numbers == []
+    assert result.exact_matches == 5
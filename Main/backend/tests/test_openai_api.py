@@ -1,35 +1,84 @@
 """Tests for the OpenAI-compatible API (api/openai_views.py)."""
 import json
-import os
 import pytest
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import Mock, patch
+
+from api.openai_views import (
+    _authenticate_request,
+    _handle_sync,
+    _merge_domains_into_preferred_links,
+    chat_completions,
+    models_list,
+)
+from datascraper.context_integration import ContextIntegration
+from datascraper.datascraper import (
+    _extract_tool_sources_from_result,
+    _prepare_messages,
+    _split_role_prefix,
+)
+from datascraper.unified_context_manager import ContextMode, UnifiedContextManager
+
+try:
+    import orjson
+    _dumps, _loads = orjson.dumps, orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+    _loads = json.loads
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_request(method='POST', body=None, headers=None):
-    """Create a mock Django HttpRequest."""
-    request = MagicMock()
-    request.method = method
-    request.body = json.dumps(body).encode() if body else b'{}'
-    request.META = headers or {}
-    request.GET = {}
-    request.session = MagicMock()
-    request.session.session_key = 'test_session_key'
-    return request
+# Read-only so a test can't leak edits into the next one; messages is a tuple
+# for the same reason (both JSON encoders emit it as an array).
+_MINIMAL_BODY = MappingProxyType({
+    "model": "FinGPT",
+    "messages": ({"role": "user", "content": "What is AAPL price?"},),
+    "mode": "thinking",
+})
+_MINIMAL_BODY_BYTES = _dumps(dict(_MINIMAL_BODY))
 
 
 def _minimal_body(**overrides):
     """Return the minimal valid request body, with optional overrides."""
-    body = {
-        "model": "FinGPT",
-        "messages": [{"role": "user", "content": "What is AAPL price?"}],
-        "mode": "thinking",
-    }
-    body.update(overrides)
-    return body
+    return {**_MINIMAL_BODY, **overrides}
+
+
+def _make_request(method='POST', body=None, headers=None):
+    """Create a stand-in Django HttpRequest exposing only what the views read.
+
+    Without an explicit body the request carries the pre-encoded minimal body.
+    """
+    return SimpleNamespace(
+        method=method,
+        body=_MINIMAL_BODY_BYTES if body is None else _dumps(body),
+        META=headers or {},
+        GET={},
+        session=SimpleNamespace(session_key='test_session_key'),
+    )
+
+
+def _decode(response):
+    """Parse a JsonResponse body straight from its bytes."""
+    return _loads(response.content)
+
+
+def _make_context(current_url="", token_count=0):
+    """Return (context_mgr, integration) doubles for _handle_sync."""
+    meta = SimpleNamespace(mode=None, current_url=current_url, user_timezone=None, user_time=None)
+    context_mgr = Mock(spec=UnifiedContextManager)
+    context_mgr.get_session_metadata.return_value = meta
+    context_mgr.get_session_stats.return_value = {"token_count": token_count}
+    return context_mgr, Mock(spec=ContextIntegration)
+
+
+@pytest.fixture(autouse=True)
+def _no_api_key(monkeypatch):
+    """Run every test with auth disabled unless it sets FINGPT_API_KEY itself."""
+    monkeypatch.delenv("FINGPT_API_KEY", raising=False)
 
 
 # ---------------------------------------------------------------------------
@@ -39,55 +88,40 @@ def _minimal_body(**overrides):
 class TestAuthentication:
     """Test Bearer token authentication on /v1/ endpoints."""
 
-    @patch.dict(os.environ, {"FINGPT_API_KEY": "test-secret-key"})
-    def test_missing_auth_header_returns_401(self):
-        from api.openai_views import chat_completions
-        request = _make_request(body=_minimal_body())
+    def test_missing_auth_header_returns_401(self, monkeypatch):
+        monkeypatch.setenv("FINGPT_API_KEY", "test-secret-key")
+        request = _make_request()
         response = chat_completions(request)
         assert response.status_code == 401
-        data = json.loads(response.content)
+        data = _decode(response)
         assert "authentication_error" in str(data)
 
-    @patch.dict(os.environ, {"FINGPT_API_KEY": "test-secret-key"})
-    def test_invalid_api_key_returns_401(self):
-        from api.openai_views import chat_completions
-        request = _make_request(
-            body=_minimal_body(),
-            headers={"HTTP_AUTHORIZATION": "Bearer wrong-key"}
-        )
+    def test_invalid_api_key_returns_401(self, monkeypatch):
+        monkeypatch.setenv("FINGPT_API_KEY", "test-secret-key")
+        request = _make_request(headers={"HTTP_AUTHORIZATION": "Bearer wrong-key"})
         response = chat_completions(request)
         assert response.status_code == 401
 
-    @patch.dict(os.environ, {"FINGPT_API_KEY": "test-secret-key"})
-    def test_malformed_auth_header_returns_401(self):
-        from api.openai_views import chat_completions
-        request = _make_request(
-            body=_minimal_body(),
-            headers={"HTTP_AUTHORIZATION": "Basic dXNlcjpwYXNz"}
-        )
+    def test_malformed_auth_header_returns_401(self, monkeypatch):
+        monkeypatch.setenv("FINGPT_API_KEY", "test-secret-key")
+        request = _make_request(headers={"HTTP_AUTHORIZATION": "Basic dXNlcjpwYXNz"})
         response = chat_completions(request)
         assert response.status_code == 401
 
-    @patch.dict(os.environ, {}, clear=False)
     def test_no_api_key_configured_allows_all_requests(self):
         """When FINGPT_API_KEY is not set, auth is disabled (dev mode)."""
-        from api.openai_views import _authenticate_request
-        # Remove FINGPT_API_KEY if present
-        os.environ.pop("FINGPT_API_KEY", None)
         request = _make_request()
         result = _authenticate_request(request)
         assert result is None  # No error = authenticated
 
-    @patch.dict(os.environ, {"FINGPT_API_KEY": "test-secret-key"})
-    def test_valid_api_key_passes_auth(self):
-        from api.openai_views import _authenticate_request
+    def test_valid_api_key_passes_auth(self, monkeypatch):
+        monkeypatch.setenv("FINGPT_API_KEY", "test-secret-key")
         request = _make_request(headers={"HTTP_AUTHORIZATION": "Bearer test-secret-key"})
         result = _authenticate_request(request)
         assert result is None  # No error = authenticated
 
-    @patch.dict(os.environ, {"FINGPT_API_KEY": "test-secret-key"})
-    def test_models_list_requires_auth(self):
-        from api.openai_views import models_list
+    def test_models_list_requires_auth(self, monkeypatch):
+        monkeypatch.setenv("FINGPT_API_KEY", "test-secret-key")
         request = _make_request(method='GET')
         response = models_list(request)
         assert response.status_code == 401
@@ -101,46 +135,30 @@ class TestModeValidation:
     """Test mode parameter validation."""
 
     def _call_with_mode(self, mode_str):
-        from api.openai_views import chat_completions
         body = _minimal_body(mode=mode_str)
+        if mode_str is None:
+            del body["mode"]
         request = _make_request(body=body)
-        # Disable auth for validation tests
-        with patch.dict(os.environ, {}, clear=False):
-            os.environ.pop("FINGPT_API_KEY", None)
-            return chat_completions(request)
-
-    def test_missing_mode_returns_400(self):
-        from api.openai_views import chat_completions
-        body = _minimal_body()
-        del body["mode"]
-        request = _make_request(body=body)
-        os.environ.pop("FINGPT_API_KEY", None)
-        response = chat_completions(request)
-        assert response.status_code == 400
-        data = json.loads(response.content)
-        assert "mode is required" in data["error"]["message"]
-
-    def test_invalid_mode_returns_400(self):
-        response = self._call_with_mode("reserch")  # typo
-        assert response.status_code == 400
-        data = json.loads(response.content)
-        assert "Invalid mode" in data["error"]["message"]
+        return chat_completions(request)
 
-    def test_empty_mode_returns_400(self):
-        response = self._call_with_mode("")
+    @pytest.mark.parametrize("mode, message", [
+        pytest.param(None, b"mode is required", id="missing"),
+        pytest.param("reserch", b"Invalid mode", id="typo"),
+        pytest.param("", None, id="empty"),
+    ])
+    def test_invalid_mode_returns_400(self, mode, message):
+        response = self._call_with_mode(mode)
         assert response.status_code == 400
+        if message:
+            assert message in response.content
 
-    def test_valid_thinking_mode_accepted(self):
-        """Thinking mode is valid (will fail at execution, but not at validation)."""
-        # We only test validation here — execution is mocked in integration tests
-        response = self._call_with_mode("thinking")
+    @pytest.mark.parametrize("mode", ["thinking", "research"])
+    def test_valid_mode_accepted(self, mode):
+        """Valid modes pass validation (execution is mocked in integration tests)."""
+        response = self._call_with_mode(mode)
         # Should NOT be a 400 (might be 500 if execution env isn't set up, that's fine)
         assert response.status_code != 400
 
-    def test_valid_research_mode_accepted(self):
-        response = self._call_with_mode("research")
-        assert response.status_code != 400
-
 
 # ---------------------------------------------------------------------------
 # Request validation tests
@@ -150,35 +168,26 @@ class TestRequestValidation:
     """Test general request validation."""
 
     def _call(self, body):
-        from api.openai_views import chat_completions
         request = _make_request(body=body)
-        os.environ.pop("FINGPT_API_KEY", None)
         return chat_completions(request)
 
     def test_empty_messages_returns_400(self):
         response = self._call(_minimal_body(messages=[]))
         assert response.status_code == 400
-        data = json.loads(response.content)
-        assert "messages" in data["error"]["message"]
+        assert b"messages" in response.content
 
     def test_invalid_model_returns_404(self):
         response = self._call(_minimal_body(model="nonexistent-model"))
         assert response.status_code == 404
 
     def test_get_method_returns_405(self):
-        from api.openai_views import chat_completions
-        request = _make_request(method='GET', body=_minimal_body())
-        os.environ.pop("FINGPT_API_KEY", None)
+        request = _make_request(method='GET')
         response = chat_completions(request)
         assert response.status_code == 405
 
     def test_invalid_json_body_returns_400(self):
-        from api.openai_views import chat_completions
-        request = MagicMock()
-        request.method = 'POST'
+        request = _make_request()
         request.body = b'not valid json'
-        request.META = {}
-        os.environ.pop("FINGPT_API_KEY", None)
         response = chat_completions(request)
         assert response.status_code == 400
 
@@ -190,41 +199,21 @@ class TestRequestValidation:
 class TestDomainMerging:
     """Test search_domains -> preferred_links merging."""
 
-    def test_merge_domains_into_empty_links(self):
-        from api.openai_views import _merge_domains_into_preferred_links
-        result = _merge_domains_into_preferred_links([], ["reuters.com", "bloomberg.com"])
-        expected = {"https://reuters.com", "https://bloomberg.com"}
-        assert expected.issubset(set(result))
-
-    def test_merge_domains_preserves_existing_links(self):
-        from api.openai_views import _merge_domains_into_preferred_links
-        existing = ["https://example.com"]
-        result = _merge_domains_into_preferred_links(existing, ["reuters.com"])
-        expected = {"https://example.com", "https://reuters.com"}
-        assert expected.issubset(set(result))
-
-    def test_merge_domains_deduplicates(self):
-        from api.openai_views import _merge_domains_into_preferred_links
-        result = _merge_domains_into_preferred_links(
-            ["https://reuters.com"],
-            ["reuters.com"]  # same domain
-        )
-        assert result.count("https://reuters.com") == 1
-
-    def test_merge_handles_full_urls(self):
-        from api.openai_views import _merge_domains_into_preferred_links
-        result = _merge_domains_into_preferred_links([], ["https://reuters.com/markets"])
-        assert any(x == "https://reuters.com/markets" for x in result)
-
-    def test_merge_handles_none_domains(self):
-        from api.openai_views import _merge_domains_into_preferred_links
-        result = _merge_domains_into_preferred_links(["https://x.com"], None)
-        assert result == ["https://x.com"]
-
-    def test_merge_skips_empty_strings(self):
-        from api.openai_views import _merge_domains_into_preferred_links
-        result = _merge_domains_into_preferred_links([], ["reuters.com", "", "  "])
-        assert len(result) == 1
+    @pytest.mark.parametrize("existing, domains, expected", [
+        pytest.param([], ["reuters.com", "bloomberg.com"],
+                     ["https://reuters.com", "https://bloomberg.com"], id="into_empty_links"),
+        pytest.param(["https://example.com"], ["reuters.com"],
+                     ["https://example.com", "https://reuters.com"], id="preserves_existing_links"),
+        pytest.param(["https://reuters.com"], ["reuters.com"],
+                     ["https://reuters.com"], id="deduplicates"),
+        pytest.param([], ["https://reuters.com/markets"],
+                     ["https://reuters.com/markets"], id="full_urls"),
+        pytest.param(["https://x.com"], None, ["https://x.com"], id="none_domains"),
+        pytest.param([], ["reuters.com", "", "  "], ["https://reuters.com"], id="skips_empty_strings"),
+    ])
+    def test_merge_domains(self, existing, domains, expected):
+        result = _merge_domains_into_preferred_links(existing, domains)
+        assert sorted(result) == sorted(expected)
 
 
 # ---------------------------------------------------------------------------
@@ -243,27 +232,15 @@ class TestSyncResponseFormat:
             {"url": "https://bloomberg.com/news", "title": "Bloomberg News"},
         ]
         mock_research.return_value = ("AAPL is up 5% today.", mock_sources)
+        context_mgr, integration = _make_context(token_count=100)
 
-        from api.openai_views import _handle_sync
-
-        context_mgr = MagicMock()
-        integration = MagicMock()
-        meta = MagicMock()
-        meta.mode = MagicMock()  # Will be overridden by mode param
-        meta.current_url = ""
-        meta.user_timezone = None
-        meta.user_time = None
-        context_mgr.get_session_metadata.return_value = meta
-        context_mgr.get_session_stats.return_value = {"token_count": 100}
-
-        from datascraper.unified_context_manager import ContextMode
         response = _handle_sync(
             context_mgr, integration, "test_session",
             "What is AAPL price?", [], "FinGPT",
             ContextMode.RESEARCH, ["https://reuters.com"]
         )
 
-        data = json.loads(response.content)
+        data = _decode(response)
         assert "sources" in data
         assert len(data["sources"]) == 2
         assert data["sources"][0]["url"] == "https://reuters.com/article"
@@ -276,18 +253,9 @@ class TestSyncResponseFormat:
             {"type": "tool", "tool_name": "get_stock_info", "symbol": "AAPL"},
         ]
         mock_agent.return_value = ("Apple is trading at $195.50.", mock_tool_sources)
-
-        from api.openai_views import _handle_sync
-        from datascraper.unified_context_manager import ContextMode
-
-        context_mgr = MagicMock()
-        integration = MagicMock()
-        meta = MagicMock()
-        meta.current_url = "https://finance.yahoo.com"
-        meta.user_timezone = None
-        meta.user_time = None
-        context_mgr.get_session_metadata.return_value = meta
-        context_mgr.get_session_stats.return_value = {"token_count": 50}
+        context_mgr, integration = _make_context(
+            current_url="https://finance.yahoo.com", token_count=50
+        )
 
         response = _handle_sync(
             context_mgr, integration, "test_session",
@@ -295,7 +263,7 @@ class TestSyncResponseFormat:
             ContextMode.THINKING
         )
 
-        data = json.loads(response.content)
+        data = _decode(response)
         assert "sources" in data
         assert len(data["sources"]) == 1
         assert data["sources"][0]["tool_name"] == "get_stock_info"
@@ -305,18 +273,7 @@ class TestSyncResponseFormat:
     def test_response_has_openai_standard_fields(self, mock_agent):
         """Response must include standard OpenAI fields."""
         mock_agent.return_value = ("Response text.", [])
-
-        from api.openai_views import _handle_sync
-        from datascraper.unified_context_manager import ContextMode
-
-        context_mgr = MagicMock()
-        integration = MagicMock()
-        meta = MagicMock()
-        meta.current_url = ""
-        meta.user_timezone = None
-        meta.user_time = None
-        context_mgr.get_session_metadata.return_value = meta
-        context_mgr.get_session_stats.return_value = {"token_count": 30}
+        context_mgr, integration = _make_context(token_count=30)
 
         response = _handle_sync(
             context_mgr, integration, "test_session",
@@ -324,7 +281,7 @@ class TestSyncResponseFormat:
             ContextMode.THINKING
         )
 
-        data = json.loads(response.content)
+        data = _decode(response)
         assert data["object"] == "chat.completion"
         assert data["id"].startswith("chatcmpl-")
         assert len(data["choices"]) == 1
@@ -338,86 +295,129 @@ class TestSyncResponseFormat:
 # Tool source extraction tests
 # ---------------------------------------------------------------------------
 
-class TestToolSourceExtraction:
-    """Test _extract_tool_sources_from_result from datascraper."""
-
-    def test_extracts_function_calls(self):
-        from datascraper.datascraper import _extract_tool_sources_from_result
-
-        mock_item = MagicMock()
-        mock_item.type = "function_call_item"
-        mock_item.name = "get_stock_info"
-        mock_item.call_id = "call_123"
-        mock_item.arguments = json.dumps({"symbol": "AAPL"})
-
-        mock_result = MagicMock()
-        mock_result.new_items = [mock_item]
-
-        sources = _extract_tool_sources_from_result(mock_result)
-        assert len(sources) == 1
-        assert sources[0]["tool_name"] == "get_stock_info"
-        assert sources[0]["symbol"] == "AAPL"
+def _call(name, call_id, **args):
+    """A function_call output item as it appears in a model response."""
+    return SimpleNamespace(type="function_call", name=name, call_id=call_id, arguments=json.dumps(args))
 
-    def test_deduplicates_tool_names(self):
-        from datascraper.datascraper import _extract_tool_sources_from_result
 
-        items = []
-        for i in range(3):
-            item = MagicMock()
-            item.type = "function_call_item"
-            item.name = "get_stock_info"
-            item.call_id = f"call_{i}"
-            item.arguments = json.dumps({"symbol": "AAPL"})
-            items.append(item)
+def _run_result(*turns):
+    """Runner result stand-in with one raw model response per turn."""
+    return SimpleNamespace(raw_responses=[SimpleNamespace(output=list(items)) for items in turns])
 
-        mock_result = MagicMock()
-        mock_result.new_items = items
 
-        sources = _extract_tool_sources_from_result(mock_result)
-        assert len(sources) == 1  # Deduplicated
+def _source(name, call_id, **fields):
+    return {"type": "tool", "tool_name": name, "call_id": call_id, **fields}
 
-    def test_handles_empty_result(self):
-        from datascraper.datascraper import _extract_tool_sources_from_result
 
-        mock_result = MagicMock()
-        mock_result.new_items = []
-        sources = _extract_tool_sources_from_result(mock_result)
-        assert sources == []
-
-    def test_handles_missing_new_items(self):
-        from datascraper.datascraper import _extract_tool_sources_from_result
+class TestToolSourceExtraction:
+    """Test _extract_tool_sources_from_result from datascraper."""
 
-        mock_result = MagicMock(spec=[])  # No attributes
-        sources = _extract_tool_sources_from_result(mock_result)
-        assert sources == []
+    @pytest.mark.parametrize("run_result, expected", [
+        pytest.param(
+            _run_result([_call("get_stock_info", "call_123", symbol="AAPL")]),
+            [_source("get_stock_info", "call_123", symbol="AAPL")],
+            id="extracts_function_calls",
+        ),
+        pytest.param(
+            _run_result(
+                [_call("get_stock_info", "call_1", symbol="AAPL")],
+                [_call("get_stock_info", "call_1", symbol="AAPL")],
+            ),
+            [_source("get_stock_info", "call_1", symbol="AAPL")],
+            id="deduplicates_call_ids_across_turns",
+        ),
+        pytest.param(
+            _run_result([_call("get_stock_info", f"call_{i}", symbol="AAPL") for i in range(3)]),
+            [_source("get_stock_info", f"call_{i}", symbol="AAPL") for i in range(3)],
+            id="keeps_repeat_calls_to_same_tool",
+        ),
+        pytest.param(
+            _run_result([
+                _call("get_stock_info", "call_1", symbol="AAPL"),
+                _call("get_stock_history", "call_2", symbol="MSFT", period="1mo"),
+                # Non-function items must be ignored
+                SimpleNamespace(type="message", content="some output"),
+            ]),
+            [
+                _source("get_stock_info", "call_1", symbol="AAPL"),
+                _source("get_stock_history", "call_2", symbol="MSFT"),
+            ],
+            id="extracts_multiple_tools",
+        ),
+        pytest.param(_run_result(), [], id="empty_result"),
+        pytest.param(object(), [], id="missing_raw_responses"),
+    ])
+    def test_extract_tool_sources(self, run_result, expected):
+        assert _extract_tool_sources_from_result(run_result) == expected
+
+
+class TestRolePrefixSplitting:
+    """Test _split_role_prefix from datascraper."""
+
+    @pytest.mark.parametrize("content, expected", [
+        pytest.param("[SYSTEM MESSAGE]: Be brief", ("system", "Be brief"), id="system"),
+        pytest.param("[USER MESSAGE]: AAPL price?", ("user", "AAPL price?"), id="user"),
+        pytest.param("[USER QUESTION]: AAPL price?", ("user", "AAPL price?"), id="user_question"),
+        pytest.param("[ASSISTANT MESSAGE]: $150", ("assistant", "$150"), id="assistant"),
+        pytest.param("[ASSISTANT RESPONSE]: $150", ("assistant", "$150"), id="assistant_response"),
+        pytest.param("plain text", (None, "plain text"), id="unlabelled"),
+        pytest.param("[USER MESSAGE]:no space", (None, "[USER MESSAGE]:no space"), id="header_needs_space"),
+        pytest.param("Re: [USER MESSAGE]: x", (None, "Re: [USER MESSAGE]: x"), id="header_only_at_start"),
+    ])
+    def test_split_role_prefix(self, content, expected):
+        assert _split_role_prefix(content) == expected
+
+
+class TestPrepareMessages:
+    """Test _prepare_messages from datascraper."""
+
+    @pytest.mark.parametrize("history", [
+        pytest.param(["[USER MESSAGE]: hi", "[ASSISTANT MESSAGE]: hello"], id="question_not_recorded"),
+        pytest.param(
+            ["[USER MESSAGE]: hi", "[ASSISTANT MESSAGE]: hello", "[USER MESSAGE]: AAPL price?"],
+            id="question_already_recorded",
+        ),
+    ])
+    def test_question_sent_once(self, history):
+        msgs, _ = _prepare_messages([{"content": c} for c in history], "AAPL price?")
+        assert [m["content"] for m in msgs[1:]] == ["hi", "hello", "AAPL price?"]
+
+    def test_reads_role_fields(self):
+        history = [
+            {"role": "system", "content": "Be brief"},
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "hello"},
+        ]
+        msgs, system_message = _prepare_messages(history, "AAPL price?")
+        assert system_message == "Be brief"
+        assert msgs[1:] == [
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "hello"},
+            {"role": "user", "content": "AAPL price?"},
+        ]
 
-    def test_extracts_multiple_tools(self):
-        from datascraper.datascraper import _extract_tool_sources_from_result
 
-        item1 = MagicMock()
-        item1.type = "function_call_item"
-        item1.name = "get_stock_info"
-        item1.call_id = "call_1"
-        item1.arguments = json.dumps({"symbol": "AAPL"})
+async def test_responses_search_reads_legacy_headers_and_roles(monkeypatch):
+    """The Responses API path parses history through the shared role helper."""
+    from datascraper import openai_search
 
-        item2 = MagicMock()
-        item2.type = "function_call_item"
-        item2.name = "get_stock_history"
-        item2.call_id = "call_2"
-        item2.arguments = json.dumps({"symbol": "MSFT", "period": "1mo"})
+    calls = []
 
-        # Also include a non-function item that should be ignored
-        item3 = MagicMock()
-        item3.type = "tool_call_output_item"
-        item3.output = "some output"
+    async def create(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(output_text="AAPL is at $200.")
 
-        mock_result = MagicMock()
-        mock_result.new_items = [item1, item2, item3]
+    monkeypatch.setattr(openai_search, "async_client",
+                        SimpleNamespace(responses=SimpleNamespace(create=create)))
+    history = [
+        {"content": "[USER MESSAGE]: hi"},
+        {"role": "assistant", "content": "hello"},
+        {"role": "user", "content": "AAPL price?"},
+    ]
+    text, _ = await openai_search.create_responses_api_search_async("AAPL price?", history)
 
-        sources = _extract_tool_sources_from_result(mock_result)
-        assert len(sources) == 2
-        tool_names = {s["tool_name"] for s in sources}
-        assert tool_names == {"get_stock_info", "get_stock_history"}
+    assert text == "AAPL is at $200."
+    assert "[CONVERSATION HISTORY]:\nUser: hi\nAssistant: hello" in calls[0]["input"]
 
 
 # ---------------------------------------------------------------------------
@@ -428,12 +428,10 @@ class TestModelsList:
     """Test GET /v1/models."""
 
     def test_returns_models_in_openai_format(self):
-        from api.openai_views import models_list
-        os.environ.pop("FINGPT_API_KEY", None)
         request = _make_request(method='GET')
         response = models_list(request)
         assert response.status_code == 200
-        data = json.loads(response.content)
+        data = _decode(response)
         assert data["object"] == "list"
         assert len(data["data"]) > 0
         for model in data["data"]:
@@ -442,8 +440,6 @@ class TestModelsList:
             assert "owned_by" in model
 
     def test_post_method_not_allowed(self):
-        from api.openai_views import models_list
-        os.environ.pop("FINGPT_API_KEY", None)
         request = _make_request(method='POST')
         response = models_list(request)
         assert response.status_code == 405
@@ -1,35 +1,28 @@
 """Tests for get_options_summary handler."""
 
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
 import json
+from collections import namedtuple
+import numpy as np
 import pandas as pd
 from mcp_server.handlers.options_summary import aggregate_chain
 
+# Stand-in for yfinance's option chain result, which exposes .calls and .puts
+Chain = namedtuple("Chain", ["calls", "puts"])
 
-def _make_chain(call_vols, put_vols, call_oi, put_oi):
-    """Create a mock option chain with calls and puts DataFrames."""
-    calls = pd.DataFrame({
-        "volume": call_vols,
-        "openInterest": call_oi,
-        "strike": [100.0] * len(call_vols),
-    })
-    puts = pd.DataFrame({
-        "volume": put_vols,
-        "openInterest": put_oi,
-        "strike": [100.0] * len(put_vols),
+
+def _side_frame(vols, oi):
+    """One side of a chain, typed float64 up front like yfinance's NaN-bearing columns."""
+    vols = np.asarray(vols, dtype=np.float64)
+    return pd.DataFrame({
+        "volume": vols,
+        "openInterest": np.asarray(oi, dtype=np.float64),
+        "strike": np.full(len(vols), 100.0),
     })
 
-    class Chain:
-        pass
 
-    c = Chain()
-    c.calls = calls
-    c.puts = puts
-    return c
+def _make_chain(call_vols, put_vols, call_oi, put_oi):
+    """Create a mock option chain with calls and puts DataFrames."""
+    return Chain(calls=_side_frame(call_vols, call_oi), puts=_side_frame(put_vols, put_oi))
 
 
 def test_aggregate_chain_basic():
@@ -3,107 +3,104 @@ from planner.planner import Planner
 from planner.plan import ExecutionPlan
 
 
-class TestPlanner:
-    def setup_method(self):
-        self.planner = Planner()
+@pytest.fixture(scope="session")
+def planner():
+    """plan() only reads the skill registry, so one Planner serves every test."""
+    return Planner()
+
+
+# (query, domain, accepted skills, tool that must be allowed or None)
+_INTENT_CASES = [
+    pytest.param("what is AAPL stock price?", "finance.yahoo.com",
+                 {"stock_fundamentals"}, "get_stock_info", id="stock_price"),
+    pytest.param("show me options volume for AVGO", "finance.yahoo.com",
+                 {"options_analysis"}, "get_options_summary", id="options"),
+    # stock_fundamentals now includes get_earnings_info and matches EPS,
+    # so it may win over financial_statements for simple EPS queries
+    pytest.param("when are MSFT earnings and what's the EPS estimate?", None,
+                 {"stock_fundamentals", "financial_statements"}, "get_earnings_info", id="earnings"),
+    pytest.param("what's the RSI for BTC?", None,
+                 {"technical_analysis"}, None, id="technical_analysis"),
+    pytest.param("find me biotech investment ideas", None,
+                 {"web_research"}, None, id="fallback"),
+    # Commodity and crypto prices are not on Yahoo's equity tools
+    pytest.param("What is gold price?", None, {"web_research"}, None, id="gold_price"),
+    pytest.param("bitcoin price", None, {"web_research"}, None, id="bitcoin_price"),
+    pytest.param("what is the oil price", None, {"web_research"}, None, id="oil_price"),
+]
+
 
-    def test_plan_returns_execution_plan(self):
-        plan = self.planner.plan(
+class TestPlanner:
+    def test_plan_returns_execution_plan(self, planner):
+        plan = planner.plan(
             user_query="summarize this page",
             system_prompt="[CURRENT PAGE CONTENT - Already scraped, do NOT re-scrape]:\n- From https://example.com:\nSome content here",
             domain="example.com",
         )
         assert isinstance(plan, ExecutionPlan)
 
-    def test_summarize_plan_no_tools(self):
-        plan = self.planner.plan(
+    def test_summarize_plan_no_tools(self, planner):
+        plan = planner.plan(
             user_query="what does this article say?",
             system_prompt="[CURRENT PAGE CONTENT - Already scraped, do NOT re-scrape]:\n- From https://example.com:\nArticle about earnings...",
             domain="example.com",
         )
         assert plan.skill_name == "summarize_page"
-        assert plan.tools_allowed == []
+        assert plan.tools_allowed == ()
         assert plan.max_turns == 1
         assert plan.instructions is not None
         assert "Article about earnings" in plan.instructions
 
-    def test_stock_price_plan(self):
-        plan = self.planner.plan(
+    @pytest.mark.parametrize("query,domain,skills,tool", _INTENT_CASES)
+    def test_intent_routing(self, planner, query, domain, skills, tool):
+        plan = planner.plan(user_query=query, system_prompt=None, domain=domain)
+        assert plan.skill_name in skills
+        if tool is not None:
+            assert tool in plan.tools_allowed
+
+    def test_tool_plan_budget(self, planner):
+        plan = planner.plan(
             user_query="what is AAPL stock price?",
             system_prompt=None,
             domain="finance.yahoo.com",
         )
-        assert plan.skill_name == "stock_fundamentals"
-        assert "get_stock_info" in plan.tools_allowed
         assert plan.max_turns == 5
         assert plan.instructions is None
 
-    def test_fallback_plan(self):
-        plan = self.planner.plan(
+    def test_fallback_plan_is_unrestricted(self, planner):
+        plan = planner.plan(
             user_query="find me biotech investment ideas",
             system_prompt=None,
             domain=None,
         )
-        assert plan.skill_name == "web_research"
         assert plan.tools_allowed is None
         assert plan.max_turns == 10
 
-    def test_prescraped_detection(self):
-        plan = self.planner.plan(
+    def test_prescraped_detection(self, planner):
+        plan = planner.plan(
             user_query="summarize this",
             system_prompt="[CURRENT PAGE CONTENT - Already scraped, do NOT re-scrape]:\n- From url:\nContent",
             domain=None,
         )
         assert plan.skill_name == "summarize_page"
 
-    def test_no_prescraped_detection(self):
-        plan = self.planner.plan(
+    def test_no_prescraped_detection(self, planner):
+        plan = planner.plan(
             user_query="summarize this",
             system_prompt="Some other system prompt without page content",
             domain=None,
         )
         assert plan.skill_name == "web_research"
 
-    def test_options_plan(self):
-        plan = self.planner.plan(
-            user_query="show me options volume for AVGO",
-            system_prompt=None,
-            domain="finance.yahoo.com",
-        )
-        assert plan.skill_name == "options_analysis"
-        assert "get_options_summary" in plan.tools_allowed
-
-    def test_earnings_plan(self):
-        plan = self.planner.plan(
-            user_query="when are MSFT earnings and what's the EPS estimate?",
-            system_prompt=None,
-            domain=None,
-        )
-        # stock_fundamentals now includes get_earnings_info and matches EPS,
-        # so it may win over financial_statements for simple EPS queries
-        assert plan.skill_name in {"stock_fundamentals", "financial_statements"}
-        assert "get_earnings_info" in plan.tools_allowed
-
-    def test_technical_analysis_plan(self):
-        plan = self.planner.plan(
-            user_query="what's the RSI for BTC?",
-            system_prompt=None,
-            domain=None,
-        )
-        assert plan.skill_name == "technical_analysis"
-
 
 class TestPlannerEdgeCases:
-    def setup_method(self):
-        self.planner = Planner()
-
-    def test_empty_query(self):
-        plan = self.planner.plan(user_query="", system_prompt=None, domain=None)
+    def test_empty_query(self, planner):
+        plan = planner.plan(user_query="", system_prompt=None, domain=None)
         assert plan.skill_name == "web_research"  # Fallback
 
-    def test_prescraped_but_data_query(self):
+    def test_prescraped_but_data_query(self, planner):
         """Pre-scraped content exists but user asks for stock data → use data skill, not summarize."""
-        plan = self.planner.plan(
+        plan = planner.plan(
             user_query="what is the PE ratio?",
             system_prompt="[CURRENT PAGE CONTENT - Already scraped, do NOT re-scrape]:\n- From url:\nSome article",
             domain="finance.yahoo.com",
@@ -111,9 +108,9 @@ class TestPlannerEdgeCases:
         assert plan.skill_name == "stock_fundamentals"
         assert plan.instructions is None  # No override — use PromptBuilder
 
-    def test_multiple_intents_highest_wins(self):
+    def test_multiple_intents_highest_wins(self, planner):
         """When query matches multiple skills, the highest-confidence one wins."""
-        plan = self.planner.plan(
+        plan = planner.plan(
             user_query="what is AAPL RSI and earnings date?",
             system_prompt=None,
             domain=None,
@@ -122,13 +119,13 @@ class TestPlannerEdgeCases:
         # Any is acceptable, but it should not be web_research.
         assert plan.skill_name in {"technical_analysis", "financial_statements", "stock_fundamentals"}
 
-    def test_none_system_prompt(self):
-        plan = self.planner.plan(user_query="hello", system_prompt=None, domain=None)
+    def test_none_system_prompt(self, planner):
+        plan = planner.plan(user_query="hello", system_prompt=None, domain=None)
         assert isinstance(plan, ExecutionPlan)
 
-    def test_summarize_with_web_search_only(self):
+    def test_summarize_with_web_search_only(self, planner):
         """Web search results (not page content) should NOT trigger SummarizePageSkill."""
-        plan = self.planner.plan(
+        plan = planner.plan(
             user_query="summarize the search results",
             system_prompt="[WEB SEARCH RESULTS]:\n- From google.com: some results",
             domain=None,
@@ -5,6 +5,14 @@ Tests the full flow from message_list → planner → create_fin_agent.
 import pytest
 from unittest.mock import patch
 
+from planner.planner import Planner
+
+
+@pytest.fixture(scope="module")
+def planner():
+    """plan() only reads the skill registry, so one Planner serves the module."""
+    return Planner()
+
 
 class TestPlannerIntegration:
     """Test that the planner integration in datascraper works end-to-end."""
@@ -16,11 +24,8 @@ class TestPlannerIntegration:
              patch.dict("os.environ", {"OPENAI_API_KEY": "test", "GOOGLE_API_KEY": ""}):
             yield
 
-    def test_summarize_uses_zero_tools(self, mock_deps):
+    def test_summarize_uses_zero_tools(self, mock_deps, planner):
         """When prescraped content exists and user asks to summarize, agent gets zero tools."""
-        from planner.planner import Planner
-
-        planner = Planner()
         plan = planner.plan(
             user_query="summarize this page",
             system_prompt=(
@@ -31,16 +36,13 @@ class TestPlannerIntegration:
         )
 
         assert plan.skill_name == "summarize_page"
-        assert plan.tools_allowed == []
+        assert plan.tools_allowed == ()
         assert plan.max_turns == 1
         assert plan.instructions is not None
         assert "Earnings report for Q4" in plan.instructions
 
-    def test_fallback_uses_all_tools(self, mock_deps):
+    def test_fallback_uses_all_tools(self, mock_deps, planner):
         """Complex queries with no skill match get full tool access."""
-        from planner.planner import Planner
-
-        planner = Planner()
         plan = planner.plan(
             user_query="research biotech trends and navigate to FDA.gov",
             system_prompt=None,
@@ -51,11 +53,8 @@ class TestPlannerIntegration:
         assert plan.tools_allowed is None
         assert plan.max_turns == 10
 
-    def test_stock_query_gets_filtered_tools(self, mock_deps):
+    def test_stock_query_gets_filtered_tools(self, mock_deps, planner):
         """Stock price queries get only fundamental tools."""
-        from planner.planner import Planner
-
-        planner = Planner()
         plan = planner.plan(
             user_query="what is the current price of TSLA?",
             system_prompt=None,
@@ -19,6 +19,7 @@ def test_research_config_defaults():
     assert RESEARCH_CONFIG["max_iterations"] == 3
     assert RESEARCH_CONFIG["max_sub_questions"] == 5
     assert RESEARCH_CONFIG["parallel_searches"] is True
+    assert RESEARCH_CONFIG["early_gap_check"] is False
 
 
 def test_get_research_config_returns_copy():
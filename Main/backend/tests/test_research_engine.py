@@ -1,40 +1,103 @@
 """Tests for the multi-step research engine."""
+import asyncio
 import json
+from typing import Literal
+
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from pydantic import ConfigDict, TypeAdapter, with_config
+from typing_extensions import NotRequired, TypedDict
+
+from datascraper import research_engine
+from datascraper.research_engine import (
+    GapDetector,
+    QueryAnalyzer,
+    ResearchExecutor,
+    Synthesizer,
+    run_iterative_research,
+    run_iterative_research_streaming,
+)
+
+
+# Shape contracts for what QueryAnalyzer / GapDetector hand back to the
+# orchestrator. Strict, so e.g. a "false" string can't pass for a bool.
+@with_config(ConfigDict(strict=True))
+class _SubQuestion(TypedDict):
+    question: str
+    type: Literal["numerical", "qualitative", "analytical"]
+    preferred_source: NotRequired[Literal["mcp", "web"]]
+
+
+@with_config(ConfigDict(strict=True))
+class _ResearchPlan(TypedDict):
+    needs_decomposition: bool
+    sub_questions: list[_SubQuestion]
+
+
+@with_config(ConfigDict(strict=True))
+class _GapResult(TypedDict):
+    complete: bool
+    gaps: list[str]
+    follow_up_queries: list[_SubQuestion]
+
+
+# Built once so each test only pays for validation
+_validate_plan = TypeAdapter(_ResearchPlan).validate_python
+_validate_gaps = TypeAdapter(_GapResult).validate_python
+
+# Constant planner payloads, serialized once at import
+_SIMPLE_PLAN = json.dumps({"needs_decomposition": False, "sub_questions": []})
+_COMPLETE_GAPS = json.dumps({"complete": True, "gaps": [], "follow_up_queries": []})
+_EIGHT_QUESTION_PLAN = json.dumps({
+    "needs_decomposition": True,
+    "sub_questions": [{"question": f"Q{i}", "type": "qualitative"} for i in range(8)],
+})
+
+
+def _decomposed(*sub_questions):
+    """Analyzer payload splitting the query into (question, type) pairs."""
+    return {
+        "needs_decomposition": True,
+        "sub_questions": [{"question": q, "type": t} for q, t in sub_questions],
+    }
+
+
+# ── Analyzer pre-filter tests ────────────────────────────────────────
+
+@pytest.mark.parametrize("query, expected", [
+    pytest.param("What is AAPL price?", False, id="one_ticker"),
+    pytest.param("What is the RSI and MACD for TSLA?", True, id="conjunction"),
+    pytest.param("What is the EPS and PE of NVDA", True, id="jargon_with_and"),
+    pytest.param("TSLA PE ratio", False, id="jargon_not_a_ticker"),
+    pytest.param("TSLA EPS this quarter", True, id="two_skills_match"),
+    pytest.param("AAPL vs MSFT", True, id="versus"),
+    pytest.param("AAPL MSFT GOOG prices", True, id="several_tickers"),
+    pytest.param("how has apple stock performed over each of the last five fiscal years", True, id="long"),
+    pytest.param("latest fed decision", False, id="no_ticker"),
+    pytest.param("NVDA revenue each quarter of 2024", True, id="multi_period"),
+    pytest.param("AAPL revenue 2021-2024", True, id="year_range"),
+    pytest.param("AAPL price, PE and dividend yield", True, id="multi_metric"),
+    pytest.param("AAPL market cap, beta", True, id="metric_list"),
+])
+def test_needs_llm_analyzer(query, expected):
+    assert research_engine._needs_llm_analyzer(query) is expected
 
 
 # ── QueryAnalyzer tests ──────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_query_analyzer_simple_query_bypasses():
+async def test_query_analyzer_simple_query_bypasses(fake_llm):
     """Simple single-ticker queries should not need decomposition."""
-    from datascraper.research_engine import QueryAnalyzer
-
-    # Mock the OpenAI Chat Completions call
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = json.dumps({
-        "needs_decomposition": False,
-        "sub_questions": []
-    })
+    fake_llm.set("planner", _SIMPLE_PLAN)
 
-    with patch("datascraper.research_engine._call_planner", new_callable=AsyncMock, return_value=mock_response):
-        analyzer = QueryAnalyzer()
-        plan = await analyzer.analyze("What is AAPL stock price?")
+    analyzer = QueryAnalyzer()
+    plan = _validate_plan(await analyzer.analyze("What is AAPL stock price?"))
 
     assert plan["needs_decomposition"] is False
     assert plan["sub_questions"] == []
 
 
-@pytest.mark.asyncio
-async def test_query_analyzer_complex_query_decomposes():
+async def test_query_analyzer_complex_query_decomposes(fake_llm):
     """Multi-part queries should be decomposed into sub-questions."""
-    from datascraper.research_engine import QueryAnalyzer
-
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = json.dumps({
+    fake_llm.set("planner", {
         "needs_decomposition": True,
         "sub_questions": [
             {"question": "AAPL quarterly revenue Q2-Q4 2025", "type": "numerical"},
@@ -42,172 +105,295 @@ async def test_query_analyzer_complex_query_decomposes():
         ]
     })
 
-    with patch("datascraper.research_engine._call_planner", new_callable=AsyncMock, return_value=mock_response):
-        analyzer = QueryAnalyzer()
-        plan = await analyzer.analyze("Compare AAPL and MSFT revenue growth over the last 3 quarters")
+    analyzer = QueryAnalyzer()
+    plan = _validate_plan(await analyzer.analyze("Compare AAPL and MSFT revenue growth over the last 3 quarters"))
 
     assert plan["needs_decomposition"] is True
     assert len(plan["sub_questions"]) == 2
     assert plan["sub_questions"][0]["type"] == "numerical"
 
 
-@pytest.mark.asyncio
-async def test_query_analyzer_caps_sub_questions():
+async def test_query_analyzer_caps_sub_questions(fake_llm):
     """Sub-questions should be capped at max_sub_questions."""
-    from datascraper.research_engine import QueryAnalyzer
-
     # Return 8 sub-questions, should be capped to 5
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = json.dumps({
-        "needs_decomposition": True,
-        "sub_questions": [{"question": f"Q{i}", "type": "qualitative"} for i in range(8)]
-    })
+    fake_llm.set("planner", _EIGHT_QUESTION_PLAN)
 
-    with patch("datascraper.research_engine._call_planner", new_callable=AsyncMock, return_value=mock_response):
-        analyzer = QueryAnalyzer(max_sub_questions=5)
-        plan = await analyzer.analyze("Very complex query")
+    analyzer = QueryAnalyzer(max_sub_questions=5)
+    plan = _validate_plan(await analyzer.analyze("Very complex query"))
 
     assert len(plan["sub_questions"]) == 5
 
 
-@pytest.mark.asyncio
-async def test_query_analyzer_handles_malformed_json():
+async def test_query_analyzer_handles_malformed_json(fake_llm):
     """If the LLM returns invalid JSON, fall back to no-decomposition."""
-    from datascraper.research_engine import QueryAnalyzer
-
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = "not valid json {{"
+    fake_llm.set("planner", "not valid json {{")
 
-    with patch("datascraper.research_engine._call_planner", new_callable=AsyncMock, return_value=mock_response):
-        analyzer = QueryAnalyzer()
-        plan = await analyzer.analyze("Some query")
+    analyzer = QueryAnalyzer()
+    plan = _validate_plan(await analyzer.analyze("Some query"))
 
     assert plan["needs_decomposition"] is False
 
 
-# ── ResearchExecutor tests ────────────────────────────────────────────
+async def test_query_analyzer_keeps_only_known_source_hints(fake_llm):
+    """preferred_source survives validation only when it names a real route."""
+    fake_llm.set("planner", {
+        "needs_decomposition": True,
+        "sub_questions": [
+            {"question": "US CPI last month", "type": "numerical", "preferred_source": "web"},
+            {"question": "AAPL revenue", "type": "numerical", "preferred_source": "bloomberg"},
+        ]
+    })
+
+    plan = _validate_plan(await QueryAnalyzer().analyze("CPI vs AAPL revenue"))
+
+    assert plan["sub_questions"][0]["preferred_source"] == "web"
+    assert "preferred_source" not in plan["sub_questions"][1]
 
-@pytest.mark.asyncio
-async def test_executor_routes_numerical_to_mcp():
-    """Numerical sub-questions should attempt MCP first."""
-    from datascraper.research_engine import ResearchExecutor
 
-    plan = {
+async def test_query_analyzer_reuses_plan_for_repeated_query(fake_llm):
+    """An identical query within the TTL is answered from cache, not the planner."""
+    fake_llm.set("planner", _decomposed(("AAPL price", "numerical"), ("MSFT price", "numerical")))
+
+    first = await QueryAnalyzer().analyze("Compare AAPL and MSFT prices")
+    first["sub_questions"].clear()  # callers mutating their copy must not poison the cache
+    second = await QueryAnalyzer().analyze("Compare AAPL and MSFT prices")
+
+    assert len(fake_llm.calls["planner"]) == 1
+    assert len(second["sub_questions"]) == 2
+
+
+async def test_query_analyzer_does_not_cache_fallback_plans(fake_llm):
+    """A failed parse is retried on the next call rather than remembered."""
+    fake_llm.set_sequence("planner", ["not valid json {{", _SIMPLE_PLAN])
+
+    await QueryAnalyzer().analyze("Some query")
+    await QueryAnalyzer().analyze("Some query")
+
+    assert len(fake_llm.calls["planner"]) == 2
+
+
+@pytest.mark.parametrize("raw", [
+    pytest.param('{"needs_decomposition": true, "sub_questions": [{"quest', id="truncated"),
+    pytest.param('[{"question": "AAPL price", "type": "numerical"}]', id="not_an_object"),
+])
+async def test_query_analyzer_degrades_on_unusable_json(fake_llm, raw):
+    """Truncated or non-object replies fall back to no-decomposition."""
+    fake_llm.set("planner", raw)
+
+    plan = _validate_plan(await QueryAnalyzer().analyze("Compare AAPL and MSFT"))
+
+    assert plan == {"needs_decomposition": False, "sub_questions": []}
+
+
+async def _streamed_sub_questions(query, **kwargs):
+    return [sq async for sq in QueryAnalyzer(**kwargs).analyze_streaming(query)]
+
+
+@pytest.mark.parametrize("reply", [
+    pytest.param(_EIGHT_QUESTION_PLAN, id="capped"),
+    pytest.param(_SIMPLE_PLAN, id="simple"),
+    pytest.param({
+        "needs_decomposition": True,
         "sub_questions": [
-            {"question": "AAPL current stock price", "type": "numerical"},
-        ]
-    }
+            "AAPL price",
+            {"question": "US CPI last month", "type": "numerical", "preferred_source": "web"},
+            {"type": "numerical"},
+            {"question": "AAPL outlook", "type": "forecast", "preferred_source": "bloomberg"},
+        ],
+    }, id="needs_validation"),
+])
+async def test_query_analyzer_streaming_matches_blocking_plan(fake_llm, reply):
+    """Streamed sub-questions are exactly the validated, capped plan analyze() returns."""
+    fake_llm.set("planner", reply)
+
+    plan = await QueryAnalyzer(max_sub_questions=5).analyze("Some query")
+    research_engine._plan_cache.clear()
+    streamed = await _streamed_sub_questions("Some query", max_sub_questions=5)
+
+    assert streamed == (plan["sub_questions"] if plan["needs_decomposition"] else [])
+
 
-    with patch("datascraper.research_engine._try_mcp_search", new_callable=AsyncMock, return_value="$152.34") as mcp_mock, \
-         patch("datascraper.research_engine._web_search", new_callable=AsyncMock) as web_mock:
-        executor = ResearchExecutor(model="gpt-5.2-chat-latest", message_list=[], preferred_urls=[])
-        results = await executor.execute(plan)
+async def test_query_analyzer_streaming_yields_before_reply_ends(fake_llm, monkeypatch):
+    """A sub-question is handed out as soon as the next one opens in the stream."""
+    fake_llm.set("planner", _decomposed(("AAPL price", "numerical"), ("MSFT price", "numerical")))
+    streams = []
+    fake_stream = research_engine._call_planner_streaming
+
+    async def recording_stream(*args, **kwargs):
+        streams.append(await fake_stream(*args, **kwargs))
+        return streams[-1]
+
+    monkeypatch.setattr(research_engine, "_call_planner_streaming", recording_stream)
+
+    sub_questions = QueryAnalyzer().analyze_streaming("Compare AAPL and MSFT prices")
+    first = await anext(sub_questions)
+
+    assert first == {"question": "AAPL price", "type": "numerical"}
+    assert not streams[0].closed
+    assert [sq async for sq in sub_questions] == [{"question": "MSFT price", "type": "numerical"}]
+    assert streams[0].closed
+
+
+async def test_query_analyzer_streaming_keeps_sub_questions_before_a_break(fake_llm):
+    """A reply cut off mid-plan keeps what was complete and is not cached."""
+    fake_llm.set(
+        "planner",
+        '{"needs_decomposition": true, "sub_questions": ['
+        '{"question": "AAPL price", "type": "numerical"}, {"quest',
+    )
+
+    first = await _streamed_sub_questions("Compare AAPL and MSFT")
+    second = await _streamed_sub_questions("Compare AAPL and MSFT")
+
+    assert first == second == [{"question": "AAPL price", "type": "numerical"}]
+    assert len(fake_llm.calls["planner"]) == 2
+
+
+# ── ResearchExecutor tests ────────────────────────────────────────────
+
+def _executor():
+    return ResearchExecutor(model="gpt-5.2-chat-latest", message_list=[], preferred_urls=[])
+
+
+def _single(question, sq_type):
+    return {"sub_questions": [{"question": question, "type": sq_type}]}
+
+
+async def test_executor_routes_numerical_to_mcp(fake_llm):
+    """Numerical sub-questions should attempt MCP first."""
+    fake_llm.set("mcp", "$152.34")
+
+    results = await _executor().execute(_single("AAPL current stock price", "numerical"))
 
     assert len(results) == 1
     assert results[0]["answer"] == "$152.34"
     assert results[0]["source"] == "mcp"
-    mcp_mock.assert_called_once()
-    web_mock.assert_not_called()
+    assert len(fake_llm.calls["mcp"]) == 1
+    assert not fake_llm.calls["web"]
 
 
-@pytest.mark.asyncio
-async def test_executor_falls_back_to_web_on_mcp_failure():
-    """If MCP fails for numerical, fall back to web search."""
-    from datascraper.research_engine import ResearchExecutor
+async def test_executor_shares_mcp_call_for_repeated_question(fake_llm):
+    """The same numerical question asked twice in a request costs one MCP call."""
+    fake_llm.set("mcp", "$152.34")
+    executor = _executor()
 
-    plan = {
-        "sub_questions": [
-            {"question": "AAPL quarterly revenue", "type": "numerical"},
-        ]
-    }
+    results = await executor.execute(
+        _decomposed(("AAPL price", "numerical"), ("aapl  PRICE", "numerical"))
+    )
+    follow_up = await executor.execute(_single("AAPL price", "numerical"))
+
+    assert [r["answer"] for r in results + follow_up] == ["$152.34"] * 3
+    assert len(fake_llm.calls["mcp"]) == 1
+
+
+async def test_executor_cancels_orphaned_mcp_call(fake_llm, monkeypatch):
+    """An MCP call whose sub-question was cancelled does not outlive execute()."""
+    fake_llm.set("web", ("Analysts are upbeat", [{"url": "https://cnbc.com"}]))
+    cancelled = asyncio.Event()
+
+    async def stalled_mcp_search(**kwargs):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(research_engine, "_try_mcp_search", stalled_mcp_search)
+    executor = _executor()
+
+    async def first_result_is_enough(results):
+        return bool(results)
+
+    results = await executor.execute(
+        _decomposed(("AAPL price", "numerical"), ("AAPL analyst outlook", "qualitative")),
+        until=first_result_is_enough,
+    )
+
+    assert [r["source"] for r in results] == ["web"]
+    assert cancelled.is_set()
+    assert executor._mcp_calls == {}
 
-    with patch("datascraper.research_engine._try_mcp_search", new_callable=AsyncMock, return_value=None), \
-         patch("datascraper.research_engine._web_search", new_callable=AsyncMock, return_value=("Revenue was $94.9B", [{"url": "https://yahoo.com"}])):
-        executor = ResearchExecutor(model="gpt-5.2-chat-latest", message_list=[], preferred_urls=[])
-        results = await executor.execute(plan)
+
+async def test_executor_falls_back_to_web_on_mcp_failure(fake_llm):
+    """If MCP fails for numerical, fall back to web search."""
+    fake_llm.set("mcp", None)
+    fake_llm.set("web", ("Revenue was $94.9B", [{"url": "https://yahoo.com"}]))
+
+    results = await _executor().execute(_single("AAPL quarterly revenue", "numerical"))
 
     assert results[0]["source"] == "web"
     assert "94.9B" in results[0]["answer"]
 
 
-@pytest.mark.asyncio
-async def test_executor_routes_qualitative_to_web():
-    """Qualitative sub-questions go straight to web search."""
-    from datascraper.research_engine import ResearchExecutor
+async def test_executor_skips_mcp_for_web_only_numerical(fake_llm):
+    """A numerical sub-question hinted as web-only goes straight to web search."""
+    fake_llm.set("web", ("CPI rose 0.3%", [{"url": "https://bls.gov"}]))
 
-    plan = {
-        "sub_questions": [
-            {"question": "Latest AAPL earnings analysis", "type": "qualitative"},
-        ]
-    }
+    results = await _executor().execute({"sub_questions": [
+        {"question": "US CPI last month", "type": "numerical", "preferred_source": "web"},
+    ]})
+
+    assert not fake_llm.calls["mcp"]
+    assert results[0]["source"] == "web"
 
-    with patch("datascraper.research_engine._try_mcp_search", new_callable=AsyncMock) as mcp_mock, \
-         patch("datascraper.research_engine._web_search", new_callable=AsyncMock, return_value=("Analysts say...", [{"url": "https://cnbc.com"}])):
-        executor = ResearchExecutor(model="gpt-5.2-chat-latest", message_list=[], preferred_urls=[])
-        results = await executor.execute(plan)
 
-    mcp_mock.assert_not_called()
+async def test_executor_routes_qualitative_to_web(fake_llm):
+    """Qualitative sub-questions go straight to web search."""
+    fake_llm.set("web", ("Analysts say...", [{"url": "https://cnbc.com"}]))
+
+    results = await _executor().execute(_single("Latest AAPL earnings analysis", "qualitative"))
+
+    assert not fake_llm.calls["mcp"]
     assert results[0]["source"] == "web"
 
 
-@pytest.mark.asyncio
-async def test_executor_skips_analytical():
+async def test_executor_skips_analytical(fake_llm):
     """Analytical sub-questions produce a placeholder (no search)."""
-    from datascraper.research_engine import ResearchExecutor
+    results = await _executor().execute(_single("Compare growth rates", "analytical"))
 
-    plan = {
-        "sub_questions": [
-            {"question": "Compare growth rates", "type": "analytical"},
-        ]
-    }
+    assert not fake_llm.calls["mcp"]
+    assert not fake_llm.calls["web"]
+    assert results[0]["source"] == "deferred"
 
-    with patch("datascraper.research_engine._try_mcp_search", new_callable=AsyncMock) as mcp_mock, \
-         patch("datascraper.research_engine._web_search", new_callable=AsyncMock) as web_mock:
-        executor = ResearchExecutor(model="gpt-5.2-chat-latest", message_list=[], preferred_urls=[])
-        results = await executor.execute(plan)
 
-    mcp_mock.assert_not_called()
-    web_mock.assert_not_called()
-    assert results[0]["source"] == "deferred"
+async def test_executor_keeps_sibling_results_when_one_fails(fake_llm, monkeypatch):
+    """A raising sub-question becomes an error record; the rest still answer, in order."""
+    async def web_search(question, **kwargs):
+        if question.startswith("MSFT"):
+            raise RuntimeError("search backend down")
+        return "AAPL beat estimates", [{"url": "https://cnbc.com"}]
+
+    monkeypatch.setattr(research_engine, "_web_search", web_search)
+
+    results = await _executor().execute({"sub_questions": [
+        {"question": "AAPL earnings reaction", "type": "qualitative"},
+        {"question": "MSFT earnings reaction", "type": "qualitative"},
+    ]})
+
+    assert [r["source"] for r in results] == ["web", "error"]
+    assert "search backend down" in results[1]["answer"]
 
 
 # ── GapDetector tests ─────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_gap_detector_complete():
+async def test_gap_detector_complete(fake_llm):
     """When all data is present, gap detector returns complete=True."""
-    from datascraper.research_engine import GapDetector
-
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = json.dumps({
-        "complete": True,
-        "gaps": [],
-        "follow_up_queries": []
-    })
+    fake_llm.set("planner", _COMPLETE_GAPS)
 
-    with patch("datascraper.research_engine._call_planner", new_callable=AsyncMock, return_value=mock_response):
-        detector = GapDetector()
-        result = await detector.detect(
-            original_query="What is AAPL price?",
-            plan={"sub_questions": [{"question": "AAPL price", "type": "numerical"}]},
-            results=[{"question": "AAPL price", "answer": "$152.34", "source": "mcp"}],
-        )
+    detector = GapDetector()
+    result = _validate_gaps(await detector.detect(
+        original_query="What is AAPL price?",
+        plan={"sub_questions": [{"question": "AAPL price", "type": "numerical"}]},
+        results=[{"question": "AAPL price", "answer": "$152.34", "source": "mcp"}],
+    ))
 
     assert result["complete"] is True
     assert result["follow_up_queries"] == []
 
 
-@pytest.mark.asyncio
-async def test_gap_detector_finds_gaps():
+async def test_gap_detector_finds_gaps(fake_llm):
     """When data is missing, gap detector returns follow-up queries."""
-    from datascraper.research_engine import GapDetector
-
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = json.dumps({
+    fake_llm.set("planner", {
         "complete": False,
         "gaps": ["Missing MSFT Q3 revenue"],
         "follow_up_queries": [
@@ -215,111 +401,134 @@ async def test_gap_detector_finds_gaps():
         ]
     })
 
-    with patch("datascraper.research_engine._call_planner", new_callable=AsyncMock, return_value=mock_response):
-        detector = GapDetector()
-        result = await detector.detect(
-            original_query="Compare AAPL and MSFT revenue",
-            plan={"sub_questions": []},
-            results=[{"question": "AAPL revenue", "answer": "$94.9B"}],
-        )
+    detector = GapDetector()
+    result = _validate_gaps(await detector.detect(
+        original_query="Compare AAPL and MSFT revenue",
+        plan={"sub_questions": []},
+        results=[{"question": "AAPL revenue", "answer": "$94.9B"}],
+    ))
 
     assert result["complete"] is False
     assert len(result["follow_up_queries"]) == 1
 
 
+async def test_gap_detector_treats_non_object_reply_as_complete(fake_llm):
+    """A reply that isn't a JSON object must not crash the loop or trigger follow-ups."""
+    fake_llm.set("planner", '["MSFT Q3 2025 revenue"]')
+
+    result = _validate_gaps(await GapDetector().detect(
+        original_query="Compare AAPL and MSFT revenue",
+        plan={"sub_questions": []},
+        results=[],
+    ))
+
+    assert result == {"complete": True, "gaps": [], "follow_up_queries": []}
+
+
 # ── Synthesizer tests ─────────────────────────────────────────────────
 
-@pytest.mark.asyncio
-async def test_synthesizer_combines_results():
+async def test_synthesizer_combines_results(fake_llm):
     """Synthesizer should produce a final response from collected results."""
-    from datascraper.research_engine import Synthesizer
-
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = "AAPL revenue was $94.9B, MSFT was $64.7B. AAPL grew 8% vs MSFT 12%."
-
-    with patch("datascraper.research_engine._call_synthesis", new_callable=AsyncMock, return_value=mock_response):
-        synth = Synthesizer(model="gpt-5.2-chat-latest")
-        text = await synth.synthesize(
-            original_query="Compare AAPL and MSFT revenue",
-            results=[
-                {"question": "AAPL revenue", "answer": "$94.9B", "sources": []},
-                {"question": "MSFT revenue", "answer": "$64.7B", "sources": []},
-            ],
-        )
+    fake_llm.set("synthesis", "AAPL revenue was $94.9B, MSFT was $64.7B. AAPL grew 8% vs MSFT 12%.")
+
+    synth = Synthesizer(model="gpt-5.2-chat-latest")
+    text = await synth.synthesize(
+        original_query="Compare AAPL and MSFT revenue",
+        results=[
+            {"question": "AAPL revenue", "answer": "$94.9B", "sources": []},
+            {"question": "MSFT revenue", "answer": "$64.7B", "sources": []},
+        ],
+    )
 
     assert "AAPL" in text
     assert "MSFT" in text
 
 
-# ── Full orchestration tests ──────────────────────────────────────────
+async def test_synthesizer_sends_repeated_answers_once(fake_llm):
+    """Identical answers collapse into one finding carrying every question and URL."""
+    fake_llm.set("synthesis", "done")
+
+    await Synthesizer(model="gpt-5.2-chat-latest").synthesize(
+        original_query="AAPL revenue and sales",
+        results=[
+            {"question": "AAPL revenue", "answer": "$94.9B", "sources": [{"url": "https://a.com"}]},
+            {"question": "AAPL sales", "answer": " $94.9B\n", "sources": [
+                {"url": "https://a.com"}, {"url": "https://b.com"},
+            ]},
+            {"question": "AAPL revenue", "answer": "$94.9B", "sources": []},
+        ],
+    )
+
+    findings = fake_llm.calls["synthesis"][0]["messages"][-1]["content"]
+    assert findings.count("### Sub-question:") == 1
+    assert "### Sub-question: AAPL revenue / AAPL sales\n$94.9B" in findings
+    assert "Sources: https://a.com, https://b.com" in findings
+
+
+async def test_synthesizer_keeps_findings_out_of_the_prompt_prefix(fake_llm):
+    """Only the trailing message varies with the findings, so the prefix stays cacheable."""
+    fake_llm.set("synthesis", "done")
+    synth = Synthesizer(model="gpt-5.2-chat-latest")
+
+    for answer in ("$94.9B", "$95.1B"):
+        await synth.synthesize(
+            original_query="What was AAPL revenue?",
+            results=[{"question": "AAPL revenue", "answer": answer, "sources": []}],
+            time_context="[TIME CONTEXT]: 2026-02-03",
+        )
 
-@pytest.mark.asyncio
-async def test_run_iterative_simple_query_bypasses():
-    """Simple queries should bypass the research engine entirely."""
-    from datascraper.research_engine import run_iterative_research
+    first, second = (call["messages"] for call in fake_llm.calls["synthesis"])
+    assert first[:-1] == second[:-1]
+    assert first[1]["content"] == "Original question: What was AAPL revenue?"
+    assert first[-1]["content"].startswith("[TIME CONTEXT]")
+    assert "$94.9B" in first[-1]["content"] and "$95.1B" in second[-1]["content"]
 
-    analyzer_response = MagicMock()
-    analyzer_response.choices = [MagicMock()]
-    analyzer_response.choices[0].message.content = json.dumps({
-        "needs_decomposition": False, "sub_questions": []
-    })
 
-    with patch("datascraper.research_engine._call_planner", new_callable=AsyncMock, return_value=analyzer_response):
-        result = await run_iterative_research(
-            user_input="What is AAPL price?",
-            message_list=[],
-            model="gpt-5.2-chat-latest",
-        )
+# ── Full orchestration tests ──────────────────────────────────────────
 
-    # Should return None to signal "use existing single-search path"
+async def test_run_iterative_simple_query_bypasses(fake_llm):
+    """Simple queries should bypass the research engine entirely."""
+    result = await run_iterative_research(
+        user_input="What is AAPL price?",
+        message_list=[],
+        model="gpt-5.2-chat-latest",
+    )
+
+    # Should return None to signal "use existing single-search path",
+    # without spending a planner call to find that out
     assert result is None
+    assert not fake_llm.calls["planner"]
 
 
-@pytest.mark.asyncio
-async def test_run_iterative_full_loop():
-    """Complex query runs full loop: analyze -> execute -> gap detect -> synthesize."""
-    from datascraper.research_engine import run_iterative_research
+async def test_run_iterative_asks_planner_when_simple_plan_returned(fake_llm):
+    """A query that passes the pre-filter still bypasses if the planner says so."""
+    fake_llm.set("planner", _SIMPLE_PLAN)
 
-    # 1. Analyzer returns decomposition
-    analyzer_resp = MagicMock()
-    analyzer_resp.choices = [MagicMock()]
-    analyzer_resp.choices[0].message.content = json.dumps({
-        "needs_decomposition": True,
-        "sub_questions": [
-            {"question": "AAPL price", "type": "numerical"},
-            {"question": "MSFT price", "type": "numerical"},
-        ]
-    })
+    result = await run_iterative_research(
+        user_input="AAPL vs MSFT",
+        message_list=[],
+        model="gpt-5.2-chat-latest",
+    )
 
-    # 2. Gap detector says complete
-    gap_resp = MagicMock()
-    gap_resp.choices = [MagicMock()]
-    gap_resp.choices[0].message.content = json.dumps({
-        "complete": True, "gaps": [], "follow_up_queries": []
-    })
+    assert result is None
+    assert len(fake_llm.calls["planner"]) == 1
 
-    # 3. Synthesizer returns final answer
-    synth_resp = MagicMock()
-    synth_resp.choices = [MagicMock()]
-    synth_resp.choices[0].message.content = "AAPL is $150, MSFT is $420."
-
-    planner_calls = [analyzer_resp, gap_resp]
-    planner_call_idx = {"i": 0}
-
-    async def mock_planner(*args, **kwargs):
-        idx = planner_call_idx["i"]
-        planner_call_idx["i"] += 1
-        return planner_calls[idx]
-
-    with patch("datascraper.research_engine._call_planner", side_effect=mock_planner), \
-         patch("datascraper.research_engine._try_mcp_search", new_callable=AsyncMock, side_effect=["$150", "$420"]), \
-         patch("datascraper.research_engine._call_synthesis", new_callable=AsyncMock, return_value=synth_resp):
-        result = await run_iterative_research(
-            user_input="Compare AAPL and MSFT prices",
-            message_list=[],
-            model="gpt-5.2-chat-latest",
-        )
+
+async def test_run_iterative_full_loop(fake_llm):
+    """Complex query runs full loop: analyze -> execute -> gap detect -> synthesize."""
+    # Analyzer decomposes, then the gap detector says complete
+    fake_llm.set_sequence("planner", [
+        _decomposed(("AAPL price", "numerical"), ("MSFT price", "numerical")),
+        _COMPLETE_GAPS,
+    ])
+    fake_llm.set_sequence("mcp", ["$150", "$420"])
+    fake_llm.set("synthesis", "AAPL is $150, MSFT is $420.")
+
+    result = await run_iterative_research(
+        user_input="Compare AAPL and MSFT prices",
+        message_list=[],
+        model="gpt-5.2-chat-latest",
+    )
 
     assert result is not None
     text, sources, metadata = result
@@ -328,6 +537,73 @@ async def test_run_iterative_full_loop():
     assert metadata["sub_questions_count"] == 2
 
 
+async def test_run_iterative_executes_sub_questions_concurrently(fake_llm, monkeypatch):
+    """Independent sub-questions are in flight together, not awaited one by one."""
+    fake_llm.set_sequence("planner", [
+        _decomposed(("AAPL price", "numerical"), ("MSFT price", "numerical")),
+        _COMPLETE_GAPS,
+    ])
+    fake_llm.set("synthesis", "AAPL is $150, MSFT is $420.")
+
+    in_flight = []
+    all_started = asyncio.Event()
+
+    async def mcp_search(question, **kwargs):
+        in_flight.append(question)
+        if len(in_flight) == 2:
+            all_started.set()
+        # A serial executor never starts the second call, so this times out
+        await asyncio.wait_for(all_started.wait(), timeout=1)
+        return "$150" if question.startswith("AAPL") else "$420"
+
+    monkeypatch.setattr(research_engine, "_try_mcp_search", mcp_search)
+
+    result = await run_iterative_research(
+        user_input="Compare AAPL and MSFT prices",
+        message_list=[],
+        model="gpt-5.2-chat-latest",
+    )
+
+    assert all_started.is_set()
+    text, sources, metadata = result
+    assert metadata["sub_questions_count"] == 2
+
+
+async def test_run_iterative_early_gap_check_cancels_stragglers(fake_llm, monkeypatch):
+    """With early gap checks on, a complete verdict stops waiting on slow sub-questions."""
+    cfg = {**research_engine.get_research_config(), "early_gap_check": True}
+    monkeypatch.setattr(research_engine, "get_research_config", lambda: cfg)
+    fake_llm.set_sequence("planner", [
+        _decomposed(("AAPL price", "numerical"), ("AAPL analyst outlook", "qualitative")),
+        _COMPLETE_GAPS,
+    ])
+    fake_llm.set("mcp", "$150")
+    fake_llm.set("synthesis", "AAPL is $150.")
+    cancelled = asyncio.Event()
+
+    async def stalled_web_search(**kwargs):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(research_engine, "_web_search", stalled_web_search)
+
+    text, sources, metadata = await run_iterative_research(
+        user_input="Compare AAPL price and analyst outlook",
+        message_list=[],
+        model="gpt-5.2-chat-latest",
+    )
+
+    assert cancelled.is_set()
+    assert text == "AAPL is $150."
+    # One early check found the evidence complete, so no second gap check ran
+    assert len(fake_llm.calls["planner"]) == 2
+    findings = fake_llm.calls["synthesis"][0]["messages"][-1]["content"]
+    assert "$150" in findings and "analyst outlook" not in findings
+
+
 # ── Streaming orchestration tests ────────────────────────────────────
 
 async def _collect_stream(async_gen):
@@ -338,81 +614,35 @@ async def _collect_stream(async_gen):
     return items
 
 
-def _make_stream_chunk(content: str | None):
-    """Build a mock OpenAI streaming chunk."""
-    chunk = MagicMock()
-    delta = MagicMock()
-    delta.content = content
-    chunk.choices = [MagicMock(delta=delta)]
-    return chunk
+def _stream_research(user_input):
+    return _collect_stream(run_iterative_research_streaming(
+        user_input=user_input,
+        message_list=[],
+        model="gpt-5.2-chat-latest",
+    ))
 
 
-@pytest.mark.asyncio
-async def test_streaming_simple_query_yields_nothing():
+async def test_streaming_simple_query_yields_nothing(fake_llm):
     """Simple queries should yield nothing (bypass signal)."""
-    from datascraper.research_engine import run_iterative_research_streaming
+    fake_llm.set("planner", _SIMPLE_PLAN)
 
-    analyzer_response = MagicMock()
-    analyzer_response.choices = [MagicMock()]
-    analyzer_response.choices[0].message.content = json.dumps({
-        "needs_decomposition": False, "sub_questions": []
-    })
+    assert await _stream_research("What is AAPL price?") == []
+    assert not fake_llm.calls["planner"]
 
-    with patch("datascraper.research_engine._call_planner", new_callable=AsyncMock, return_value=analyzer_response):
-        items = await _collect_stream(run_iterative_research_streaming(
-            user_input="What is AAPL price?",
-            message_list=[],
-            model="gpt-5.2-chat-latest",
-        ))
+    items = await _stream_research("Compare AAPL and MSFT")
 
     # Only the initial "Analyzing query" status should be yielded before bypass
-    status_items = [i for i in items if i[0] is None]
     content_items = [i for i in items if i[0] is not None and i[0] != ""]
     assert len(content_items) == 0  # no synthesis content
 
 
-@pytest.mark.asyncio
-async def test_streaming_status_event_format():
+async def test_streaming_status_event_format(fake_llm):
     """Status events must have string label and optional string detail."""
-    from datascraper.research_engine import run_iterative_research_streaming
-
-    analyzer_response = MagicMock()
-    analyzer_response.choices = [MagicMock()]
-    analyzer_response.choices[0].message.content = json.dumps({
-        "needs_decomposition": True,
-        "sub_questions": [
-            {"question": "AAPL price", "type": "numerical"},
-        ]
-    })
-
-    gap_resp = MagicMock()
-    gap_resp.choices = [MagicMock()]
-    gap_resp.choices[0].message.content = json.dumps({
-        "complete": True, "gaps": [], "follow_up_queries": []
-    })
-
-    planner_calls = [analyzer_response, gap_resp]
-    call_idx = {"i": 0}
-
-    async def mock_planner(*a, **kw):
-        idx = call_idx["i"]
-        call_idx["i"] += 1
-        return planner_calls[idx]
+    fake_llm.set_sequence("planner", [_decomposed(("AAPL price", "numerical")), _COMPLETE_GAPS])
+    fake_llm.set("mcp", "$150")
+    fake_llm.set("synthesis_stream", ["Hello", " world"])
 
-    async def mock_synth_stream(*a, **kw):
-        for chunk in [_make_stream_chunk("Hello"), _make_stream_chunk(" world")]:
-            yield chunk
-
-    mock_stream_obj = mock_synth_stream()
-
-    with patch("datascraper.research_engine._call_planner", side_effect=mock_planner), \
-         patch("datascraper.research_engine._try_mcp_search", new_callable=AsyncMock, return_value="$150"), \
-         patch("datascraper.research_engine._call_synthesis_streaming", new_callable=AsyncMock, return_value=mock_synth_stream()):
-        items = await _collect_stream(run_iterative_research_streaming(
-            user_input="Complex multi-ticker query",
-            message_list=[],
-            model="gpt-5.2-chat-latest",
-        ))
+    items = await _stream_research("Compare AAPL and MSFT prices")
 
     status_events = [(t, e) for t, e in items if t is None]
     for text_chunk, evt in status_events:
@@ -423,100 +653,36 @@ async def test_streaming_status_event_format():
             assert isinstance(evt["detail"], str)
 
 
-@pytest.mark.asyncio
-async def test_streaming_phases_in_order():
+async def test_streaming_phases_in_order(fake_llm):
     """Status phases should appear in the expected order for a complex query."""
-    from datascraper.research_engine import run_iterative_research_streaming
-
-    analyzer_response = MagicMock()
-    analyzer_response.choices = [MagicMock()]
-    analyzer_response.choices[0].message.content = json.dumps({
-        "needs_decomposition": True,
-        "sub_questions": [
-            {"question": "AAPL revenue", "type": "numerical"},
-            {"question": "MSFT revenue", "type": "numerical"},
-        ]
-    })
-
-    gap_resp = MagicMock()
-    gap_resp.choices = [MagicMock()]
-    gap_resp.choices[0].message.content = json.dumps({
-        "complete": True, "gaps": [], "follow_up_queries": []
-    })
-
-    planner_calls = [analyzer_response, gap_resp]
-    call_idx = {"i": 0}
+    fake_llm.set_sequence("planner", [
+        _decomposed(("AAPL revenue", "numerical"), ("MSFT revenue", "numerical")),
+        _COMPLETE_GAPS,
+    ])
+    fake_llm.set_sequence("mcp", ["$94.9B", "$64.7B"])
+    fake_llm.set("synthesis_stream", ["Result"])
 
-    async def mock_planner(*a, **kw):
-        idx = call_idx["i"]
-        call_idx["i"] += 1
-        return planner_calls[idx]
-
-    async def mock_synth_stream(*a, **kw):
-        for chunk in [_make_stream_chunk("Result")]:
-            yield chunk
-
-    with patch("datascraper.research_engine._call_planner", side_effect=mock_planner), \
-         patch("datascraper.research_engine._try_mcp_search", new_callable=AsyncMock, side_effect=["$94.9B", "$64.7B"]), \
-         patch("datascraper.research_engine._call_synthesis_streaming", new_callable=AsyncMock, return_value=mock_synth_stream()):
-        items = await _collect_stream(run_iterative_research_streaming(
-            user_input="Compare AAPL and MSFT revenue",
-            message_list=[],
-            model="gpt-5.2-chat-latest",
-        ))
+    items = await _stream_research("Compare AAPL and MSFT revenue")
 
     labels = [e["label"] for t, e in items if t is None]
-    # Expected order: Analyzing -> Planning -> Researching (batch + completions) -> Evaluating -> Synthesizing
+    # Expected order: Analyzing -> Researching (one launch per sub-question,
+    # while the plan streams in) -> Planning -> completions -> Evaluating -> Synthesizing
     assert labels[0] == "Analyzing query"
-    assert labels[1] == "Planning research"
-    assert labels[2] == "Researching"  # batch launch
+    assert labels[1:3] == ["Researching", "Researching"]
+    assert labels[3] == "Planning research"
     # Completion statuses (parallel, so order may vary)
-    researching_labels = [l for l in labels if l == "Researching"]
-    assert len(researching_labels) >= 3  # 1 batch + 2 completions
+    assert labels[4:6] == ["Researching", "Researching"]
     assert "Evaluating results" in labels
     assert labels[-1] == "Synthesizing findings"
 
 
-@pytest.mark.asyncio
-async def test_streaming_sources_before_synthesis():
+async def test_streaming_sources_before_synthesis(fake_llm):
     """Sources should be delivered before synthesis text begins."""
-    from datascraper.research_engine import run_iterative_research_streaming
-
-    analyzer_response = MagicMock()
-    analyzer_response.choices = [MagicMock()]
-    analyzer_response.choices[0].message.content = json.dumps({
-        "needs_decomposition": True,
-        "sub_questions": [
-            {"question": "AAPL news", "type": "qualitative"},
-        ]
-    })
-
-    gap_resp = MagicMock()
-    gap_resp.choices = [MagicMock()]
-    gap_resp.choices[0].message.content = json.dumps({
-        "complete": True, "gaps": [], "follow_up_queries": []
-    })
+    fake_llm.set_sequence("planner", [_decomposed(("AAPL news", "qualitative")), _COMPLETE_GAPS])
+    fake_llm.set("web", ("Earnings beat...", [{"url": "https://cnbc.com", "title": "CNBC"}]))
+    fake_llm.set("synthesis_stream", ["Analysis:"])
 
-    planner_calls = [analyzer_response, gap_resp]
-    call_idx = {"i": 0}
-
-    async def mock_planner(*a, **kw):
-        idx = call_idx["i"]
-        call_idx["i"] += 1
-        return planner_calls[idx]
-
-    async def mock_synth_stream(*a, **kw):
-        for chunk in [_make_stream_chunk("Analysis:")]:
-            yield chunk
-
-    with patch("datascraper.research_engine._call_planner", side_effect=mock_planner), \
-         patch("datascraper.research_engine._web_search", new_callable=AsyncMock, return_value=("Earnings beat...", [{"url": "https://cnbc.com", "title": "CNBC"}])), \
-         patch("datascraper.research_engine._call_synthesis_streaming", new_callable=AsyncMock, return_value=mock_synth_stream()):
-        items = await _collect_stream(run_iterative_research_streaming(
-            user_input="Latest AAPL earnings news",
-            message_list=[],
-            model="gpt-5.2-chat-latest",
-        ))
+    items = await _stream_research("Latest AAPL and MSFT earnings news")
 
     # Find indices of source delivery and first synthesis content
     source_idx = None
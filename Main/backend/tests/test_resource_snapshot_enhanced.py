@@ -1,11 +1,14 @@
 """Tests for enhanced ResourceSnapshot with USS and GC stats."""
 import pytest
 
+import psutil
+
+from api.utils.resource_monitor import ResourceSnapshot, rss_mb
+
 
 # ── USS tracking tests ────────────────────────────────────────────
 
 def test_snapshot_has_uss_mb():
-    from api.utils.resource_monitor import ResourceSnapshot
     snap = ResourceSnapshot()
     assert hasattr(snap, 'uss_mb')
     assert isinstance(snap.uss_mb, float)
@@ -13,15 +16,24 @@ def test_snapshot_has_uss_mb():
 
 
 def test_uss_less_than_or_equal_rss():
-    from api.utils.resource_monitor import ResourceSnapshot
     snap = ResourceSnapshot()
     assert snap.uss_mb <= snap.memory_mb
 
 
+def test_rss_mb_matches_psutil():
+    expected = psutil.Process().memory_info().rss / 1024 / 1024
+    assert rss_mb() == pytest.approx(expected, abs=5.0)
+
+
+def test_snapshots_share_one_process_handle():
+    first, second = ResourceSnapshot(), ResourceSnapshot()
+    assert first._process is second._process
+    assert first._process.pid == first.pid
+
+
 # ── GC stats tests ────────────────────────────────────────────────
 
 def test_snapshot_has_gc_counts():
-    from api.utils.resource_monitor import ResourceSnapshot
     snap = ResourceSnapshot()
     assert hasattr(snap, 'gc_counts')
     assert isinstance(snap.gc_counts, tuple)
@@ -29,7 +41,6 @@ def test_snapshot_has_gc_counts():
 
 
 def test_snapshot_has_gc_uncollectable():
-    from api.utils.resource_monitor import ResourceSnapshot
     snap = ResourceSnapshot()
     assert hasattr(snap, 'gc_uncollectable')
     assert isinstance(snap.gc_uncollectable, int)
@@ -39,7 +50,6 @@ def test_snapshot_has_gc_uncollectable():
 # ── delta includes new fields ─────────────────────────────────────
 
 def test_delta_includes_uss():
-    from api.utils.resource_monitor import ResourceSnapshot
     before = ResourceSnapshot()
     after = ResourceSnapshot()
     delta = after.delta(before)
@@ -47,7 +57,6 @@ def test_delta_includes_uss():
 
 
 def test_delta_includes_gc_uncollectable():
-    from api.utils.resource_monitor import ResourceSnapshot
     before = ResourceSnapshot()
     after = ResourceSnapshot()
     delta = after.delta(before)
@@ -57,7 +66,6 @@ def test_delta_includes_gc_uncollectable():
 # ── to_dict includes new fields ───────────────────────────────────
 
 def test_to_dict_includes_new_fields():
-    from api.utils.resource_monitor import ResourceSnapshot
     snap = ResourceSnapshot()
     d = snap.to_dict()
     assert 'uss_mb' in d
@@ -1,6 +1,10 @@
+import dataclasses
+import importlib
+import re
+
 import pytest
-from planner.plan import ExecutionPlan
-from planner.skills.base import BaseSkill
+from planner.plan import ExecutionPlan, get_plan
+from planner.skills.base import BaseSkill, KeywordMatcher, compile_any
 
 
 class TestExecutionPlan:
@@ -14,22 +18,29 @@ class TestExecutionPlan:
     def test_zero_tool_plan(self):
         plan = ExecutionPlan(
             skill_name="summarize_page",
-            tools_allowed=[],
+            tools_allowed=(),
             max_turns=1,
             instructions="Summarize this content.",
         )
-        assert plan.tools_allowed == []
+        assert plan.tools_allowed == ()
         assert plan.max_turns == 1
 
     def test_filtered_tool_plan(self):
         plan = ExecutionPlan(
             skill_name="stock_fundamentals",
-            tools_allowed=["get_stock_info", "get_stock_history", "calculate"],
+            tools_allowed=("get_stock_info", "get_stock_history", "calculate"),
             max_turns=3,
         )
         assert len(plan.tools_allowed) == 3
         assert "get_stock_info" in plan.tools_allowed
 
+    def test_get_plan_shares_one_read_only_instance(self):
+        plan = get_plan("options_analysis", ("get_options_summary", "calculate"), 5)
+        assert get_plan("options_analysis", ("get_options_summary", "calculate"), 5) is plan
+        assert plan.tools_allowed == ("get_options_summary", "calculate")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            plan.max_turns = 10
+
 
 class TestBaseSkill:
     def test_cannot_instantiate_directly(self):
@@ -168,6 +179,12 @@ class TestTechnicalAnalysisSkill:
     def test_matches_macd(self):
         assert self.skill.matches("show MACD for BTC", has_prescraped=False, domain=None) >= 0.7
 
+    def test_re_fallback_matches_without_hyperscan(self, monkeypatch):
+        from planner.skills import technical_analysis
+        monkeypatch.setattr(technical_analysis._MATCHER, "_db", None)
+        assert self.skill.matches("golden cross on SPY", has_prescraped=False, domain=None) >= 0.7
+        assert self.skill.matches("tell me about the company", has_prescraped=False, domain=None) == 0.0
+
 
 from planner.skills.web_research import WebResearchSkill
 from planner.skills.registry import SkillRegistry
@@ -230,3 +247,49 @@ class TestSkillRegistry:
     def test_best_match_rsi(self):
         skill = self.registry.best_match("what is RSI for TSLA?", has_prescraped=False, domain=None)
         assert skill.name == "technical_analysis"
+
+
+_PATTERN_SETS = [
+    ("stock_fundamentals", "_PATTERNS"),
+    ("options_analysis", "_PATTERNS"),
+    ("financial_statements", "_PATTERNS"),
+    ("technical_analysis", "_PATTERNS"),
+    ("summarize_page", "_SUMMARIZE_PATTERNS"),
+    ("summarize_page", "_DATA_PATTERNS"),
+]
+
+_PROBE_QUERIES = [
+    "what is AAPL stock price?",
+    "options volume for AVGO",
+    "trading volume for MSFT today",
+    "put/call ratio on SPY",
+    "when are AAPL earnings?",
+    "what's the RSI and MACD for BTC?",
+    "top gainers today",
+    "summarize this page",
+    "give me the gist",
+    "How is Tesla doing this week",
+    "find me biotech investment ideas",
+    "",
+]
+
+
+@pytest.mark.parametrize("module_name, attr", _PATTERN_SETS)
+def test_compile_any_agrees_with_individual_patterns(module_name, attr):
+    """The folded matcher must accept exactly the queries some single pattern accepts."""
+    patterns = getattr(importlib.import_module(f"planner.skills.{module_name}"), attr)
+    folded = compile_any(patterns)
+    singles = [re.compile(p, re.IGNORECASE) for p in patterns]
+    for query in _PROBE_QUERIES:
+        expected = any(p.search(query) for p in singles)
+        assert (folded.search(query) is not None) == expected, query
+
+
+@pytest.mark.parametrize("module_name, attr", _PATTERN_SETS)
+def test_keyword_matcher_agrees_with_individual_patterns(module_name, attr):
+    """KeywordMatcher, on whichever engine it picked, agrees with the single patterns."""
+    patterns = getattr(importlib.import_module(f"planner.skills.{module_name}"), attr)
+    matcher = KeywordMatcher(patterns)
+    singles = [re.compile(p, re.IGNORECASE) for p in patterns]
+    for query in _PROBE_QUERIES:
+        assert matcher.search(query) == any(p.search(query) for p in singles), query
@@ -1,11 +1,8 @@
 """Tests for stock_analysis Timestamp key serialization fix."""
 
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
 import json
+from types import SimpleNamespace
+
 import pandas as pd
 
 
@@ -28,6 +25,9 @@ def test_safe_dict_with_timestamp_index():
             for key in col_data:
                 assert isinstance(key, str), f"Key {key!r} is {type(key).__name__}, expected str"
 
+    # The caller's frame keeps its Timestamp labels
+    assert isinstance(df.index, pd.DatetimeIndex)
+
 
 def test_safe_dict_with_timestamp_columns():
     """Financial statements use Timestamp column headers."""
@@ -65,3 +65,98 @@ def test_safe_dict_with_plain_dict():
     handler = GetStockAnalysisHandler()
     d = {"target_mean": 250.0}
     assert handler._safe_dict(d) == d
+
+
+def test_safe_dict_values_need_no_default_serializer():
+    """Datetime values come back as the same strings default=str would produce."""
+    from mcp_server.handlers.stock_analysis import GetStockAnalysisHandler
+
+    df = pd.DataFrame(
+        {"Firm": ["Goldman", "Morgan"], "GradeDate": pd.to_datetime(["2026-01-15", None]), "Target": [212.5, 198.0]},
+        index=pd.to_datetime(["2026-01-15", "2026-02-10"]),
+    )
+    result = GetStockAnalysisHandler._safe_dict(df)
+
+    assert result["GradeDate"] == {"2026-01-15": "2026-01-15 00:00:00", "2026-02-10": "NaT"}
+    assert json.loads(json.dumps(result)) == result
+    # The caller's column keeps its dtype
+    assert df["GradeDate"].dtype.kind == "M"
+
+
+def test_dumps_matches_stdlib_json_text():
+    """The tool's JSON text is the same whichever serializer is installed."""
+    from mcp_server.handlers.stock_analysis import GetStockAnalysisHandler, _dumps
+
+    df = pd.DataFrame(
+        {"Firm": ["Goldman"], "GradeDate": pd.to_datetime(["2026-01-15"]), "Target": [212.5]},
+        index=pd.to_datetime(["2026-01-15"]),
+    )
+    analysis = {"upgrades_downgrades": GetStockAnalysisHandler._safe_dict(df), "recommendations": {}}
+
+    assert _dumps(analysis) == json.dumps(analysis, indent=2, default=str)
+
+
+def test_dumps_orjson_and_json_paths_agree(monkeypatch):
+    """numpy values and non-str keys serialize to the same text either way."""
+    import builtins
+    import importlib
+
+    import numpy as np
+    from mcp_server.handlers import stock_analysis
+
+    data = {
+        "analyst_price_targets": {"mean": np.float64(250.5), "count": np.int64(31)},
+        "scores": np.array([1.5, 2.0]),
+        "by_period": {0: np.float32(0.5), pd.Timestamp("2026-01-15"): np.bool_(True)},
+    }
+    with_orjson = stock_analysis._dumps(data)
+
+    real_import = builtins.__import__
+
+    def no_orjson(name, *args, **kwargs):
+        if name == "orjson":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_orjson)
+    try:
+        fallback = importlib.reload(stock_analysis)
+        with_json = fallback._dumps(data)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(stock_analysis)
+
+    assert with_orjson == with_json
+    assert json.loads(with_json) == {
+        "analyst_price_targets": {"mean": 250.5, "count": 31},
+        "scores": [1.5, 2.0],
+        "by_period": {"0": 0.5, "2026-01-15T00:00:00": True},
+    }
+
+
+async def test_execute_reuses_serialized_analysis(monkeypatch):
+    """A repeat request for the same ticker skips the fetch and conversion."""
+    from mcp_server.handlers import stock_analysis
+    from mcp_server.handlers.base import ToolContext
+
+    fetches = []
+
+    async def fake_get_ticker(symbol):
+        fetches.append(symbol)
+        return SimpleNamespace(
+            recommendations=None,
+            recommendations_summary=None,
+            upgrades_downgrades=None,
+            analyst_price_targets={"mean": 250.0},
+        )
+
+    monkeypatch.setattr(stock_analysis, "get_ticker", fake_get_ticker)
+    handler = stock_analysis.GetStockAnalysisHandler()
+    ctx = ToolContext(ticker="AAPL", arguments={}, executor=None)
+
+    first = await handler.execute(ctx)
+    second = await handler.execute(ctx)
+
+    assert fetches == ["AAPL"]
+    assert second[0].text == first[0].text
+    assert json.loads(first[0].text)["analyst_price_targets"] == {"mean": 250.0}
@@ -1,26 +1,45 @@
 """Tests for TimedCache max_entries eviction and TTL behavior."""
 
-import sys
-from pathlib import Path
+from datetime import timedelta
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import pytest
 
-import time
-from datetime import timedelta
+from mcp_server import cache as cache_module
 from mcp_server.cache import TimedCache
 
 
+class _VirtualClock:
+    """Stands in for ``time`` inside mcp_server.cache; only monotonic() is used."""
+
+    def __init__(self):
+        self.current = 1000.0
+
+    def monotonic(self):
+        return self.current
+
+    def advance(self, seconds):
+        self.current += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive TTL expiry by advancing virtual time instead of sleeping."""
+    virtual = _VirtualClock()
+    monkeypatch.setattr(cache_module, "time", virtual)
+    return virtual
+
+
 def test_basic_get_set():
     cache = TimedCache(ttl_seconds=60, max_entries=10)
     cache.set("AAPL", {"price": 150})
     assert cache.get("AAPL") == {"price": 150}
 
 
-def test_expired_entry_returns_none():
+def test_expired_entry_returns_none(clock):
     cache = TimedCache(ttl_seconds=0, max_entries=10)
     cache.set("AAPL", {"price": 150})
     # TTL of 0 seconds means immediately expired
-    time.sleep(0.01)
+    clock.advance(0.01)
     assert cache.get("AAPL") is None
 
 
@@ -63,11 +82,35 @@ def test_update_existing_key_does_not_grow():
     assert cache.get("C") == 3
 
 
-def test_expired_entries_evicted_on_set():
+def test_rewritten_key_is_evicted_last():
+    cache = TimedCache(ttl_seconds=60, max_entries=3)
+    cache.set("A", 1)
+    cache.set("B", 2)
+    cache.set("C", 3)
+    # Rewriting A makes B the oldest entry
+    cache.set("A", 10)
+    cache.set("D", 4)
+    assert cache.get("B") is None
+    assert cache.get("A") == 10
+
+
+def test_recently_read_key_is_evicted_last():
+    cache = TimedCache(ttl_seconds=60, max_entries=3)
+    cache.set("A", 1)
+    cache.set("B", 2)
+    cache.set("C", 3)
+    # Reading A makes B the least recently used entry
+    assert cache.get("A") == 1
+    cache.set("D", 4)
+    assert cache.get("B") is None
+    assert cache.get("A") == 1
+
+
+def test_expired_entries_evicted_on_set(clock):
     cache = TimedCache(ttl_seconds=1, max_entries=100)
     cache.set("A", 1)
     cache.set("B", 2)
-    time.sleep(1.1)
+    clock.advance(1.1)
     # Both A and B are expired; setting C should evict them
     cache.set("C", 3)
     assert len(cache) == 1
@@ -103,3 +146,34 @@ def test_burst_of_unique_keys():
         assert cache.get(f"TICKER_{i}") is None
     for i in range(15, 20):
         assert cache.get(f"TICKER_{i}") == {"data": f"value_{i}"}
+
+
+def test_hot_key_survives_burst_of_one_off_keys():
+    cache = TimedCache(ttl_seconds=60, max_entries=20)
+    cache.set("AAPL", {"price": 150})
+    for _ in range(5):
+        cache.get("AAPL")
+    for i in range(30):
+        cache.set(f"TICKER_{i}", i)
+
+    assert len(cache) == 20
+    assert cache.get("AAPL") == {"price": 150}
+    assert cache.get("TICKER_0") is None
+    assert cache.get("TICKER_29") == 29
+
+
+def test_read_counts_dropped_with_evicted_keys(clock):
+    cache = TimedCache(ttl_seconds=10, max_entries=20)
+    cache.set("AAPL", {"price": 150})
+    for _ in range(5):
+        cache.get("AAPL")
+    clock.advance(11)
+    # Re-inserting after expiry starts the key cold again, so it is now the
+    # oldest of the unread keys and goes first once the cache overflows.
+    cache.set("AAPL", {"price": 151})
+    for i in range(20):
+        cache.set(f"TICKER_{i}", i)
+
+    assert len(cache) == 20
+    assert cache.get("AAPL") is None
+    assert cache.get("TICKER_0") == 0
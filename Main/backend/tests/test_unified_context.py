@@ -0,0 +1,373 @@
+"""Tests for the unified context manager and its API integration layer."""
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+try:
+    import orjson
+    _dumps, _loads = orjson.dumps, orjson.loads
+except ImportError:
+    _dumps, _loads = json.dumps, json.loads
+
+from datascraper.unified_context_manager import UnifiedContextManager, ContextMode
+from datascraper.context_integration import ContextIntegration
+
+
+@pytest.fixture
+def manager():
+    return UnifiedContextManager()
+
+
+@pytest.fixture
+def session_id(manager):
+    """Unique session per test; sessions live in the shared cache, so clean up."""
+    sid = f"test_{uuid.uuid4().hex}"
+    yield sid
+    manager.clear_session(sid)
+
+
+def _tags_present(messages, tags):
+    """Return which tags appear anywhere in messages, in a single pass."""
+    found = set()
+    for msg in messages:
+        content = msg["content"]
+        found.update(tag for tag in tags if tag in content)
+        if len(found) == len(tags):
+            break
+    return found
+
+
+# ── UnifiedContextManager ─────────────────────────────────────────
+
+def test_new_session_has_empty_structure(manager, session_id):
+    context = manager.get_full_context(session_id)
+    assert context["system_prompt"] == ""
+    assert context["conversation_history"] == []
+    assert context["fetched_context"] == {"web_search": [], "js_scraping": []}
+    assert context["metadata"]["mode"] == "normal"
+
+
+def test_update_metadata(manager, session_id):
+    manager.update_metadata(
+        session_id,
+        mode=ContextMode.RESEARCH,
+        current_url="https://finance.yahoo.com/quote/AAPL",
+        user_timezone="America/New_York",
+    )
+    metadata = manager.get_full_context(session_id)["metadata"]
+    assert metadata["mode"] == "research"
+    assert metadata["current_url"] == "https://finance.yahoo.com/quote/AAPL"
+    assert metadata["user_timezone"] == "America/New_York"
+
+
+@pytest.mark.smoke
+def test_add_user_message(manager, session_id):
+    manager.add_user_message(session_id, "What is AAPL's current price?")
+    view = manager.get_context_view(session_id)
+    assert len(view["conversation_history"]) == 1
+    assert view["conversation_history"][0].role == "user"
+    assert view["metadata"].message_count == 1
+    assert view["metadata"].token_count > 0
+
+
+@pytest.mark.smoke
+def test_add_assistant_message_with_metadata(manager, session_id):
+    manager.add_user_message(session_id, "What is AAPL's current price?")
+    manager.add_assistant_message(
+        session_id,
+        "AAPL is trading at $195.50.",
+        model="gpt-4",
+        sources_used=[{"url": "https://finance.yahoo.com", "title": "Yahoo Finance"}],
+        tools_used=["get_stock_info"],
+        response_time_ms=1200,
+    )
+    message = manager.get_context_view(session_id)["conversation_history"][-1]
+    assert message.role == "assistant"
+    assert message.metadata.model == "gpt-4"
+    assert message.metadata.tools_used == ["get_stock_info"]
+    assert message.metadata.response_time_ms == 1200
+
+
+@pytest.mark.smoke
+def test_add_fetched_context(manager, session_id):
+    manager.add_fetched_context(
+        session_id, source_type="web_search",
+        content="Apple reports record revenue", url="https://example.com/news",
+    )
+    manager.add_fetched_context(
+        session_id, source_type="js_scraping",
+        content="AAPL 195.50 +1.2%", url="https://finance.yahoo.com/quote/AAPL",
+    )
+    fetched = manager.get_context_view(session_id)["fetched_context"]
+    assert len(fetched["web_search"]) == 1
+    assert len(fetched["js_scraping"]) == 1
+    assert fetched["web_search"][0].url == "https://example.com/news"
+
+
+def test_add_fetched_context_bulk(manager, session_id):
+    manager.add_fetched_context_bulk(session_id, [
+        {"source_type": "web_search", "content": "a" * 40, "url": "https://a.com",
+         "extracted_data": {"title": "A"}},
+        {"source_type": "js_scraping", "content": "b" * 40, "url": "https://b.com"},
+    ])
+    context = manager.get_full_context(session_id)
+    assert context["fetched_context"]["web_search"][0]["extracted_data"] == {"title": "A"}
+    assert len(context["fetched_context"]["js_scraping"]) == 1
+    assert context["metadata"]["token_count"] == 20
+
+
+def test_formatted_messages_for_api(manager, session_id):
+    manager.add_fetched_context(
+        session_id, source_type="web_search",
+        content="Apple reports record revenue", url="https://example.com/news",
+    )
+    manager.add_fetched_context(
+        session_id, source_type="js_scraping",
+        content="AAPL 195.50 +1.2%", url="https://finance.yahoo.com/quote/AAPL",
+    )
+    manager.add_user_message(session_id, "How is AAPL doing?")
+    manager.add_assistant_message(session_id, "AAPL is up 1.2% today.")
+
+    messages = manager.get_formatted_messages_for_api(session_id)
+    assert messages[0]["role"] == "system"
+    tags = ("[WEB SEARCH RESULTS]", "[CURRENT PAGE CONTENT")
+    assert _tags_present(messages, tags) == set(tags)
+    assert messages[-2] == {"role": "user", "content": "How is AAPL doing?"}
+    assert messages[-1] == {"role": "assistant", "content": "AAPL is up 1.2% today."}
+
+
+def test_get_scraped_urls(manager, session_id):
+    manager.add_fetched_context(session_id, source_type="web_search", content="a", url="https://a.com")
+    manager.add_fetched_context(session_id, source_type="js_scraping", content="b", url="https://b.com")
+    manager.add_fetched_context(session_id, source_type="web_search", content="c")
+    assert manager.get_scraped_urls(session_id) == ["https://a.com", "https://b.com"]
+
+
+def test_session_stats(manager, session_id):
+    manager.add_user_message(session_id, "hello")
+    manager.add_fetched_context(session_id, source_type="web_search", content="a", url="https://a.com")
+    manager.add_fetched_context(session_id, source_type="web_search", content="b", url="https://b.com")
+    stats = manager.get_session_stats(session_id)
+    assert stats["message_count"] == 1
+    assert stats["fetched_context_counts"] == {"web_search": 2, "js_scraping": 0}
+    assert stats["total_fetched_items"] == 2
+
+
+def test_clear_conversation_history_preserves_fetched_context(manager, session_id):
+    manager.add_user_message(session_id, "hello")
+    manager.add_fetched_context(session_id, source_type="js_scraping", content="page", url="https://a.com")
+    manager.clear_conversation_history(session_id)
+    context = manager.get_full_context(session_id)
+    assert context["conversation_history"] == []
+    assert context["metadata"]["message_count"] == 0
+    assert len(context["fetched_context"]["js_scraping"]) == 1
+
+
+def test_fetched_count_does_not_load_the_session(manager, session_id, monkeypatch):
+    manager.add_fetched_context(session_id, source_type="web_search", content="a")
+    manager.add_fetched_context_bulk(session_id, [
+        {"source_type": "web_search", "content": "b"},
+        {"source_type": "js_scraping", "content": "c"},
+    ])
+    manager.clear_fetched_context(session_id, "js_scraping")
+
+    def fail(_session_id):
+        raise AssertionError("get_fetched_count loaded the session")
+
+    monkeypatch.setattr(manager, "_load_session", fail)
+    assert manager.get_fetched_count(session_id, "web_search") == 2
+    assert manager.get_fetched_count(session_id, "js_scraping") == 0
+
+
+def test_context_view_is_read_only(manager, session_id):
+    view = manager.get_context_view(session_id)
+    with pytest.raises(TypeError):
+        view["system_prompt"] = "overridden"
+
+
+def test_clear_session(manager, session_id):
+    manager.add_user_message(session_id, "hello")
+    manager.clear_session(session_id)
+    assert manager.get_context_view(session_id)["conversation_history"] == []
+
+
+# ── JSON structure ────────────────────────────────────────────────
+
+FROZEN_TIME = "2025-11-15T14:30:00+00:00"
+
+
+@pytest.fixture(scope="session")
+def populated_manager():
+    """One fully-populated session shared by the read-only structure checks."""
+    m = UnifiedContextManager()
+    sid = f"shared_{uuid.uuid4().hex}"
+    m.update_metadata(
+        sid,
+        mode=ContextMode.RESEARCH,
+        current_url="https://finance.yahoo.com/quote/AAPL",
+        user_timezone="America/New_York",
+        user_time=FROZEN_TIME,
+    )
+    m.add_user_message(
+        sid, "What is Apple's current stock price and recent performance?", timestamp=FROZEN_TIME
+    )
+    m.add_assistant_message(
+        sid,
+        "Apple (AAPL) is trading at $195.50, up 2.3% this week.",
+        model="gpt-4",
+        sources_used=[{"url": "https://finance.yahoo.com/quote/AAPL", "title": "AAPL Quote"}],
+        tools_used=["get_stock_info"],
+        response_time_ms=1500,
+        timestamp=FROZEN_TIME,
+    )
+    m.add_fetched_context_bulk(sid, [
+        {"source_type": "web_search", "content": "Apple reports record Q4 revenue",
+         "url": "https://example.com/apple-q4"},
+        {"source_type": "web_search", "content": "Analysts raise AAPL price targets",
+         "url": "https://example.com/aapl-targets"},
+        {"source_type": "js_scraping", "content": "AAPL 195.50 +2.3%",
+         "url": "https://finance.yahoo.com/quote/AAPL"},
+    ])
+    yield m, sid
+    m.clear_session(sid)
+
+
+@pytest.fixture(scope="session")
+def populated_json(populated_manager):
+    m, sid = populated_manager
+    return _loads(_dumps(m.get_full_context(sid)))
+
+
+@pytest.mark.slow
+def test_json_top_level_keys(request, populated_json):
+    assert set(populated_json) == {"system_prompt", "metadata", "fetched_context", "conversation_history"}
+    # Preview for debugging (pytest -v -s); not worth serializing on default runs
+    if request.config.getoption("verbose") > 0:
+        print(json.dumps(populated_json, indent=2)[:1000] + "...")
+
+
+@pytest.mark.slow
+def test_json_metadata_fields(populated_manager, populated_json):
+    _, sid = populated_manager
+    metadata = populated_json["metadata"]
+    assert {"session_id", "timestamp", "mode", "token_count", "message_count"} <= set(metadata)
+    assert metadata["session_id"] == sid
+    assert metadata["mode"] == "research"
+    assert metadata["user_timezone"] == "America/New_York"
+    assert metadata["user_time"] == FROZEN_TIME
+
+
+@pytest.mark.slow
+def test_json_message_count_matches_history(populated_json):
+    assert populated_json["metadata"]["message_count"] == len(populated_json["conversation_history"]) == 2
+
+
+@pytest.mark.slow
+def test_json_conversation_roles(populated_json):
+    assert [m["role"] for m in populated_json["conversation_history"]] == ["user", "assistant"]
+    assert all(m["timestamp"] == FROZEN_TIME for m in populated_json["conversation_history"])
+
+
+@pytest.mark.slow
+def test_json_user_message_has_no_metadata(populated_json):
+    assert "metadata" not in populated_json["conversation_history"][0]
+
+
+@pytest.mark.slow
+def test_json_assistant_metadata(populated_json):
+    metadata = populated_json["conversation_history"][1]["metadata"]
+    assert metadata["model"] == "gpt-4"
+    assert metadata["tools_used"] == ["get_stock_info"]
+    assert metadata["sources_used"][0]["title"] == "AAPL Quote"
+
+
+@pytest.mark.slow
+def test_json_fetched_context_counts(populated_json):
+    fetched = populated_json["fetched_context"]
+    assert len(fetched["web_search"]) == 2
+    assert len(fetched["js_scraping"]) == 1
+
+
+@pytest.mark.slow
+def test_json_fetched_items_fields(populated_json):
+    for source_type, items in populated_json["fetched_context"].items():
+        for item in items:
+            assert item["source_type"] == source_type
+            assert {"content", "timestamp", "url"} <= set(item)
+
+
+# ── ContextIntegration ────────────────────────────────────────────
+
+def _make_request(session_id):
+    """Just enough of an HttpRequest for ContextIntegration."""
+    return SimpleNamespace(
+        method='GET',
+        body=b'',
+        GET={'session_id': session_id, 'mode': 'research'},
+        POST={},
+        session=SimpleNamespace(session_key='django_session_123'),
+    )
+
+
+@pytest.fixture
+def integration():
+    return ContextIntegration()
+
+
+@pytest.fixture
+def request_obj(session_id):
+    return _make_request(session_id)
+
+
+@pytest.mark.slow
+def test_prepare_context_for_request(integration, request_obj, session_id):
+    messages, sid = integration.prepare_context_for_request(
+        request_obj, "What is TSLA's P/E ratio?", current_url="https://finance.yahoo.com"
+    )
+    assert sid == session_id
+    assert messages[-1] == {"role": "user", "content": "What is TSLA's P/E ratio?"}
+    metadata = integration.context_manager.get_full_context(sid)["metadata"]
+    assert metadata["mode"] == "research"
+    assert metadata["current_url"] == "https://finance.yahoo.com"
+
+
+@pytest.mark.slow
+def test_add_response_to_context(integration, request_obj, session_id):
+    _, sid = integration.prepare_context_for_request(request_obj, "What is TSLA's P/E ratio?")
+    integration.add_response_to_context(sid, "TSLA's P/E is 65.", model="gpt-4", tools_used=["get_stock_info"])
+    history = integration.context_manager.get_full_context(sid)["conversation_history"]
+    assert [m["role"] for m in history] == ["user", "assistant"]
+    assert history[-1]["metadata"]["tools_used"] == ["get_stock_info"]
+
+
+@pytest.mark.slow
+def test_add_web_content_truncates_long_pages(integration, request_obj, session_id):
+    sid = integration.add_web_content(request_obj, "x" * 20000, "https://example.com")
+    assert integration.get_fetched_count(sid, "js_scraping") == 1
+    item = integration.context_manager.get_full_context(sid)["fetched_context"]["js_scraping"][0]
+    assert item["content"].endswith("... (truncated)")
+    assert len(item["content"]) < 20000
+
+
+@pytest.mark.slow
+def test_add_search_results(integration, session_id):
+    integration.add_search_results(session_id, [
+        {"title": "Tesla Q3", "snippet": "Record deliveries", "url": "https://a.com"},
+        {"title": "Tesla margins", "snippet": "Margins fell", "url": "https://b.com", "body": "Full text"},
+    ])
+    assert integration.get_fetched_count(session_id, "web_search") == 2
+    assert integration.get_scraped_urls(session_id) == ["https://a.com", "https://b.com"]
+    web_search = integration.context_manager.get_full_context(session_id)["fetched_context"]["web_search"]
+    assert web_search[0]["extracted_data"]["title"] == "Tesla Q3"
+
+
+@pytest.mark.slow
+def test_clear_messages_preserving_web_content(integration, request_obj, session_id):
+    integration.prepare_context_for_request(request_obj, "hello")
+    integration.add_web_content(request_obj, "page text", "https://example.com")
+    integration.clear_messages(request_obj, preserve_web_content=True)
+    stats = integration.get_context_stats(session_id)
+    assert stats["message_count"] == 0
+    assert stats["fetched_context_counts"]["js_scraping"] == 1
@@ -4,11 +4,13 @@ Deployment Verification Script
 Checks for memory leaks and resource cleanup in development mode.
 """
 
+import mmap
 import os
+import re
 import sys
 import time
-import psutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add backend to path
@@ -17,90 +19,118 @@ sys.path.insert(0, str(backend_dir))
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_config.settings')
 
+_MAX_REQUESTS_FLAG = re.compile(rb'--max-requests(-jitter)?')
+
+
+def _map_file(path: Path):
+    """Open path as a read-only mmap, or None when the file is empty"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _contains(path: Path, needle: bytes) -> bool:
+    """Check for needle in path without decoding the file into a str"""
+    mm = _map_file(path)
+    if mm is None:
+        return False
+    with mm:
+        return mm.find(needle) != -1
+
 
 def check_memory_baseline():
     """Get baseline memory usage"""
-    process = psutil.Process()
-    memory_mb = process.memory_info().rss / 1024 / 1024
+    from api.utils.resource_monitor import rss_mb
+    memory_mb = rss_mb()
     print(f"Baseline memory: {memory_mb:.2f} MB")
     return memory_mb
 
 
 def check_gunicorn_config():
     """Verify Gunicorn has proper worker recycling configured"""
+    lines = []
     procfile_path = backend_dir / 'Procfile'
     if not procfile_path.exists():
-        print("WARNING: Procfile not found")
-        return False
-
-    with open(procfile_path) as f:
-        content = f.read()
+        lines.append("WARNING: Procfile not found")
+        return False, lines
 
-    has_max_requests = '--max-requests' in content
-    has_jitter = '--max-requests-jitter' in content
+    has_max_requests = has_jitter = False
+    mm = _map_file(procfile_path)
+    if mm is not None:
+        with mm:
+            for match in _MAX_REQUESTS_FLAG.finditer(mm):
+                has_max_requests = True
+                has_jitter = has_jitter or match.group(1) is not None
+                if has_jitter:
+                    break
 
-    print("\nGunicorn Configuration:")
-    print(f"  Worker recycling (--max-requests): {'OK' if has_max_requests else 'MISSING'}")
-    print(f"  Jitter (--max-requests-jitter): {'OK' if has_jitter else 'MISSING'}")
+    lines.append("\nGunicorn Configuration:")
+    lines.append(f"  Worker recycling (--max-requests): {'OK' if has_max_requests else 'MISSING'}")
+    lines.append(f"  Jitter (--max-requests-jitter): {'OK' if has_jitter else 'MISSING'}")
 
-    return has_max_requests and has_jitter
+    return has_max_requests and has_jitter, lines
 
 
 def check_mcp_cleanup():
     """Verify MCP manager has proper cleanup"""
+    lines = []
     mcp_manager_path = backend_dir / 'mcp_client' / 'mcp_manager.py'
-    with open(mcp_manager_path) as f:
-        content = f.read()
+    has_exit_stack_close = _contains(mcp_manager_path, b'exit_stack.aclose()')
 
-    has_exit_stack_close = 'exit_stack.aclose()' in content
+    lines.append("\nMCP Manager Cleanup:")
+    lines.append(f"  Exit stack cleanup: {'OK' if has_exit_stack_close else 'MISSING'}")
 
-    print("\nMCP Manager Cleanup:")
-    print(f"  Exit stack cleanup: {'OK' if has_exit_stack_close else 'MISSING'}")
-
-    return has_exit_stack_close
+    return has_exit_stack_close, lines
 
 
 def check_session_cleanup():
     """Verify session cleanup is enabled"""
+    lines = []
     context_manager_path = backend_dir / 'datascraper' / 'unified_context_manager.py'
-    with open(context_manager_path) as f:
-        content = f.read()
-
-    has_cache_backend = 'django.core.cache' in content
-    has_ttl = 'session_ttl' in content
+    has_cache_backend = _contains(context_manager_path, b'django.core.cache')
+    has_ttl = _contains(context_manager_path, b'session_ttl')
 
-    print("\nSession Cleanup:")
-    print(f"  Cache-backed sessions: {'OK' if has_cache_backend else 'MISSING'}")
-    print(f"  TTL configured: {'OK' if has_ttl else 'MISSING'}")
+    lines.append("\nSession Cleanup:")
+    lines.append(f"  Cache-backed sessions: {'OK' if has_cache_backend else 'MISSING'}")
+    lines.append(f"  TTL configured: {'OK' if has_ttl else 'MISSING'}")
 
-    return has_cache_backend and has_ttl
+    return has_cache_backend and has_ttl, lines
 
 
 def check_monitoring_middleware():
     """Verify memory monitoring middleware is enabled"""
+    lines = []
     settings_path = backend_dir / 'django_config' / 'settings.py'
-    with open(settings_path) as f:
-        content = f.read()
+    has_middleware = _contains(settings_path, b'MemoryTrackerMiddleware')
 
-    has_middleware = 'MemoryTrackerMiddleware' in content
+    lines.append("\nMonitoring Middleware:")
+    lines.append(f"  Memory tracker: {'OK' if has_middleware else 'MISSING'}")
 
-    print("\nMonitoring Middleware:")
-    print(f"  Memory tracker: {'OK' if has_middleware else 'MISSING'}")
-
-    return has_middleware
+    return has_middleware, lines
 
 
 def check_psutil_dependency():
     """Verify psutil is installed"""
+    lines = []
     try:
         import psutil
-        print("\nDependencies:")
-        print(f"  psutil: OK (version {psutil.__version__})")
-        return True
+        lines.append("\nDependencies:")
+        lines.append(f"  psutil: OK (version {psutil.__version__})")
+        return True, lines
     except ImportError:
-        print("\nDependencies:")
-        print("  psutil: MISSING - Run: uv add psutil")
-        return False
+        lines.append("\nDependencies:")
+        lines.append("  psutil: MISSING - Run: uv add psutil")
+        return False, lines
+
+
+def _run_check(name, check_func):
+    """Run one check, returning (name, passed, report lines)"""
+    try:
+        result, lines = check_func()
+    except Exception as e:
+        result, lines = False, [f"\nERROR in {name}: {e}"]
+    return name, result, lines
 
 
 def run_verification():
@@ -117,14 +147,17 @@ def run_verification():
         ("Dependencies", check_psutil_dependency),
     ]
 
+    # The checks are independent and IO-bound, so run them together; each
+    # one returns its report lines, printed in the original order.
+    with ThreadPoolExecutor(max_workers=len(checks)) as ex:
+        futures = [ex.submit(_run_check, name, fn) for name, fn in checks]
+        outcomes = [f.result() for f in futures]
+
     results = []
-    for name, check_func in checks:
-        try:
-            result = check_func()
-            results.append((name, result))
-        except Exception as e:
-            print(f"\nERROR in {name}: {e}")
-            results.append((name, False))
+    for name, result, lines in outcomes:
+        for line in lines:
+            print(line)
+        results.append((name, result))
 
     print("\n" + "=" * 60)
     print("VERIFICATION SUMMARY")